@@ -27,17 +27,22 @@ def get_most_recent_entry(search_dir):
 
 
 def glob_result_files(folder_name):
-    """ Glob result spreadsheets from specified folder.
+    """ Glob result stores and report bundles from specified folder.
 
     Args:
         folder_name: an absolute or relative path to a directory
 
     Returns:
-        list of filenames that match the pattern 'scenario_*.xlsx'
+        list of filenames that match the pattern 'scenario_*.h5' and of
+        report bundle folders 'scenario_*' (c.f. urbs.BundleSink); a
+        scenario with both is only listed with its HDF5 store
     """
-    glob_pattern = os.path.join(folder_name, 'scenario_*.xlsx')
-    result_files = sorted(glob.glob(glob_pattern))
-    return result_files
+    stores = glob.glob(os.path.join(folder_name, 'scenario_*.h5'))
+    bundles = [path for path in glob.glob(os.path.join(folder_name,
+                                                       'scenario_*'))
+               if urbs.is_report_bundle(path) and
+               path + '.h5' not in stores]
+    return sorted(stores + bundles)
 
 
 def deduplicate_legend(handles, labels):
@@ -87,27 +92,27 @@ def group_hbar_plots(ax, group_size, inner_sep=None):
                         + group_offset)
 
 
-def compare_scenarios(result_files, output_filename):
-    """ Create report sheet and plots for given report spreadsheets.
+def compare_scenarios(result_files, output_filename, stf=None):
+    """ Create report sheet and plots for given scenario results.
 
     Args:
-        result_files: a list of spreadsheet filenames generated by urbs.report
+        result_files: a list of HDF5 stores (c.f. urbs.save) or report
+                      bundle folders (c.f. urbs.BundleSink)
         output_filename: a spreadsheet filename that the comparison is to be
                          written to
+        stf: (optional) support timeframe of the energy sums, default: the
+             first one
 
      Returns:
         Nothing
 
-    To do:
-        Don't use report spreadsheets, instead load pickled problem
-        instances. This would make this function less fragile and dependent
-        on the output format of urbs.report().
+    The results are read one at a time by urbs.compare_results, which only
+    keeps their costs, capacities and energy sums.
     """
 
     # derive list of scenario names for column labels/figure captions
-    scenario_names = [os.path.basename(rf)  # drop folder names, keep filename
+    scenario_names = [urbs.scenario_name(rf)  # drop folders and extension
                       .replace('_', ' ')  # replace _ with spaces
-                      .replace('.xlsx', '')  # drop file extension
                       .replace('scenario ', '')  # drop 'scenario ' prefix
                       for rf in result_files]
 
@@ -119,83 +124,36 @@ def compare_scenarios(result_files, output_filename):
     except ValueError:
         pass  # do nothing if no base scenario is found
 
-    costs = []  # total costs by type and scenario
-    esums = []  # sum of energy produced by scenario
-
     # READ
 
-    for rf in result_files:                                     ##ToDO ab hier code aus "debugfile.py"
-        with pd.ExcelFile(rf) as xls:
-            cost = xls.parse('Costs', index_col=[0])
-            esum = xls.parse('Commodity sums')
-
-
-            # repair broken MultiIndex in the first column
-            esum.reset_index(inplace=True)
-            #print("esum.columns:", esum.columns)  # Überprüfe die vorhandenen Spaltennamen
-            esum.fillna(method='ffill', inplace=True)
-            esum.set_index(['Unnamed: 0', 'Unnamed: 1'], inplace=True) ##ToDO personal fix
-
-            costs.append(cost)
-
-            def normalize_column_name(col): ##ToDO created function
-                if isinstance(col, str):
-                    return col.replace('2024.', '') #ToDO change year if needed
-                elif isinstance(col, tuple):
-                    return '.'.join(col[1:])  # z.B. ('2024', 'North', 'Elec') -> 'North.Elec'
-                return col
-
-            # Extrahiere Sites und Commodities aus den Spaltennamen #ToDO changed --> see repository for original
-            esum.columns = [normalize_column_name(col) for col in esum.columns]
-            sitcom = [value.split('.') for value in esum.columns]
-            sitcom = [item for item in sitcom if len(item) == 2]
-            #print("sitcom after renaming and splitting:", sitcom)
-
-
-            # Extrahiere die Commodities (wie Elec, CO2)
-            coms = set([com for sit, com in sitcom])
-
-            # DataFrame zur Speicherung der Commodity-Summen
-            com_sums = pd.DataFrame()
-
-            # Erhalte die site.commodity Namen
-            sit_com = esum.columns.get_level_values(0)
-
-            # Summiere jede Commodity (z.B. Elec, CO2)
-            for com in coms: ##ToDo manually changed sum each commodity
-                com_sum = pd.DataFrame(esum.loc[:, sit_com.str.contains(com)]
-                                       .sum(axis=1), columns=[com])
-                com_sums = pd.concat([com_sums, com_sum], axis=1)
-            esums.append(com_sums)
-
-
+    comparison = urbs.compare_results(result_files, scenario_names)
+    costs = comparison['costs']
+    esums = comparison['energies']
+    if stf is None:
+        stf = esums.index.get_level_values('stf').min()
+    esums = esums.xs(stf, level='stf')
 
-    # merge everything into one DataFrame each
-    costs = pd.concat(costs, axis=1, keys=scenario_names)
-    esums = pd.concat(esums, axis=1, keys=scenario_names)
+    # only commodities created in any scenario
+    created = esums.groupby(level='com', sort=False).sum().sum(axis=1)
+    coms = list(created.index[created > 0])
+    esums = esums[esums.index.get_level_values('com').isin(coms)]
 
     # ANALYSE
 
-    # drop redundant 'costs' column label
     # make index name nicer for plot
     # sort/transpose frame
     # convert EUR/a to 1e9 EUR/a
-    costs.columns = costs.columns.droplevel(1)
     costs.index.name = 'Cost type'
     costs = costs.sort_index().transpose()
     costs = costs / 1e9
     spent = costs.loc[:, costs.sum() > 0]
     earnt = costs.loc[:, costs.sum() < 0]
 
-    # extract created
-    # per commodity (e.g. 'Elec', 'CO2', 'Heat'...)
-    # make index name 'Commodity' nicer for plot
-    # drop all unused commodities and sort/transpose
+    # extract created energy by (scenario, commodity) and process
+    # drop all unused processes and sort them
     # convert MWh to GWh
-    esums = esums.loc['Created']
-    esums.index.name = 'Commodity'
-    used_commodities = (esums.sum(axis=1) > 0)
-    esums = esums[used_commodities].sort_index().transpose()
+    esums = esums.T.stack(level='com').fillna(0)
+    esums = esums.loc[:, esums.sum() > 0].sort_index(axis=1)
     esums = esums / 1e3
 
     # PLOT
@@ -259,15 +217,16 @@ def compare_scenarios(result_files, output_filename):
 
     # REPORT
     with pd.ExcelWriter('{}.{}'.format(output_filename, 'xlsx')) as writer:
-        costs.to_excel(writer, 'Costs')
-        esums.to_excel(writer, 'Energy sums')
+        costs.to_excel(writer, sheet_name='Costs')
+        esums.to_excel(writer, sheet_name='Energy sums')
+        comparison['capacities'].to_excel(writer, sheet_name='Capacities')
 
 if __name__ == '__main__':
 
     directories = sys.argv[1:]
     if not directories:
         # get the directory of the supposedly last run
-        # and retrieve (glob) a list of all result spreadsheets from there
+        # and retrieve (glob) a list of all result files from there
         directories = [get_most_recent_entry('result')]
 
     for directory in directories:
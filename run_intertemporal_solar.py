@@ -99,11 +99,50 @@ scenarios = [
 
 
 
-for scenario in scenarios:
-    prob = urbs.run_scenario(input_path, solver, timesteps, scenario,
-                             result_dir, dt, objective,
-                             plot_tuples=plot_tuples,
-                             plot_sites_name=plot_sites_name,
-                             plot_periods=plot_periods,
-                             report_tuples=report_tuples,
-                             report_sites_name=report_sites_name)
+# how to run the scenarios:
+# 'serial': one after the other, each with its own model
+# 'sweep': on one model instance where they only differ in urbs-solar
+#          parameters (needs a persistent solver, c.f. run_scenario_sweep)
+# 'parallel': in worker processes (c.f. run_scenarios_parallel)
+# 'learning_curves': the first scenario with every learning curve of
+#                    Params.xlsx (c.f. run_learning_curve_sweep)
+run_mode = 'serial'
+
+if run_mode == 'sweep':
+    prob = urbs.run_scenario_sweep(input_path, solver, timesteps, scenarios,
+                                   result_dir, dt, objective,
+                                   plot_tuples=plot_tuples,
+                                   plot_sites_name=plot_sites_name,
+                                   plot_periods=plot_periods,
+                                   report_tuples=report_tuples,
+                                   report_sites_name=report_sites_name,
+                                   input_cache=True)
+elif run_mode == 'parallel':
+    summary = urbs.run_scenarios_parallel(input_path, solver, timesteps,
+                                          scenarios, result_dir, dt,
+                                          objective,
+                                          processes=4, solver_threads=2,
+                                          plot_tuples=plot_tuples,
+                                          plot_sites_name=plot_sites_name,
+                                          plot_periods=plot_periods,
+                                          report_tuples=report_tuples,
+                                          report_sites_name=report_sites_name,
+                                          input_cache=True)
+    print(summary)
+    summary.to_csv(os.path.join(result_dir, 'summary.csv'))
+elif run_mode == 'learning_curves':
+    summary = urbs.run_learning_curve_sweep(input_path, solver, timesteps,
+                                            result_dir, dt, objective,
+                                            scenario=scenarios[0],
+                                            input_cache=True)
+    summary.to_csv(os.path.join(result_dir, 'summary.csv'))
+else:
+    for scenario in scenarios:
+        prob = urbs.run_scenario(input_path, solver, timesteps, scenario,
+                                 result_dir, dt, objective,
+                                 plot_tuples=plot_tuples,
+                                 plot_sites_name=plot_sites_name,
+                                 plot_periods=plot_periods,
+                                 report_tuples=report_tuples,
+                                 report_sites_name=report_sites_name,
+                                 input_cache=True)
@@ -14,11 +14,20 @@ from .colorcodes import COLORS
 from .model import create_model
 from .input import *
 from .validation import validate_input
-from .output import get_constants, get_timeseries
-from .plot import plot, result_figures, to_color
-from .pyomoio import get_entity, get_entities, list_entities
+from .output import TimeseriesCube, get_constants, get_timeseries
+from .plot import plot, result_figures, to_color, balance_data, \
+    plot_balance, plot_pool
+from .pyomoio import get_entity, get_entities, get_duals, list_entities
 from .report import report
+from .reportsink import ExcelSink, BundleSink, REPORT_SINKS, \
+    create_report_sink, read_bundle_manifest, read_bundle_table
 from .runfunctions import *
 from .saveload import load, save
+from .comparison import compare_results, result_summary, scenario_name, \
+    is_report_bundle
 from .scenarios import *
+from .solarparams import SolarParams, read_solar_params, update_solar_params
+from .scenariodelta import ScenarioDelta, read_scenario_deltas
+from .buildtrace import BuildTrace, BuildProfile
+from .lpmatrix import sparse_lp, write_mps, solve_highs
 from .identify import identify_mode, identify_expansion
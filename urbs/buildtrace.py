@@ -0,0 +1,243 @@
+import itertools
+import json
+import sys
+import time
+import pandas as pd
+import pyomo.core as pyomo
+
+# trace levels, each one includes the records of the levels before it
+#   - model: one 'model' record per build (time, number of components,
+#     variables and constraints)
+#   - component: one 'component' record per model component (type, number
+#     of entries, construction time)
+#   - expression: component records of constraints, expressions and
+#     objectives also contain sample expressions
+BUILD_TRACE_LEVELS = ['model', 'component', 'expression']
+
+# component types with expressions and the maximum length of a sample
+TRACED_EXPRESSION_TYPES = (pyomo.Constraint, pyomo.Expression,
+                           pyomo.Objective)
+SAMPLE_LENGTH = 500
+
+
+class BuildTrace(object):
+    """Opt-in structured log of model builds (c.f. create_model).
+
+    Each record is written as one JSON object per line and has the keys
+    'event', 'level', 'timestamp' and 'tag' (e.g. the scenario name).
+    Expressions are only turned into strings at level 'expression', as
+    this is expensive for large components.
+
+    Args:
+        - filename: JSON-lines file, records are appended
+        - level: one of BUILD_TRACE_LEVELS, default: 'component'
+        - samples: number of sample expressions per component
+        - tag: (optional) value of the 'tag' key of all records
+    """
+    def __init__(self, filename, level='component', samples=2, tag=None):
+        if level not in BUILD_TRACE_LEVELS:
+            raise ValueError("Unknown build trace level '{}'. Choose one of "
+                             "{}.".format(level, BUILD_TRACE_LEVELS))
+        self.filename = filename
+        self.level = level
+        self.samples = samples
+        self.tag = tag
+
+    def tagged(self, tag):
+        """Copy of the trace that writes to the same file with a new tag."""
+        return BuildTrace(self.filename, self.level, self.samples, tag)
+
+    def enabled(self, level):
+        """True if records of the given level are written."""
+        return (BUILD_TRACE_LEVELS.index(level) <=
+                BUILD_TRACE_LEVELS.index(self.level))
+
+    def record(self, level, event, **fields):
+        """Write a record if its level is enabled."""
+        if not self.enabled(level):
+            return
+        record = {'event': event, 'level': level,
+                  'timestamp': time.time(), 'tag': self.tag}
+        record.update(fields)
+        with open(self.filename, 'a') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+
+    def start_component(self, name):
+        """Called before a model component is constructed."""
+        pass
+
+    def component(self, component, seconds):
+        """Record the construction of a model component."""
+        if not self.enabled('component'):
+            return
+        fields = {'name': component.name,
+                  'type': component.ctype.__name__,
+                  'count': len(component),
+                  'seconds': seconds}
+        if (self.enabled('expression') and
+                isinstance(component, TRACED_EXPRESSION_TYPES)):
+            fields['samples'] = [
+                (str(index), str(data.expr)[:SAMPLE_LENGTH])
+                for index, data in itertools.islice(component.items(),
+                                                    self.samples)]
+        self.record('component', 'component', **fields)
+
+    def model(self, m, seconds):
+        """Record a finished model build."""
+        self.record('model', 'model', name=m.name,
+                    components=len(list(m.component_objects())),
+                    variables=m.nvariables(),
+                    constraints=m.nconstraints(),
+                    seconds=seconds)
+
+
+def peak_rss():
+    """Peak resident set size of the process in bytes, None if unknown.
+
+    Uses the resource module, on Windows the optional psutil package.
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes, except on macOS
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def component_source():
+    """Name of the urbs function that is adding a model component."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('urbs.') and module != __name__:
+            return frame.f_code.co_name
+        frame = frame.f_back
+    return None
+
+
+class BuildProfile(object):
+    """Profiler of model builds (c.f. create_model).
+
+    Records wall time, growth of the peak resident set size and number of
+    entries of each model component, and the urbs function that added it
+    (e.g. create_model, add_storage). Pass it as trace to create_model or
+    as build_trace to run_scenario.
+
+    Example:
+        >>> profile = BuildProfile()
+        >>> prob = create_model(data, solar, dt, timesteps, trace=profile)
+        >>> print(profile.report().head(10))
+        >>> profile.write_chrome_trace('build.json')
+
+    The Chrome trace format can be opened with chrome://tracing, Perfetto
+    or speedscope.
+    """
+    def __init__(self):
+        self.components = []
+        self.builds = []
+        self.tag = None
+        self._start = None
+
+    def tagged(self, tag):
+        """Copy of the profile that records into the same lists with a new
+        tag (e.g. scenario name)."""
+        profile = BuildProfile()
+        profile.components = self.components
+        profile.builds = self.builds
+        profile.tag = tag
+        return profile
+
+    def start_component(self, name):
+        """Called before a model component is constructed."""
+        self._start = (time.perf_counter(), peak_rss(), component_source())
+
+    def component(self, component, seconds):
+        """Record the construction of a model component."""
+        start, rss, source = self._start
+        rss_after = peak_rss()
+        count = len(component)
+        self.components.append({
+            'name': component.name,
+            'type': component.ctype.__name__,
+            'source': source,
+            'count': count,
+            'rows': count if component.ctype is pyomo.Constraint else 0,
+            'variables': count if component.ctype is pyomo.Var else 0,
+            'start': start,
+            'seconds': seconds,
+            'peak rss delta (MB)': (None if rss is None
+                                    else (rss_after - rss) / 1e6)})
+
+    def model(self, m, seconds):
+        """Record a finished model build."""
+        self.builds.append({'name': self.tag or m.name,
+                            'start': time.perf_counter() - seconds,
+                            'seconds': seconds})
+
+    def report(self):
+        """Components sorted by build time.
+
+        Returns:
+            a DataFrame indexed by component name with the columns type,
+            source, count, rows, variables, seconds and
+            'peak rss delta (MB)'
+        """
+        report = pd.DataFrame(self.components,
+                              columns=['name', 'type', 'source', 'count',
+                                       'rows', 'variables', 'start',
+                                       'seconds', 'peak rss delta (MB)'])
+        return (report.drop(columns='start')
+                      .set_index('name')
+                      .sort_values('seconds', ascending=False))
+
+    def report_by_source(self):
+        """Build time, rows and variables summed per adding function."""
+        return (self.report()
+                    .groupby('source')[['seconds', 'rows', 'variables']]
+                    .sum()
+                    .sort_values('seconds', ascending=False))
+
+    def write_chrome_trace(self, filename):
+        """Write the recorded builds in the Chrome trace event format.
+
+        Args:
+            filename: JSON file to be written
+
+        Returns:
+            None
+        """
+        events = []
+        for build in self.builds:
+            events.append({'name': build['name'], 'cat': 'model', 'ph': 'X',
+                           'ts': build['start'] * 1e6,
+                           'dur': build['seconds'] * 1e6,
+                           'pid': 1, 'tid': 1})
+        for entry in self.components:
+            events.append({'name': entry['name'], 'cat': entry['type'],
+                           'ph': 'X', 'ts': entry['start'] * 1e6,
+                           'dur': entry['seconds'] * 1e6,
+                           'pid': 1, 'tid': 1,
+                           'args': {key: entry[key] for key in
+                                    ['source', 'count',
+                                     'peak rss delta (MB)']}})
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+class TracedModel(pyomo.ConcreteModel):
+    """ConcreteModel that reports each added component to a BuildTrace
+    or BuildProfile."""
+    def __init__(self, trace, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._trace = trace
+
+    def add_component(self, name, val):
+        self._trace.start_component(name)
+        start = time.perf_counter()
+        super().add_component(name, val)
+        self._trace.component(val, time.perf_counter() - start)
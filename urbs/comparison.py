@@ -0,0 +1,133 @@
+import os
+import pandas as pd
+from .pyomoio import get_entity
+from .reportsink import BUNDLE_MANIFEST, read_bundle_manifest, \
+    read_bundle_table
+from .saveload import load
+
+# summaries of a scenario result (c.f. result_summary) and their index
+SUMMARY_LEVELS = {
+    'costs': ['cost_type'],
+    'capacities': ['stf', 'pro'],
+    'energies': ['stf', 'com', 'pro']}
+
+
+def is_report_bundle(path):
+    """True if path is a report bundle folder (c.f. urbs.BundleSink)."""
+    return os.path.isfile(os.path.join(path, BUNDLE_MANIFEST))
+
+
+def _store_summary(filename):
+    """Summary of a HDF5 result store; only the needed entities are read."""
+    with load(filename) as result:
+        costs = get_entity(result, 'costs')
+        capacities = (get_entity(result, 'cap_pro')
+                      .groupby(level=['stf', 'pro']).sum())
+        energies = [get_entity(result, 'e_pro_out')
+                    .groupby(level=['stf', 'com', 'pro']).sum()]
+
+        # stock commodities are created as 'Stock', like in the report
+        stock = get_entity(result, 'e_co_stock')
+        if not stock.empty:
+            stock = stock.xs('Stock', level='com_type')
+            stock = stock.groupby(level=['stf', 'com']).sum()
+            stock.index = pd.MultiIndex.from_tuples(
+                [key + ('Stock',) for key in stock.index])
+            energies.append(stock)
+
+    return {'costs': costs,
+            'capacities': capacities,
+            'energies': pd.concat(energies)}
+
+
+def _bundle_summary(folder):
+    """Summary of a report bundle; only the needed tables are read."""
+    manifest = read_bundle_manifest(folder)
+    costs = read_bundle_table(folder, 'Costs', manifest=manifest)['costs']
+    capacities = read_bundle_table(folder, 'Process caps', ['Total'],
+                                   manifest=manifest)['Total']
+    capacities = capacities.groupby(level=['Stf', 'Process']).sum()
+
+    # columns of the commodity sums are named 'stf.sit.com'
+    sums = read_bundle_table(folder, 'Commodity sums', manifest=manifest)
+    created = sums.xs('Created', level=0)
+    keys = [(float(column.split('.', 1)[0]), column.rsplit('.', 1)[1])
+            for column in created.columns]
+    created.columns = pd.MultiIndex.from_tuples(keys)
+    energies = created.T.groupby(level=[0, 1]).sum().stack()
+
+    return {'costs': costs,
+            'capacities': capacities,
+            'energies': energies}
+
+
+def result_summary(path):
+    """Costs, process capacities and created energy of a scenario result.
+
+    Args:
+        path: a HDF5 store written by urbs.save or a report bundle folder
+            (c.f. urbs.BundleSink)
+
+    Returns:
+        dict of Series, indexed like SUMMARY_LEVELS:
+
+        - costs: total costs by cost type
+        - capacities: total process capacity by support timeframe and
+          process, summed over all sites
+        - energies: sum over all timesteps of the commodity created by each
+          process (or 'Stock'), by support timeframe and commodity, summed
+          over all sites; for bundles only the report tuples are included
+    """
+    if is_report_bundle(path):
+        summary = _bundle_summary(path)
+    else:
+        summary = _store_summary(path)
+
+    for name, levels in SUMMARY_LEVELS.items():
+        summary[name].index.names = levels
+        summary[name].name = None
+    return summary
+
+
+def scenario_name(path):
+    """Scenario name of a result file (or folder): its name without
+    extension."""
+    return os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+
+
+def compare_results(paths, names=None):
+    """Compare the results of several scenarios.
+
+    The results are read one after another and only their summaries are
+    kept in memory (c.f. result_summary); the summaries of all scenarios
+    are then joined at once.
+
+    Args:
+        - paths: list of HDF5 stores or report bundle folders
+        - names: (optional) list of scenario names, one per path, default:
+          the file names (c.f. scenario_name)
+
+    Returns:
+        dict of DataFrames with one column per scenario, the keys and index
+        levels of SUMMARY_LEVELS; missing values are 0
+    """
+    if names is None:
+        names = [scenario_name(path) for path in paths]
+    if len(names) != len(paths):
+        raise ValueError("compare_results needs one name per result, got "
+                         "{} names for {} results."
+                         .format(len(names), len(paths)))
+
+    summaries = {name: [] for name in SUMMARY_LEVELS}
+    for path in paths:
+        summary = result_summary(path)
+        for name in SUMMARY_LEVELS:
+            summaries[name].append(summary[name])
+
+    comparison = {}
+    for name, levels in SUMMARY_LEVELS.items():
+        frame = pd.concat(summaries[name], axis=1, keys=names).fillna(0)
+        frame.columns.name = 'scenario'
+        frame.index.names = levels
+        comparison[name] = frame
+    return comparison
@@ -1,43 +1,57 @@
+import functools
+import numpy as np
+import pandas as pd
 from .transmission import transmission_balance
 from .storage import storage_balance
 
+# maximum number of cached operational windows; there is one per signature
+# (stf grid, weight, rule, year of end, year built) of a unit
+OPERATIONAL_WINDOW_CACHE_SIZE = 4096
+
 
 def invcost_factor(dep_prd, interest, discount=None, year_built=None,
                    stf_min=None):
     """Investment cost factor formula.
     Evaluates the factor multiplied to the invest costs
     for depreciation duration and interest rate.
+    All arguments may be scalars or arrays (e.g. DataFrame columns); the
+    factor is then evaluated elementwise in one pass.
     Args:
         dep_prd: depreciation period (years)
         interest: interest rate (e.g. 0.06 means 6 %)
         year_built: year utility is built
         discount: discount rate for intertmeporal planning
     """
-    # invcost factor for non intertemporal planning
-    if discount is None:
-        if interest == 0:
-            return 1 / dep_prd
-        else:
-            return ((1 + interest) ** dep_prd * interest /
-                    ((1 + interest) ** dep_prd - 1))
-    # invcost factor for intertemporal planning
-    elif discount == 0:
-        if interest == 0:
-            return 1
-        else:
-            return (dep_prd * ((1 + interest) ** dep_prd * interest) /
-                    ((1 + interest) ** dep_prd - 1))
-    else:
-        if interest == 0:
-            return ((1 + discount) ** (1 - (year_built-stf_min)) *
-                    ((1 + discount) ** dep_prd - 1) /
-                    (dep_prd * discount * (1 + discount) ** dep_prd))
-        else:
-            return ((1 + discount) ** (1 - (year_built-stf_min)) *
-                    (interest * (1 + interest) ** dep_prd *
-                    ((1 + discount) ** dep_prd - 1)) /
-                    (discount * (1 + discount) ** dep_prd *
-                    ((1+interest) ** dep_prd - 1)))
+    dep_prd = np.asarray(dep_prd, dtype=float)
+    interest = np.asarray(interest, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = ((1 + interest) ** dep_prd * interest /
+                   ((1 + interest) ** dep_prd - 1))
+
+        # invcost factor for non intertemporal planning
+        if discount is None:
+            return np.where(interest == 0, 1 / dep_prd, annuity)[()]
+
+        # invcost factor for intertemporal planning
+        discount = np.asarray(discount, dtype=float)
+        year_built = np.asarray(year_built, dtype=float)
+        no_discount = np.where(
+            interest == 0, 1,
+            (dep_prd * ((1 + interest) ** dep_prd * interest) /
+             ((1 + interest) ** dep_prd - 1)))
+        with_discount = np.where(
+            interest == 0,
+            ((1 + discount) ** (1 - (year_built-stf_min)) *
+             ((1 + discount) ** dep_prd - 1) /
+             (dep_prd * discount * (1 + discount) ** dep_prd)),
+            ((1 + discount) ** (1 - (year_built-stf_min)) *
+             (interest * (1 + interest) ** dep_prd *
+              ((1 + discount) ** dep_prd - 1)) /
+             (discount * (1 + discount) ** dep_prd *
+              ((1+interest) ** dep_prd - 1))))
+
+        return np.where(discount == 0, no_discount, with_discount)[()]
 
 
 def overpay_factor(dep_prd, interest, discount, year_built, stf_min, stf_end):
@@ -45,6 +59,8 @@ def overpay_factor(dep_prd, interest, discount, year_built, stf_min, stf_end):
     Evaluates the factor multiplied to the invest costs
     for all annuity payments of a unit after the end of the
     optimization period.
+    All arguments may be scalars or arrays (e.g. DataFrame columns); the
+    factor is then evaluated elementwise in one pass.
     Args:
         dep_prd: depreciation period (years)
         interest: interest rate (e.g. 0.06 means 6 %)
@@ -52,56 +68,69 @@ def overpay_factor(dep_prd, interest, discount, year_built, stf_min, stf_end):
         discount: discount rate for intertemporal planning
         k: operational time after simulation horizon
     """
+    dep_prd = np.asarray(dep_prd, dtype=float)
+    interest = np.asarray(interest, dtype=float)
+    discount = np.asarray(discount, dtype=float)
+    year_built = np.asarray(year_built, dtype=float)
 
     op_time = (year_built + dep_prd) - stf_end - 1
 
-    if discount == 0:
-        if interest == 0:
-            return op_time / dep_prd
-        else:
-            return (op_time * ((1 + interest) ** dep_prd * interest) /
-                    ((1 + interest) ** dep_prd - 1))
-    else:
-        if interest == 0:
-            return ((1 + discount) ** (1 - (year_built - stf_min)) *
-                    ((1 + discount) ** op_time - 1) /
-                    (dep_prd * discount * (1 + discount) ** dep_prd))
-        else:
-            return ((1 + discount) ** (1 - (year_built - stf_min)) *
-                    (interest * (1 + interest) ** dep_prd *
-                    ((1 + discount) ** op_time - 1)) /
-                    (discount * (1 + discount) ** dep_prd *
-                    ((1 + interest) ** dep_prd - 1)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        no_discount = np.where(
+            interest == 0,
+            op_time / dep_prd,
+            (op_time * ((1 + interest) ** dep_prd * interest) /
+             ((1 + interest) ** dep_prd - 1)))
+        with_discount = np.where(
+            interest == 0,
+            ((1 + discount) ** (1 - (year_built - stf_min)) *
+             ((1 + discount) ** op_time - 1) /
+             (dep_prd * discount * (1 + discount) ** dep_prd)),
+            ((1 + discount) ** (1 - (year_built - stf_min)) *
+             (interest * (1 + interest) ** dep_prd *
+              ((1 + discount) ** op_time - 1)) /
+             (discount * (1 + discount) ** dep_prd *
+              ((1 + interest) ** dep_prd - 1))))
+
+        return np.where(discount == 0, no_discount, with_discount)[()]
 
 
 # Energy related costs
 def stf_dist(stf, m):
     """Calculates the distance between the modeled support timeframes.
+    stf may be a single support timeframe or an array of them.
     """
-    sorted_stf = sorted(m.stf_list)
-    dist = []
-
-    for s in sorted_stf:
-        if s == max(sorted_stf):
-            dist.append(m.global_prop.loc[(s, 'Weight')]['value'])
-        else:
-            dist.append(sorted_stf[sorted_stf.index(s) + 1] - s)
-
-    return dist[sorted_stf.index(stf)]
+    sorted_stf = np.array(sorted(m.stf_list))
+    # distance to the next support timeframe, weight for the last one
+    dist = np.append(np.diff(sorted_stf),
+                     m.global_prop.loc[(sorted_stf[-1], 'Weight')]['value'])
+
+    # positions of stf, which must be modelled support timeframes
+    idx = np.minimum(np.searchsorted(sorted_stf, stf), len(sorted_stf) - 1)
+    unknown = sorted_stf[idx] != stf
+    if np.any(unknown):
+        raise ValueError("Unknown support timeframe {}. Choose one of {}."
+                         .format(np.asarray(stf)[unknown].tolist()
+                                 if np.ndim(stf) else stf,
+                                 sorted_stf.tolist()))
+    return dist[idx]
 
 
 def discount_factor(stf, m):
     """Discount for any payment made in the year stf
+    stf may be a single year or an array of years.
     """
+    stf_min = m.global_prop.index.min()[0]
     discount = (m.global_prop.xs('Discount rate', level=1)
-                .loc[m.global_prop.index.min()[0]]['value'])
+                .loc[stf_min]['value'])
 
-    return (1 + discount) ** (1 - (stf - m.global_prop.index.min()[0]))
+    return (1 + discount) ** (1 - (np.asarray(stf) - stf_min))
 
 
 def effective_distance(dist, m):
     """Factor for variable, fuel, purchase, sell, and fix costs.
     Calculated by repetition of modeled stfs and discount utility.
+    dist may be a single distance or an array of distances.
     """
     discount = (m.global_prop.xs('Discount rate', level=1)
                 .loc[m.global_prop.index.min()[0]]['value'])
@@ -109,7 +138,48 @@ def effective_distance(dist, m):
     if discount == 0:
         return dist
     else:
-        return (1 - (1 + discount) ** (-dist)) / discount
+        return (1 - (1 + discount) ** (-np.asarray(dist))) / discount
+
+
+def commodity_balance_index(m):
+    """Index of all flow variables that enter a commodity balance.
+
+    Groups the keys of e_pro_in, e_pro_out, e_sto_in/e_sto_out and
+    e_tra_in/e_tra_out by (stf, sit, com) once, so that commodity_balance
+    only visits the flows of the requested commodity instead of scanning
+    all process, storage and transmission tuples for every call.
+
+    Args:
+        m: the model object (after all features have been added)
+
+    Returns:
+        a dict with keys 'pro_in', 'pro_out', 'sto', 'tra_in', 'tra_out',
+        each mapping (stf, sit, com) to a list of index tuples
+    """
+    index = {'pro_in': {}, 'pro_out': {}, 'sto': {},
+             'tra_in': {}, 'tra_out': {}}
+
+    for (stf, sit, pro, com) in m.pro_input_tuples:
+        index['pro_in'].setdefault((stf, sit, com), []).append(
+            (stf, sit, pro, com))
+    for (stf, sit, pro, com) in m.pro_output_tuples:
+        index['pro_out'].setdefault((stf, sit, com), []).append(
+            (stf, sit, pro, com))
+
+    if m.mode['sto']:
+        for (stf, sit, sto, com) in m.sto_tuples:
+            index['sto'].setdefault((stf, sit, com), []).append(
+                (stf, sit, sto, com))
+
+    if m.mode['tra']:
+        for (stf, sin, sout, tra, com) in m.tra_tuples:
+            # exports leave site_in, imports arrive at site_out
+            index['tra_in'].setdefault((stf, sin, com), []).append(
+                (stf, sin, sout, tra, com))
+            index['tra_out'].setdefault((stf, sout, com), []).append(
+                (stf, sin, sout, tra, com))
+
+    return index
 
 
 def commodity_balance(m, tm, stf, sit, com):
@@ -125,22 +195,14 @@ def commodity_balance(m, tm, stf, sit, com):
     Returns:
         balance: net value of consumed (positive) or provided (negative) power
     """
-
-    # Print input parameters for debugging
-    #print(f"Timestep: {tm}, Year: {stf}, Site: {sit}, Commodity: {com}")
+    key = (stf, sit, com)
 
     # Sum of energy inputs
-    sum_e_pro_in = sum(m.e_pro_in[(tm, stframe, site, process, com)]
-                       for stframe, site, process in m.pro_tuples
-                       if site == sit and stframe == stf and
-                       (stframe, process, com) in m.r_in_dict)
-    #print("sum_e_pro_in:", sum_e_pro_in)
+    sum_e_pro_in = sum(m.e_pro_in[(tm,) + p]
+                       for p in m.com_balance_index['pro_in'].get(key, ()))
     # Sum of energy outputs
-    sum_e_pro_out = sum(m.e_pro_out[(tm, stframe, site, process, com)]
-                        for stframe, site, process in m.pro_tuples
-                        if site == sit and stframe == stf and
-                        (stframe, process, com) in m.r_out_dict)
-
+    sum_e_pro_out = sum(m.e_pro_out[(tm,) + p]
+                        for p in m.com_balance_index['pro_out'].get(key, ()))
 
     # Initialize balance with energy inputs minus outputs
     balance = sum_e_pro_in - sum_e_pro_out
@@ -148,12 +210,10 @@ def commodity_balance(m, tm, stf, sit, com):
     # Add transmission balance if applicable
     if m.mode['tra']:
         balance += transmission_balance(m, tm, stf, sit, com)
-        #print(f"Balance after transmission: {balance}")
 
     # Add storage balance if applicable
     if m.mode['sto']:
         balance += storage_balance(m, tm, stf, sit, com)
-        #print(f"Balance after storage: {balance}")
 
     return balance
 
@@ -177,31 +237,134 @@ def commodity_subset(com_tuples, type_name):
                    in com_tuples if com in type_name)
 
 
+def process_commodity_tuples(pro_tuples, ratios):
+    """Combine process tuples with the commodities of their ratios.
+
+    Joins the (stf, sit, pro) tuples with the (stf, pro, com) keys of a
+    ratio dict on (stf, pro) in one merge instead of comparing every
+    process with every key.
+
+    Args:
+        - pro_tuples: iterable of (stf, sit, pro) tuples
+        - ratios: dict with (stf, pro, com) keys, e.g. m.r_in_dict
+
+    Returns:
+        a list of (stf, sit, pro, com) tuples, ordered by pro_tuples and
+        then by the keys of ratios
+    """
+    processes = pd.DataFrame(list(pro_tuples), columns=['stf', 'sit', 'pro'])
+    commodities = pd.DataFrame(list(ratios.keys()),
+                               columns=['stf', 'pro', 'com'])
+    if processes.empty or commodities.empty:
+        return []
+    tuples = processes.merge(commodities, on=['stf', 'pro'], how='inner')
+    return list(tuples[['stf', 'sit', 'pro', 'com']].astype(object)
+                .itertuples(index=False, name=None))
+
+
+@functools.lru_cache(maxsize=OPERATIONAL_WINDOW_CACHE_SIZE)
+def _operational_window(stf_grid, weight, midpoint, strict_end, end, built):
+    """Operational flag per support timeframe of one unit signature
+    (c.f. operational_windows)."""
+    stf = np.array(stf_grid, dtype=float)
+    threshold = np.append((stf[:-1] + stf[1:]) / 2 if midpoint else stf[1:],
+                          stf[-1] + weight - 1)
+    operational = threshold <= end
+    if strict_end:
+        operational[-1] = threshold[-1] < end
+    if built is not None:
+        operational &= built <= stf
+    # shared between callers through the cache
+    operational.flags.writeable = False
+    return operational
+
+
+def operational_windows(m, end, built=None, midpoint=False,
+                        strict_end=False):
+    """Support timeframes in which units are operational.
+
+    A unit is operational in a support timeframe stf_later if it lasts
+    until the next support timeframe (with midpoint: until halfway to it),
+    in the last one until the end of the modelled period. Units with the
+    same signature (year of end, year built) share one window, which is
+    cached per stf grid and rule, so repeated builds reuse it.
+
+    Args:
+        - m: the model object
+        - end: sequence of years the units last until, e.g. the year built
+          plus depreciation
+        - built: (optional) sequence of years the units are built in; only
+          support timeframes from then on count
+        - midpoint: compare with the middle between two support
+          timeframes instead of the next one (processes)
+        - strict_end: units must outlast the end of the last support
+          timeframe strictly (installed units)
+
+    Returns:
+        a tuple (sorted stf list, unit positions, stf positions) of all
+        operational combinations, ordered by unit and stf
+    """
+    sorted_stf = sorted(m.stf)
+    weight = m.global_prop_dict['value'][(sorted_stf[-1], 'Weight')]
+    if built is None:
+        built = [None] * len(end)
+    signatures = [(float(e), None if b is None else float(b))
+                  for e, b in zip(end, built)]
+    if not signatures:
+        return sorted_stf, np.array([], dtype=int), np.array([], dtype=int)
+
+    # one window per distinct signature, then one row per unit
+    position = {}
+    for signature in signatures:
+        position.setdefault(signature, len(position))
+    grid = tuple(float(stf) for stf in sorted_stf)
+    windows = np.array([
+        _operational_window(grid, float(weight), midpoint, strict_end,
+                            *signature)
+        for signature in position])
+    operational = windows[[position[signature] for signature in signatures]]
+    units, stfs = np.nonzero(operational)
+    return sorted_stf, units, stfs
+
+
+def build_years(operational_tuples, stf):
+    """Build years of the units that are operational in each stf.
+
+    Groups the operational tuples once, so that the capacity expressions
+    (cap_pro, cap_sto_c, cap_sto_p, cap_tra) only visit the build years of
+    their own unit instead of testing every stf for membership.
+
+    Args:
+        - operational_tuples: (unit..., stf_built, stf_later) tuples, e.g.
+          m.operational_pro_tuples
+        - stf: the set of support timeframes, gives the order of the build
+          years
+
+    Returns:
+        a dict {(unit..., stf_later): list of stf_built}
+    """
+    position = {year: i for i, year in enumerate(stf)}
+    years = {}
+    for key in operational_tuples:
+        years.setdefault(key[:-2] + key[-1:], []).append(key[-2])
+    for built in years.values():
+        built.sort(key=position.get)
+    return years
+
+
 def op_pro_tuples(pro_tuple, m):
     """ Tuples for operational status of units (processes, transmissions,
     storages) for intertemporal planning.
     Only such tuples where the unit is still operational until the next
     support time frame are valid.
     """
-    op_pro = []
-    sorted_stf = sorted(list(m.stf))
-
-    for (stf, sit, pro) in pro_tuple:
-        for stf_later in sorted_stf:
-            index_helper = sorted_stf.index(stf_later)
-            if stf_later == max(sorted_stf):
-                if (stf_later +
-                    m.global_prop.loc[(max(sorted_stf), 'Weight'), 'value'] -
-                    1 <= stf + m.process_dict['depreciation'][
-                                              (stf, sit, pro)]):
-                    op_pro.append((sit, pro, stf, stf_later))
-            elif ((stf_later + sorted_stf[index_helper + 1])/2 <= stf + m.process_dict['depreciation'][(stf, sit, pro)]
-                  and stf <= stf_later):
-                op_pro.append((sit, pro, stf, stf_later))
-            else:
-                pass
-
-    return op_pro
+    keys = list(pro_tuple)
+    sorted_stf, units, stfs = operational_windows(
+        m, [stf + m.process_dict['depreciation'][(stf, sit, pro)]
+            for (stf, sit, pro) in keys],
+        built=[stf for (stf, sit, pro) in keys], midpoint=True)
+    return [(keys[u][1], keys[u][2], keys[u][0], sorted_stf[s])
+            for u, s in zip(units, stfs)]
 
 
 def inst_pro_tuples(m):
@@ -210,20 +373,9 @@ def inst_pro_tuples(m):
     Only such tuples where the unit is still operational until the next
     support time frame are valid.
     """
-    inst_pro = []
-    sorted_stf = sorted(list(m.stf))
-
-    for (stf, sit, pro) in m.inst_pro.index:
-        for stf_later in sorted_stf:
-            index_helper = sorted_stf.index(stf_later)
-            if stf_later == max(m.stf):
-                if (stf_later +
-                   m.global_prop.loc[(max(sorted_stf), 'Weight'), 'value'] -
-                   1 < min(m.stf) + m.process_dict['lifetime'][
-                                                   (stf, sit, pro)]):
-                    inst_pro.append((sit, pro, stf_later))
-            elif (stf_later + sorted_stf[index_helper + 1])/2 <= (min(m.stf)
-                                                                  + m.process_dict['lifetime'][(stf, sit, pro)]):
-                inst_pro.append((sit, pro, stf_later))
-
-    return inst_pro
+    keys = list(m.inst_pro.index)
+    sorted_stf, units, stfs = operational_windows(
+        m, [m.stf_min + m.process_dict['lifetime'][key] for key in keys],
+        midpoint=True, strict_end=True)
+    return [(keys[u][1], keys[u][2], sorted_stf[s])
+            for u, s in zip(units, stfs)]
@@ -37,6 +37,12 @@ def add_storage(m):
                         in inst_sto_tuples(m)],
             doc='Installed storages that are still operational through stf')
 
+        # modelhelper imports this module
+        from .modelhelper import build_years
+
+        # (sit, sto, com, stf) -> build years of storages operational in stf
+        m.sto_build_years = build_years(m.operational_sto_tuples, m.stf)
+
     # storage tuples for storages with fixed initial state
     m.sto_init_bound_tuples = pyomo.Set(
         within=m.stf * m.sit * m.sto * m.com,
@@ -89,10 +95,12 @@ def add_storage(m):
         doc='Costs of storages by type and site (EUR/a)')        
 
     # storage rules
-    m.def_storage_state = pyomo.Constraint(
-        m.tm, m.sto_tuples,
-        rule=def_storage_state_rule,
-        doc='storage[t] = (1 - sd) * storage[t-1] + in * eff_i - out / eff_o')
+    if 'def_storage_state' not in m._matrix_blocks:
+        m.def_storage_state = pyomo.Constraint(
+            m.tm, m.sto_tuples,
+            rule=def_storage_state_rule,
+            doc='storage[t] = (1 - sd) * storage[t-1] + in * eff_i - '
+                'out / eff_o')
     m.res_storage_input_by_power = pyomo.Constraint(
         m.tm, m.sto_tuples,
         rule=res_storage_input_by_power_rule,
@@ -153,23 +161,21 @@ def def_storage_state_rule(m, t, stf, sit, sto, com):
 # storage capacity (for m.cap_sto_c expression)
 def def_storage_capacity_rule(m, stf, sit, sto, com):
     if m.mode['int']:
+        stf_min = m.stf_min
+        built = m.sto_build_years.get((sit, sto, com, stf), ())
         if (sit, sto, com, stf) in m.inst_sto_tuples:
-            if (min(m.stf), sit, sto, com) in m.sto_const_cap_c_dict:
+            if (stf_min, sit, sto, com) in m.sto_const_cap_c_dict:
                 cap_sto_c = m.storage_dict['inst-cap-c'][
-                    (min(m.stf), sit, sto, com)]
+                    (stf_min, sit, sto, com)]
             else:
                 cap_sto_c = (
                     sum(m.cap_sto_c_new[stf_built, sit, sto, com]
-                        for stf_built in m.stf
-                        if (sit, sto, com, stf_built, stf) in
-                        m.operational_sto_tuples) +
-                    m.storage_dict['inst-cap-c'][(min(m.stf), sit, sto, com)])
+                        for stf_built in built) +
+                    m.storage_dict['inst-cap-c'][(stf_min, sit, sto, com)])
         else:
             cap_sto_c = (
                 sum(m.cap_sto_c_new[stf_built, sit, sto, com]
-                    for stf_built in m.stf
-                    if (sit, sto, com, stf_built, stf) in
-                    m.operational_sto_tuples))
+                    for stf_built in built))
     else:
         if (stf, sit, sto, com) in m.sto_const_cap_c_dict:
             cap_sto_c = m.storage_dict['inst-cap-c'][(stf, sit, sto, com)]
@@ -183,23 +189,21 @@ def def_storage_capacity_rule(m, stf, sit, sto, com):
 # storage power (for m.cap_sto_p expression)
 def def_storage_power_rule(m, stf, sit, sto, com):
     if m.mode['int']:
+        stf_min = m.stf_min
+        built = m.sto_build_years.get((sit, sto, com, stf), ())
         if (sit, sto, com, stf) in m.inst_sto_tuples:
-            if (min(m.stf), sit, sto, com) in m.sto_const_cap_p_dict:
+            if (stf_min, sit, sto, com) in m.sto_const_cap_p_dict:
                 cap_sto_p = m.storage_dict['inst-cap-p'][
-                    (min(m.stf), sit, sto, com)]
+                    (stf_min, sit, sto, com)]
             else:
                 cap_sto_p = (
                     sum(m.cap_sto_p_new[stf_built, sit, sto, com]
-                        for stf_built in m.stf
-                        if (sit, sto, com, stf_built, stf) in
-                        m.operational_sto_tuples) +
-                    m.storage_dict['inst-cap-p'][(min(m.stf), sit, sto, com)])
+                        for stf_built in built) +
+                    m.storage_dict['inst-cap-p'][(stf_min, sit, sto, com)])
         else:
             cap_sto_p = (
                 sum(m.cap_sto_p_new[stf_built, sit, sto, com]
-                    for stf_built in m.stf
-                    if (sit, sto, com, stf_built, stf)
-                    in m.operational_sto_tuples))
+                    for stf_built in built))
     else:
         if (stf, sit, sto, com) in m.sto_const_cap_p_dict:
             cap_sto_p = m.storage_dict['inst-cap-p'][(stf, sit, sto, com)]
@@ -267,12 +271,10 @@ def storage_balance(m, tm, stf, sit, com):
     For a given commodity co and timestep tm, calculate the balance of
     storage input and output """
 
-    return sum(m.e_sto_in[(tm, stframe, site, storage, com)] -
-               m.e_sto_out[(tm, stframe, site, storage, com)]
+    return sum(m.e_sto_in[(tm,) + s] - m.e_sto_out[(tm,) + s]
                # usage as input for storage increases consumption
                # output from storage decreases consumption
-               for stframe, site, storage, commodity in m.sto_tuples
-               if site == sit and stframe == stf and commodity == com)
+               for s in m.com_balance_index['sto'].get((stf, sit, com), ()))
 
 
 # storage costs
@@ -379,47 +381,24 @@ def specific_storage_cost(m, stf, sit, sto, com, cost_type):
 def op_sto_tuples(sto_tuple, m):
     """ s.a. op_pro_tuples
     """
-    op_sto = []
-    sorted_stf = sorted(list(m.stf))
-
-    for (stf, sit, sto, com) in sto_tuple:
-        for stf_later in sorted_stf:
-            index_helper = sorted_stf.index(stf_later)
-            if stf_later == max(sorted_stf):
-                if (stf_later +
-                    m.global_prop_dict['value'][(max(sorted_stf), 'Weight')] -
-                    1 <= stf +
-                        m.storage_dict['depreciation'][(stf, sit, sto, com)]):
-                    op_sto.append((sit, sto, com, stf, stf_later))
-            elif (sorted_stf[index_helper + 1] <=
-                  stf +
-                  m.storage_dict['depreciation'][(stf, sit, sto, com)] and
-                  stf <= stf_later):
-                op_sto.append((sit, sto, com, stf, stf_later))
-            else:
-                pass
+    # modelhelper imports this module
+    from .modelhelper import operational_windows
 
-    return op_sto
+    keys = list(sto_tuple)
+    sorted_stf, units, stfs = operational_windows(
+        m, [key[0] + m.storage_dict['depreciation'][key] for key in keys],
+        built=[key[0] for key in keys])
+    return [keys[u][1:] + (keys[u][0], sorted_stf[s])
+            for u, s in zip(units, stfs)]
 
 
 def inst_sto_tuples(m):
     """ s.a. inst_pro_tuples
     """
-    inst_sto = []
-    sorted_stf = sorted(list(m.stf))
-
-    for (stf, sit, sto, com) in m.inst_sto.index:
-        for stf_later in sorted_stf:
-            index_helper = sorted_stf.index(stf_later)
-            if stf_later == max(m.stf):
-                if (stf_later +
-                    m.global_prop_dict['value'][(max(sorted_stf), 'Weight')] -
-                    1 < min(m.stf) +
-                        m.storage_dict['lifetime'][(stf, sit, sto, com)]):
-                    inst_sto.append((sit, sto, com, stf_later))
-            elif (sorted_stf[index_helper + 1] <=
-                  min(m.stf) + m.storage_dict['lifetime'][
-                                (stf, sit, sto, com)]):
-                inst_sto.append((sit, sto, com, stf_later))
-
-    return inst_sto
+    from .modelhelper import operational_windows
+
+    keys = list(m.inst_sto.index)
+    sorted_stf, units, stfs = operational_windows(
+        m, [m.stf_min + m.storage_dict['lifetime'][key] for key in keys],
+        strict_end=True)
+    return [keys[u][1:] + (sorted_stf[s],) for u, s in zip(units, stfs)]
@@ -61,6 +61,12 @@ def add_transmission(m):
             doc='Installed transmissions that are still operational'
                 'through stf')
 
+        # modelhelper imports this module
+        from .modelhelper import build_years
+
+        # (sin, sout, tra, com, stf) -> build years operational in stf
+        m.tra_build_years = build_years(m.operational_tra_tuples, m.stf)
+
     # Variables
     m.cap_tra_new = pyomo.Var(
         m.tra_tuples,
@@ -176,6 +182,12 @@ def add_transmission_dc(m):
             doc='Installed transmissions that are still operational'
                 'through stf')
 
+        # modelhelper imports this module
+        from .modelhelper import build_years
+
+        # (sin, sout, tra, com, stf) -> build years operational in stf
+        m.tra_build_years = build_years(m.operational_tra_tuples, m.stf)
+
     # Variables
     m.cap_tra_new = pyomo.Var(
         m.tra_tuples,
@@ -267,24 +279,22 @@ def add_transmission_dc(m):
 # transmission capacity (for m.cap_tra expression)
 def def_transmission_capacity_rule(m, stf, sin, sout, tra, com):
     if m.mode['int']:
+        stf_min = m.stf_min
+        built = m.tra_build_years.get((sin, sout, tra, com, stf), ())
         if (sin, sout, tra, com, stf) in m.inst_tra_tuples:
-            if (min(m.stf), sin, sout, tra, com) in m.tra_const_cap_dict:
+            if (stf_min, sin, sout, tra, com) in m.tra_const_cap_dict:
                 cap_tra = m.transmission_dict['inst-cap'][
-                    (min(m.stf), sin, sout, tra, com)]
+                    (stf_min, sin, sout, tra, com)]
             else:
                 cap_tra = (
                     sum(m.cap_tra_new[stf_built, sin, sout, tra, com]
-                        for stf_built in m.stf
-                        if (sin, sout, tra, com, stf_built, stf) in
-                        m.operational_tra_tuples) +
+                        for stf_built in built) +
                     m.transmission_dict['inst-cap']
-                    [(min(m.stf), sin, sout, tra, com)])
+                    [(stf_min, sin, sout, tra, com)])
         else:
             cap_tra = (
                 sum(m.cap_tra_new[stf_built, sin, sout, tra, com]
-                    for stf_built in m.stf
-                    if (sin, sout, tra, com, stf_built, stf) in
-                    m.operational_tra_tuples))
+                    for stf_built in built))
     else:
         if (stf, sin, sout, tra, com) in m.tra_const_cap_dict:
             cap_tra = \
@@ -360,20 +370,14 @@ def transmission_balance(m, tm, stf, sit, com):
     For a given commodity co and timestep tm, calculate the balance of
     import and export """
 
-    return (sum(m.e_tra_in[(tm, stframe, site_in, site_out,
-                            transmission, com)]
+    return (sum(m.e_tra_in[(tm,) + t]
                 # exports increase balance
-                for stframe, site_in, site_out, transmission, commodity
-                in m.tra_tuples
-                if (site_in == sit and stframe == stf and
-                    commodity == com)) -
-            sum(m.e_tra_out[(tm, stframe, site_in, site_out,
-                             transmission, com)]
+                for t in m.com_balance_index['tra_in'].get((stf, sit, com),
+                                                           ())) -
+            sum(m.e_tra_out[(tm,) + t]
                 # imports decrease balance
-                for stframe, site_in, site_out, transmission, commodity
-                in m.tra_tuples
-                if (site_out == sit and stframe == stf and
-                    commodity == com)))
+                for t in m.com_balance_index['tra_out'].get((stf, sit, com),
+                                                            ())))
 
 
 # transmission cost function
@@ -465,46 +469,25 @@ def specific_transmission_cost(m, stf, sit, sit_, tra, com, cost_type):
 def op_tra_tuples(tra_tuple, m):
     """ s.a. op_pro_tuples
     """
-    op_tra = []
-    sorted_stf = sorted(list(m.stf))
-
-    for (stf, sit1, sit2, tra, com) in tra_tuple:
-        for stf_later in sorted_stf:
-            index_helper = sorted_stf.index(stf_later)
-            if stf_later == max(sorted_stf):
-                if (stf_later +
-                    m.global_prop_dict['value'][(max(sorted_stf), 'Weight')] -
-                    1 <= stf + m.transmission_dict['depreciation'][
-                        (stf, sit1, sit2, tra, com)]):
-                    op_tra.append((sit1, sit2, tra, com, stf, stf_later))
-            elif (sorted_stf[index_helper + 1] <=
-                  stf + m.transmission_dict['depreciation'][
-                      (stf, sit1, sit2, tra, com)] and stf <= stf_later):
-                op_tra.append((sit1, sit2, tra, com, stf, stf_later))
-            else:
-                pass
+    # modelhelper imports this module
+    from .modelhelper import operational_windows
 
-    return op_tra
+    keys = list(tra_tuple)
+    sorted_stf, units, stfs = operational_windows(
+        m, [key[0] + m.transmission_dict['depreciation'][key]
+            for key in keys],
+        built=[key[0] for key in keys])
+    return [keys[u][1:] + (keys[u][0], sorted_stf[s])
+            for u, s in zip(units, stfs)]
 
 
 def inst_tra_tuples(m):
     """ s.a. inst_pro_tuples
     """
-    inst_tra = []
-    sorted_stf = sorted(list(m.stf))
-
-    for (stf, sit1, sit2, tra, com) in m.inst_tra.index:
-        for stf_later in sorted_stf:
-            index_helper = sorted_stf.index(stf_later)
-            if stf_later == max(m.stf):
-                if (stf_later +
-                    m.global_prop_dict['value'][(max(sorted_stf), 'Weight')] -
-                    1 < min(m.stf) + m.transmission_dict['lifetime'][
-                        (stf, sit1, sit2, tra, com)]):
-                    inst_tra.append((sit1, sit2, tra, com, stf_later))
-            elif (sorted_stf[index_helper + 1] <= min(m.stf) +
-                  m.transmission_dict['lifetime'][
-                      (stf, sit1, sit2, tra, com)]):
-                inst_tra.append((sit1, sit2, tra, com, stf_later))
-
-    return inst_tra
+    from .modelhelper import operational_windows
+
+    keys = list(m.inst_tra.index)
+    sorted_stf, units, stfs = operational_windows(
+        m, [m.stf_min + m.transmission_dict['lifetime'][key]
+            for key in keys], strict_end=True)
+    return [keys[u][1:] + (sorted_stf[s],) for u, s in zip(units, stfs)]
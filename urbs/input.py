@@ -6,9 +6,19 @@ from xlrd import XLRDError
 import pyomo.core as pyomo
 from .features.modelhelper import *
 from .identify import *
+from .buildtrace import TracedModel
 
 
-def read_input(input_files, year):
+# bump to invalidate existing input caches after changes to the parser
+INPUT_CACHE_VERSION = 1
+
+# names of the per-sheet frames collected from each workbook
+INPUT_FRAMES = ['global_prop', 'site', 'commodity', 'process',
+                'process_commodity', 'demand', 'supim', 'transmission',
+                'storage', 'dsm', 'buy_sell_price', 'eff_factor']
+
+
+def read_input(input_files, year, cache=False, processes=None):
     """Read Excel input file and prepare URBS input dict.
 
     Reads the Excel spreadsheets that adheres to the structure shown in
@@ -18,6 +28,11 @@ def read_input(input_files, year):
     Args:
         - filename: filename to Excel spreadsheets
         - year: current year for non-intertemporal problems
+        - cache: (optional) True or a folder name to keep the parsed
+          workbooks in a binary cache (c.f. read_workbooks_cached),
+          default: False
+        - processes: (optional) number of worker processes that parse the
+          workbooks in parallel (c.f. read_workbooks), default: sequential
 
     Returns:
         a dict of up to 12 DataFrames
@@ -25,144 +40,196 @@ def read_input(input_files, year):
 
     if os.path.isdir(input_files):
         glob_input = os.path.join(input_files, '*.xlsx')
-        input_files = sorted(glob.glob(glob_input))
+        filenames = sorted(glob.glob(glob_input))
+    else:
+        filenames = [input_files]
+
+    if cache:
+        if cache is True:
+            cache = input_cache_dirname(input_files)
+        workbooks = read_workbooks_cached(filenames, year, cache,
+                                          processes=processes)
     else:
-        input_files = [input_files]
-
-    gl = [] #global
-    sit = [] #site
-    com = [] #commodity
-    pro = [] #process
-    pro_com = [] #process-commodity
-    tra = [] #transmission
-    sto = [] #storage
-    dem = [] #demand
-    sup = [] #supply
-    bsp = [] #buy-sell-price
-    ds = [] #dsm
-    ef = [] #efficiency factor
-
-
-    for filename in input_files:
-        with pd.ExcelFile(filename) as xls:
-
-            global_prop = xls.parse('Global').set_index(['Property'])
-            # create support timeframe index
-            if ('Support timeframe' in
-                    global_prop.value):
-                support_timeframe = (
-                    global_prop.loc['Support timeframe']['value'])
-                global_prop = (
-                    global_prop.drop(['Support timeframe'])
-                    .drop(['description'], axis=1))
-            else:
-
-                support_timeframe = year ##TODO change back to support timeframe
-            global_prop = pd.concat([global_prop], keys=[support_timeframe],
-                                    names=['support_timeframe'])
-            gl.append(global_prop)
-            site = xls.parse('Site').set_index(['Name'])
-            site = pd.concat([site], keys=[support_timeframe],
-                             names=['support_timeframe'])
-            sit.append(site)
-            commodity = (
-                xls.parse('Commodity')
-                   .set_index(['Site', 'Commodity', 'Type']))
-            commodity = pd.concat([commodity], keys=[support_timeframe],
-                                  names=['support_timeframe'])
-            com.append(commodity)
-            process = xls.parse('Process').set_index(['Site', 'Process'])
-            process = pd.concat([process], keys=[support_timeframe],
+        workbooks = read_workbooks(filenames, year, processes=processes)
+
+    return assemble_input(workbooks)
+
+
+def read_workbook(filename, year):
+    """Read all sheets of a single Excel input file.
+
+    Args:
+        - filename: filename to Excel spreadsheet
+        - year: current year for non-intertemporal problems
+
+    Returns:
+        a dict of the 12 DataFrames listed in INPUT_FRAMES, each indexed by
+        the support timeframe of the workbook
+    """
+    with pd.ExcelFile(filename) as xls:
+
+        global_prop = xls.parse('Global').set_index(['Property'])
+        # create support timeframe index
+        if ('Support timeframe' in
+                global_prop.value):
+            support_timeframe = (
+                global_prop.loc['Support timeframe']['value'])
+            global_prop = (
+                global_prop.drop(['Support timeframe'])
+                .drop(['description'], axis=1))
+        else:
+
+            support_timeframe = year ##TODO change back to support timeframe
+        global_prop = pd.concat([global_prop], keys=[support_timeframe],
                                 names=['support_timeframe'])
-            pro.append(process)
-
-            #solar_param = xls.parse('urbs_solar_params').set_index(['Key', 'Param'])
-            #solar_param = pd.concat([solar_param], keys=[support_timeframe])
-
-            #sol_param.append(solar_param)
-
-            process_commodity = (
-                xls.parse('Process-Commodity')
-                   .set_index(['Process', 'Commodity', 'Direction']))
-            process_commodity = pd.concat([process_commodity],
-                                          keys=[support_timeframe],
-                                          names=['support_timeframe'])
-            pro_com.append(process_commodity)
-            demand = xls.parse('Demand').set_index(['t'])
-            demand = pd.concat([demand], keys=[support_timeframe],
-                               names=['support_timeframe'])
-            # split columns by dots '.', so that 'DE.Elec' becomes
-            # the two-level column index ('DE', 'Elec')
-            demand.columns = split_columns(demand.columns, '.')
-            dem.append(demand)
-            supim = xls.parse('SupIm').set_index(['t'])
-            supim = pd.concat([supim], keys=[support_timeframe],
+        site = xls.parse('Site').set_index(['Name'])
+        site = pd.concat([site], keys=[support_timeframe],
+                         names=['support_timeframe'])
+        commodity = (
+            xls.parse('Commodity')
+               .set_index(['Site', 'Commodity', 'Type']))
+        commodity = pd.concat([commodity], keys=[support_timeframe],
                               names=['support_timeframe'])
-            supim.columns = split_columns(supim.columns, '.')
-            sup.append(supim)
-
-            # collect data for the additional features
-            # Transmission, Storage, DSM
-            if 'Transmission' in xls.sheet_names:
-                transmission = (
-                    xls.parse('Transmission')
-                    .set_index(['Site In', 'Site Out',
-                                'Transmission', 'Commodity']))
-                transmission = (
-                    pd.concat([transmission], keys=[support_timeframe],
-                              names=['support_timeframe']))
-            else:
-                transmission = pd.DataFrame()
-            tra.append(transmission)
-            if 'Storage' in xls.sheet_names:
-                storage = (
-                    xls.parse('Storage')
-                    .set_index(['Site', 'Storage', 'Commodity']))
-                storage = pd.concat([storage], keys=[support_timeframe],
-                                    names=['support_timeframe'])
-            else:
-                storage = pd.DataFrame()
-            sto.append(storage)
-            if 'DSM' in xls.sheet_names:
-                dsm = xls.parse('DSM').set_index(['Site', 'Commodity'])
-                dsm = pd.concat([dsm], keys=[support_timeframe],
+        process = xls.parse('Process').set_index(['Site', 'Process'])
+        process = pd.concat([process], keys=[support_timeframe],
+                            names=['support_timeframe'])
+
+        #solar_param = xls.parse('urbs_solar_params').set_index(['Key', 'Param'])
+        #solar_param = pd.concat([solar_param], keys=[support_timeframe])
+
+        process_commodity = (
+            xls.parse('Process-Commodity')
+               .set_index(['Process', 'Commodity', 'Direction']))
+        process_commodity = pd.concat([process_commodity],
+                                      keys=[support_timeframe],
+                                      names=['support_timeframe'])
+        demand = xls.parse('Demand').set_index(['t'])
+        demand = pd.concat([demand], keys=[support_timeframe],
+                           names=['support_timeframe'])
+        # split columns by dots '.', so that 'DE.Elec' becomes
+        # the two-level column index ('DE', 'Elec')
+        demand.columns = split_columns(demand.columns, '.')
+        supim = xls.parse('SupIm').set_index(['t'])
+        supim = pd.concat([supim], keys=[support_timeframe],
+                          names=['support_timeframe'])
+        supim.columns = split_columns(supim.columns, '.')
+
+        # collect data for the additional features
+        # Transmission, Storage, DSM
+        if 'Transmission' in xls.sheet_names:
+            transmission = (
+                xls.parse('Transmission')
+                .set_index(['Site In', 'Site Out',
+                            'Transmission', 'Commodity']))
+            transmission = (
+                pd.concat([transmission], keys=[support_timeframe],
+                          names=['support_timeframe']))
+        else:
+            transmission = pd.DataFrame()
+        if 'Storage' in xls.sheet_names:
+            storage = (
+                xls.parse('Storage')
+                .set_index(['Site', 'Storage', 'Commodity']))
+            storage = pd.concat([storage], keys=[support_timeframe],
                                 names=['support_timeframe'])
-            else:
-                dsm = pd.DataFrame()
-            ds.append(dsm)
-            if 'Buy-Sell-Price'in xls.sheet_names:
-                buy_sell_price = xls.parse('Buy-Sell-Price').set_index(['t'])
-                buy_sell_price = pd.concat([buy_sell_price],
-                                           keys=[support_timeframe],
-                                           names=['support_timeframe'])
-                buy_sell_price.columns = \
-                    split_columns(buy_sell_price.columns, '.')
-            else:
-                buy_sell_price = pd.DataFrame()
-            bsp.append(buy_sell_price)
-            if 'TimeVarEff' in xls.sheet_names:
-                eff_factor = (xls.parse('TimeVarEff').set_index(['t']))
-                eff_factor = pd.concat([eff_factor], keys=[support_timeframe],
+        else:
+            storage = pd.DataFrame()
+        if 'DSM' in xls.sheet_names:
+            dsm = xls.parse('DSM').set_index(['Site', 'Commodity'])
+            dsm = pd.concat([dsm], keys=[support_timeframe],
+                            names=['support_timeframe'])
+        else:
+            dsm = pd.DataFrame()
+        if 'Buy-Sell-Price'in xls.sheet_names:
+            buy_sell_price = xls.parse('Buy-Sell-Price').set_index(['t'])
+            buy_sell_price = pd.concat([buy_sell_price],
+                                       keys=[support_timeframe],
                                        names=['support_timeframe'])
-                eff_factor.columns = split_columns(eff_factor.columns, '.')
-            else:
-                eff_factor = pd.DataFrame()
-            ef.append(eff_factor)
+            buy_sell_price.columns = \
+                split_columns(buy_sell_price.columns, '.')
+        else:
+            buy_sell_price = pd.DataFrame()
+        if 'TimeVarEff' in xls.sheet_names:
+            eff_factor = (xls.parse('TimeVarEff').set_index(['t']))
+            eff_factor = pd.concat([eff_factor], keys=[support_timeframe],
+                                   names=['support_timeframe'])
+            eff_factor.columns = split_columns(eff_factor.columns, '.')
+        else:
+            eff_factor = pd.DataFrame()
+
+    return {
+        'global_prop': global_prop,
+        'site': site,
+        'commodity': commodity,
+        'process': process,
+        'process_commodity': process_commodity,
+        'demand': demand,
+        'supim': supim,
+        'transmission': transmission,
+        'storage': storage,
+        'dsm': dsm,
+        'buy_sell_price': buy_sell_price,
+        'eff_factor': eff_factor
+    }
+
+
+def read_workbooks(filenames, year, processes=None):
+    """Read several Excel input files, optionally in parallel.
 
+    The yearly workbooks are independent of each other, so they can be
+    parsed in a process pool. Results are returned in the order of
+    filenames regardless of which worker finishes first. As with any
+    multiprocessing code, scripts using this on Windows need an
+    "if __name__ == '__main__':" guard.
+
+    Args:
+        - filenames: list of Excel spreadsheets
+        - year: current year for non-intertemporal problems
+        - processes: (optional) number of worker processes; None or 1
+          parses the files sequentially in the calling process
+
+    Returns:
+        a list of dicts as returned by read_workbook, in order of filenames
+    """
+    if not processes or processes == 1 or len(filenames) < 2:
+        return [read_workbook(filename, year) for filename in filenames]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(
+            max_workers=min(processes, len(filenames))) as pool:
+        return list(pool.map(read_workbook, filenames,
+                             [year] * len(filenames)))
+
+
+def assemble_input(workbooks):
+    """Concatenate the frames of several workbooks to the URBS input dict.
+
+    Args:
+        - workbooks: list of dicts as returned by read_workbook, in the
+          order the support timeframes are to be stacked
+
+    Returns:
+        a dict of up to 12 DataFrames
+    """
     # prepare input data
     try:
-        global_prop = pd.concat(gl, sort=False)
-        site = pd.concat(sit, sort=False)
-        commodity = pd.concat(com, sort=False)
-        process = pd.concat(pro, sort=False)
-        process_commodity = pd.concat(pro_com, sort=False)
-        demand = pd.concat(dem, sort=False)
-        supim = pd.concat(sup, sort=False)
-        transmission = pd.concat(tra, sort=False)
-        storage = pd.concat(sto, sort=False)
-        dsm = pd.concat(ds, sort=False)
-        buy_sell_price = pd.concat(bsp, sort=False)
-        eff_factor = pd.concat(ef, sort=False)
+        global_prop = pd.concat([w['global_prop'] for w in workbooks],
+                                sort=False)
+        site = pd.concat([w['site'] for w in workbooks], sort=False)
+        commodity = pd.concat([w['commodity'] for w in workbooks], sort=False)
+        process = pd.concat([w['process'] for w in workbooks], sort=False)
+        process_commodity = pd.concat(
+            [w['process_commodity'] for w in workbooks], sort=False)
+        demand = pd.concat([w['demand'] for w in workbooks], sort=False)
+        supim = pd.concat([w['supim'] for w in workbooks], sort=False)
+        transmission = pd.concat([w['transmission'] for w in workbooks],
+                                 sort=False)
+        storage = pd.concat([w['storage'] for w in workbooks], sort=False)
+        dsm = pd.concat([w['dsm'] for w in workbooks], sort=False)
+        buy_sell_price = pd.concat([w['buy_sell_price'] for w in workbooks],
+                                   sort=False)
+        eff_factor = pd.concat([w['eff_factor'] for w in workbooks],
+                               sort=False)
     except KeyError:
         pass
 
@@ -188,20 +255,117 @@ def read_input(input_files, year):
     return data
 
 
+def input_cache_dirname(input_files):
+    """Default cache folder for an input folder or spreadsheet.
+
+    The cache is placed next to the input, e.g. 'Input/2050' ->
+    'Input/2050.cache'.
+    """
+    return os.path.normpath(input_files) + '.cache'
+
+
+def file_digest(filename):
+    """SHA-1 hex digest of a file's content."""
+    import hashlib
+    sha = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def read_workbooks_cached(filenames, year, cache_dir, processes=None):
+    """Read Excel input files through a binary cache of the parsed sheets.
+
+    The frames of every workbook are pickled to cache_dir under the SHA-1
+    digest of the workbook's content, so only new or modified workbooks are
+    parsed again. The digest of a file whose size and modification time
+    match the cache manifest is not recomputed.
+
+    Pickle restores the frames exactly as read_workbook returns them;
+    Parquet/Feather (pyarrow) flatten the one-level column MultiIndex of
+    e.g. buy_sell_price and reject object columns of mixed types. Loading
+    a pickle file can execute code, so a cache folder must never be shared
+    with other users or filled from untrusted sources.
+
+    Args:
+        - filenames: list of Excel spreadsheets
+        - year: current year for non-intertemporal problems
+        - cache_dir: folder holding the cached frames and manifest.csv
+        - processes: (optional) number of worker processes used to parse
+          workbooks missing from the cache (c.f. read_workbooks)
+
+    Returns:
+        a list of dicts as returned by read_workbook, in order of filenames
+    """
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    manifest_file = os.path.join(cache_dir, 'manifest.csv')
+
+    known = {}
+    if os.path.exists(manifest_file):
+        known = pd.read_csv(manifest_file, index_col='file').to_dict('index')
+
+    entries = []
+    for filename in filenames:
+        stat = os.stat(filename)
+        name = os.path.abspath(filename)
+        entry = known.get(name)
+        if (entry is not None and entry['size'] == stat.st_size and
+                entry['mtime'] == stat.st_mtime_ns):
+            digest = entry['digest']
+        else:
+            digest = file_digest(filename)
+        entries.append({'file': name, 'size': stat.st_size,
+                        'mtime': stat.st_mtime_ns, 'digest': digest})
+
+    # the year only matters for workbooks without 'Support timeframe'
+    pickle_files = [os.path.join(cache_dir, 'v{}-{}-{}.pkl'.format(
+                        INPUT_CACHE_VERSION, entry['digest'], year))
+                    for entry in entries]
+    missing = [i for i, pickle_file in enumerate(pickle_files)
+               if not os.path.exists(pickle_file)]
+    parsed = read_workbooks([filenames[i] for i in missing], year,
+                            processes=processes)
+
+    for i, workbook in zip(missing, parsed):
+        # write to a temporary file first, so concurrent runs never
+        # see a partially written cache entry
+        tmp_file = '{}.{}.tmp'.format(pickle_files[i], os.getpid())
+        pd.to_pickle(workbook, tmp_file)
+        os.replace(tmp_file, pickle_files[i])
+    parsed = dict(zip(missing, parsed))
+
+    workbooks = [parsed[i] if i in parsed else pd.read_pickle(pickle_file)
+                 for i, pickle_file in enumerate(pickle_files)]
+
+    manifest = pd.DataFrame(entries, columns=['file', 'size', 'mtime',
+                                              'digest'])
+    tmp_file = '{}.{}.tmp'.format(manifest_file, os.getpid())
+    manifest.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, manifest_file)
+
+    return workbooks
+
+
 # preparing the pyomo model
-def pyomo_model_prep(data, timesteps):
+def pyomo_model_prep(data, timesteps, trace=None):
     '''Performs calculations on the data frames in dictionary "data" for
     further usage by the model.
 
     Args:
         - data: input data dictionary
         - timesteps: range of modeled timesteps
+        - trace: (optional) a BuildTrace that logs each added component
 
     Returns:
         a rudimentary pyomo.CancreteModel instance
     '''
 
-    m = pyomo.ConcreteModel()
+    if trace:
+        m = TracedModel(trace)
+    else:
+        m = pyomo.ConcreteModel()
 
     # Preparations
     # ============
@@ -222,6 +386,9 @@ def pyomo_model_prep(data, timesteps):
 
     # create list with all support timeframe values
     m.stf_list = m.global_prop.index.levels[0].tolist()
+    # first support timeframe (c.f. m.stf), computed once for all rules
+    m.stf_min = int(commodity.index.get_level_values('support_timeframe')
+                    .min())
     # creating list wih cost types
     ##TODO: solar cost type list
     m.cost_type_list = ['Invest', 'Fixed', 'Variable', 'Fuel', 'Environmental']
@@ -342,44 +509,31 @@ def pyomo_model_prep(data, timesteps):
                               (max(commodity.index.get_level_values
                                    ('support_timeframe').unique()),
                                'Weight')]['value'] - 1)
-        process['invcost-factor'] = (process.apply(
-                                     lambda x: invcost_factor(
-                                         x['depreciation'],
-                                         x['wacc'],
-                                         x['discount'],
-                                         x['support_timeframe'],
-                                         x['stf_min']),
-                                     axis=1))
+        process['invcost-factor'] = invcost_factor(
+            process['depreciation'], process['wacc'], process['discount'],
+            process['support_timeframe'], process['stf_min'])
 
         # derive overpay-factor from WACC, depreciation and discount untility
-        process['overpay-factor'] = (process.apply(
-                                     lambda x: overpay_factor(
-                                         x['depreciation'],
-                                         x['wacc'],
-                                         x['discount'],
-                                         x['support_timeframe'],
-                                         x['stf_min'],
-                                         x['stf_end']),
-                                     axis=1))
+        process['overpay-factor'] = overpay_factor(
+            process['depreciation'], process['wacc'], process['discount'],
+            process['support_timeframe'], process['stf_min'],
+            process['stf_end'])
         process.loc[(process['overpay-factor'] < 0) |
                     (process['overpay-factor']
                      .isnull()), 'overpay-factor'] = 0
 
         # Derive multiplier for all energy based costs
-        commodity['stf_dist'] = (commodity['support_timeframe'].
-                                 apply(stf_dist, m=m))
-        commodity['discount-factor'] = (commodity['support_timeframe'].
-                                        apply(discount_factor, m=m))
-        commodity['eff-distance'] = (commodity['stf_dist'].
-                                     apply(effective_distance, m=m))
+        commodity['stf_dist'] = stf_dist(commodity['support_timeframe'], m)
+        commodity['discount-factor'] = discount_factor(
+            commodity['support_timeframe'], m)
+        commodity['eff-distance'] = effective_distance(
+            commodity['stf_dist'], m)
         commodity['cost_factor'] = (commodity['discount-factor'] *
                                     commodity['eff-distance'])
-        process['stf_dist'] = (process['support_timeframe'].
-                               apply(stf_dist, m=m))
-        process['discount-factor'] = (process['support_timeframe'].
-                                      apply(discount_factor, m=m))
-        process['eff-distance'] = (process['stf_dist'].
-                                   apply(effective_distance, m=m))
+        process['stf_dist'] = stf_dist(process['support_timeframe'], m)
+        process['discount-factor'] = discount_factor(
+            process['support_timeframe'], m)
+        process['eff-distance'] = effective_distance(process['stf_dist'], m)
         process['cost_factor'] = (process['discount-factor'] *
                                   process['eff-distance'])
 
@@ -404,35 +558,27 @@ def pyomo_model_prep(data, timesteps):
                                        (max(commodity.index.get_level_values
                                             ('support_timeframe').unique()),
                                         'Weight')]['value'] - 1)
-            transmission['invcost-factor'] = (
-                transmission.apply(lambda x: invcost_factor(
-                    x['depreciation'],
-                    x['wacc'],
-                    x['discount'],
-                    x['support_timeframe'],
-                    x['stf_min']),
-                    axis=1))
+            transmission['invcost-factor'] = invcost_factor(
+                transmission['depreciation'], transmission['wacc'],
+                transmission['discount'],
+                transmission['support_timeframe'], transmission['stf_min'])
             # derive overpay-factor from WACC, depreciation and
             # discount untility
-            transmission['overpay-factor'] = (
-                transmission.apply(lambda x: overpay_factor(
-                    x['depreciation'],
-                    x['wacc'],
-                    x['discount'],
-                    x['support_timeframe'],
-                    x['stf_min'],
-                    x['stf_end']),
-                    axis=1))
+            transmission['overpay-factor'] = overpay_factor(
+                transmission['depreciation'], transmission['wacc'],
+                transmission['discount'],
+                transmission['support_timeframe'], transmission['stf_min'],
+                transmission['stf_end'])
             # Derive multiplier for all energy based costs
             transmission.loc[(transmission['overpay-factor'] < 0) |
                              (transmission['overpay-factor'].isnull()),
                              'overpay-factor'] = 0
-            transmission['stf_dist'] = (transmission['support_timeframe'].
-                                        apply(stf_dist, m=m))
-            transmission['discount-factor'] = (
-                transmission['support_timeframe'].apply(discount_factor, m=m))
-            transmission['eff-distance'] = (transmission['stf_dist'].
-                                            apply(effective_distance, m=m))
+            transmission['stf_dist'] = stf_dist(
+                transmission['support_timeframe'], m)
+            transmission['discount-factor'] = discount_factor(
+                transmission['support_timeframe'], m)
+            transmission['eff-distance'] = effective_distance(
+                transmission['stf_dist'], m)
             transmission['cost_factor'] = (transmission['discount-factor'] *
                                            transmission['eff-distance'])
         # storage mode
@@ -460,45 +606,29 @@ def pyomo_model_prep(data, timesteps):
                                   (max(commodity.index.get_level_values
                                        ('support_timeframe').unique()),
                                    'Weight')]['value'] - 1)
-            storage['invcost-factor'] = (
-                storage.apply(
-                    lambda x: invcost_factor(
-                        x['depreciation'],
-                        x['wacc'],
-                        x['discount'],
-                        x['support_timeframe'],
-                        x['stf_min']),
-                    axis=1))
-            storage['overpay-factor'] = (
-                storage.apply(lambda x: overpay_factor(
-                    x['depreciation'],
-                    x['wacc'],
-                    x['discount'],
-                    x['support_timeframe'],
-                    x['stf_min'],
-                    x['stf_end']),
-                    axis=1))
+            storage['invcost-factor'] = invcost_factor(
+                storage['depreciation'], storage['wacc'], storage['discount'],
+                storage['support_timeframe'], storage['stf_min'])
+            storage['overpay-factor'] = overpay_factor(
+                storage['depreciation'], storage['wacc'], storage['discount'],
+                storage['support_timeframe'], storage['stf_min'],
+                storage['stf_end'])
 
             storage.loc[(storage['overpay-factor'] < 0) |
                         (storage['overpay-factor'].isnull()),
                         'overpay-factor'] = 0
 
-            storage['stf_dist'] = (storage['support_timeframe']
-                                   .apply(stf_dist, m=m))
-            storage['discount-factor'] = (storage['support_timeframe']
-                                          .apply(discount_factor, m=m))
-            storage['eff-distance'] = (storage['stf_dist']
-                                       .apply(effective_distance, m=m))
+            storage['stf_dist'] = stf_dist(storage['support_timeframe'], m)
+            storage['discount-factor'] = discount_factor(
+                storage['support_timeframe'], m)
+            storage['eff-distance'] = effective_distance(
+                storage['stf_dist'], m)
             storage['cost_factor'] = (storage['discount-factor'] *
                                       storage['eff-distance'])
     else:
         # for one year problems
-        process['invcost-factor'] = (
-            process.apply(
-                lambda x: invcost_factor(
-                    x['depreciation'],
-                    x['wacc']),
-                axis=1))
+        process['invcost-factor'] = invcost_factor(
+            process['depreciation'], process['wacc'])
 
         # cost factor will be set to 1 for non intertemporal problems
         commodity['cost_factor'] = 1
@@ -506,18 +636,12 @@ def pyomo_model_prep(data, timesteps):
 
         # additional features
         if m.mode['tra']:
-            transmission['invcost-factor'] = (
-                transmission.apply(lambda x:
-                                   invcost_factor(x['depreciation'],
-                                                  x['wacc']),
-                                   axis=1))
+            transmission['invcost-factor'] = invcost_factor(
+                transmission['depreciation'], transmission['wacc'])
             transmission['cost_factor'] = 1
         if m.mode['sto']:
-            storage['invcost-factor'] = (
-                storage.apply(lambda x:
-                              invcost_factor(x['depreciation'],
-                                             x['wacc']),
-                              axis=1))
+            storage['invcost-factor'] = invcost_factor(
+                storage['depreciation'], storage['wacc'])
             storage['cost_factor'] = 1
 
     # Converting Data frames to dictionaries
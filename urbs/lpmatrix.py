@@ -0,0 +1,550 @@
+import numpy as np
+import pyomo.core as pyomo
+from pyomo.core.base.component_namer import index_repr
+from pyomo.core.base.label import cpxlp_label_from_name, LPFileLabeler
+from pyomo.repn import generate_standard_repn
+
+# constraint blocks that create_model(..., matrix_blocks=True) does not
+# build in Pyomo; sparse_lp assembles them as coordinate (COO) matrices
+# directly from the index tuples and the prepared dicts of the model
+MATRIX_BLOCKS = ['res_vertex', 'def_process_input', 'def_process_output',
+                 'def_intermittent_supply',
+                 'res_process_throughput_by_capacity', 'def_storage_state']
+
+
+def supported_matrix_blocks(m):
+    """Matrix blocks that are valid for the modes of a model.
+
+    The commodity balance gets further terms from demand side management
+    and buy/sell prices; with these features res_vertex stays a Pyomo
+    constraint. The storage state equation exists only with storages.
+
+    Args:
+        m: a model after pyomo_model_prep (needs m.mode)
+
+    Returns:
+        a frozenset of names from MATRIX_BLOCKS
+    """
+    blocks = set(MATRIX_BLOCKS)
+    if m.mode['dsm'] or m.mode['bsp']:
+        blocks.discard('res_vertex')
+    if not m.mode['sto']:
+        blocks.discard('def_storage_state')
+    return frozenset(blocks)
+
+
+class ColumnIndex(object):
+    """Column numbers of all variables of a model.
+
+    Variables are numbered component by component, densely indexed ones
+    in the order of their index set. This allows to compute the columns
+    of time-indexed variables for whole blocks of rows (c.f. grid).
+    """
+    def __init__(self, m):
+        self.variables = []
+        self.offset = {}
+        self.dense = {}
+        for var in m.component_objects(pyomo.Var, active=True):
+            self.offset[var.name] = len(self.variables)
+            if var.is_indexed() and len(var) == len(var.index_set()):
+                self.dense[var.name] = True
+                self.variables.extend(var[index]
+                                      for index in var.index_set())
+            else:
+                self.dense[var.name] = False
+                self.variables.extend(var.values())
+        self.column = {id(var): col for col, var in enumerate(self.variables)}
+        self._m = m
+        self._positions = {}
+
+    def __len__(self):
+        return len(self.variables)
+
+    def _position(self, var, factor):
+        key = (var.name, factor)
+        if key not in self._positions:
+            subset = list(var.index_set().subsets())[factor]
+            self._positions[key] = {item: pos
+                                    for pos, item in enumerate(subset)}
+        return self._positions[key]
+
+    def grid(self, name, times, keys):
+        """Columns of var[t, key] for all times and keys.
+
+        Args:
+            - name: name of a variable indexed by (time set, tuple set)
+            - times: list of timesteps
+            - keys: list of tuples of the second index set
+
+        Returns:
+            an int array of shape (len(times), len(keys))
+        """
+        var = getattr(self._m, name)
+        if not self.dense[name]:
+            return np.array([[self.column[id(var[(t,) + tuple(key)])]
+                              for key in keys] for t in times],
+                            dtype=np.int64).reshape(len(times), len(keys))
+        time_pos = self._position(var, 0)
+        key_pos = self._position(var, 1)
+        t = np.array([time_pos[t] for t in times], dtype=np.int64)
+        k = np.array([key_pos[key] for key in keys], dtype=np.int64)
+        return self.offset[name] + t[:, None] * len(key_pos) + k[None, :]
+
+    def linear(self, expr):
+        """Columns, coefficients and constant of a linear expression."""
+        repn = generate_standard_repn(expr, compute_values=True)
+        if not repn.is_linear():
+            raise ValueError("Expression '{}' is not linear.".format(expr))
+        cols = np.array([self.column[id(var)] for var in repn.linear_vars],
+                        dtype=np.int64)
+        coefs = np.array(repn.linear_coefs, dtype=float)
+        return cols, coefs, repn.constant
+
+
+class SparseLP(object):
+    """Linear (mixed-integer) program of a model in coordinate form.
+
+    Attributes:
+        - variables: list of the Pyomo variables, one per column
+        - col_lower, col_upper, integer, objective: arrays per column
+        - objective_constant, sense (1: minimize, -1: maximize)
+        - row_lower, row_upper: arrays per row
+        - rows, cols, values: COO entries of the constraint matrix
+        - row_names: list of (block name, list of indices) pairs in row
+          order; the block name None stands for a list of full names of
+          Pyomo constraints
+    """
+    def __init__(self, columns):
+        self.variables = columns.variables
+        self.row_names = []
+        self._rows = []
+        self._cols = []
+        self._values = []
+        self._lower = []
+        self._upper = []
+        self.num_rows = 0
+
+    def add_block(self, name, indices, rows, cols, values, lower, upper):
+        """Add rows given by local row numbers 0 ... len(indices)-1."""
+        self._rows.append(np.asarray(rows, dtype=np.int64) + self.num_rows)
+        self._cols.append(np.asarray(cols, dtype=np.int64))
+        self._values.append(np.asarray(values, dtype=float))
+        self._lower.append(np.broadcast_to(
+            np.asarray(lower, dtype=float), (len(indices),)))
+        self._upper.append(np.broadcast_to(
+            np.asarray(upper, dtype=float), (len(indices),)))
+        self.row_names.append((name, indices))
+        self.num_rows += len(indices)
+
+    def finish(self):
+        """Concatenate the blocks, add duplicate and drop zero entries."""
+        rows = np.concatenate(self._rows) if self._rows else np.zeros(0, int)
+        cols = np.concatenate(self._cols) if self._cols else np.zeros(0, int)
+        values = (np.concatenate(self._values) if self._values
+                  else np.zeros(0))
+        # sort by column, then row, and merge duplicate entries
+        order = np.lexsort((rows, cols))
+        rows, cols, values = rows[order], cols[order], values[order]
+        new = np.ones(len(rows), dtype=bool)
+        new[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        starts = np.flatnonzero(new)
+        self.rows = rows[starts]
+        self.cols = cols[starts]
+        values = (np.add.reduceat(values, starts) if len(values)
+                  else values)
+        # zero ratios (e.g. a CO2 output of 0) are no matrix entries
+        nonzero = values != 0
+        self.rows = self.rows[nonzero]
+        self.cols = self.cols[nonzero]
+        self.values = values[nonzero]
+        self.row_lower = (np.concatenate(self._lower) if self._lower
+                          else np.zeros(0))
+        self.row_upper = (np.concatenate(self._upper) if self._upper
+                          else np.zeros(0))
+        del self._rows, self._cols, self._values, self._lower, self._upper
+
+    def column_starts(self):
+        """Start of each column in the (column-sorted) entries."""
+        return np.searchsorted(self.cols,
+                               np.arange(len(self.variables) + 1))
+
+    def row_labels(self):
+        """Row names in the style of Pyomo's symbolic LP labels."""
+        labels = []
+        for name, indices in self.row_names:
+            if name is None:
+                labels.extend(cpxlp_label_from_name(full_name)
+                              for full_name in indices)
+            else:
+                labels.extend(cpxlp_label_from_name(name + index_repr(index))
+                              for index in indices)
+        return labels
+
+    def column_labels(self):
+        """Column names in the style of Pyomo's symbolic LP labels."""
+        labeler = LPFileLabeler()
+        return [labeler(var) for var in self.variables]
+
+
+def _time_blocks(m):
+    """Timesteps of the constraint blocks and the timesteps before them."""
+    tm = list(m.tm)
+    return tm, [t - 1 for t in tm]
+
+
+def _row_grid(n_times, n_keys):
+    """Row number of (time, key) for a block indexed by time and key."""
+    return np.arange(n_times * n_keys).reshape(n_times, n_keys)
+
+
+def _indices(times, keys):
+    return [(t,) + tuple(key) for t in times for key in keys]
+
+
+def _process_flow_block(lp, columns, m, name, flow, keys, ratio):
+    # flow[t, stf, sit, pro, com] - ratio * tau_pro[t, stf, sit, pro] == 0
+    tm, _ = _time_blocks(m)
+    rows = _row_grid(len(tm), len(keys))
+    flow_cols = columns.grid(flow, tm, keys)
+    tau_cols = columns.grid('tau_pro', tm, [key[:3] for key in keys])
+    ratios = np.array([ratio[(stf, pro, com)]
+                       for (stf, sit, pro, com) in keys], dtype=float)
+    lp.add_block(name, _indices(tm, keys),
+                 np.concatenate([rows.ravel(), rows.ravel()]),
+                 np.concatenate([flow_cols.ravel(), tau_cols.ravel()]),
+                 np.concatenate([np.ones(rows.size),
+                                 np.broadcast_to(-ratios, rows.shape)
+                                 .ravel()]),
+                 0, 0)
+
+
+def assemble_process_input(lp, columns, m):
+    keys = [key for key in m.pro_input_tuples
+            if key not in m.pro_partial_input_tuples]
+    _process_flow_block(lp, columns, m, 'def_process_input', 'e_pro_in',
+                        keys, m.r_in_dict)
+
+
+def assemble_process_output(lp, columns, m):
+    keys = [key for key in m.pro_output_tuples
+            if key not in m.pro_partial_output_tuples and
+            key not in m.pro_timevar_output_tuples]
+    _process_flow_block(lp, columns, m, 'def_process_output', 'e_pro_out',
+                        keys, m.r_out_dict)
+
+
+def _capacity_block(lp, columns, m, name, keys, flow_cols, factors, sense):
+    # flow_cols[t, key] - factors[t, key] * cap_pro[stf, sit, pro]
+    # (== 0 or <= 0); the constant of cap_pro moves to the right-hand side
+    tm, _ = _time_blocks(m)
+    rows = _row_grid(len(tm), len(keys))
+    block_rows = [rows.ravel()]
+    block_cols = [flow_cols.ravel()]
+    block_values = [np.ones(rows.size)]
+    rhs = np.zeros(rows.shape)
+    for k, key in enumerate(keys):
+        cols, coefs, constant = columns.linear(m.cap_pro[key[:3]])
+        block_rows.append(np.repeat(rows[:, k], len(cols)))
+        block_cols.append(np.tile(cols, len(tm)))
+        block_values.append(-np.outer(factors[:, k], coefs).ravel())
+        rhs[:, k] = factors[:, k] * constant
+    lower = rhs.ravel() if sense == 'eq' else -np.inf
+    lp.add_block(name, _indices(tm, keys), np.concatenate(block_rows),
+                 np.concatenate(block_cols), np.concatenate(block_values),
+                 lower, rhs.ravel())
+
+
+def assemble_intermittent_supply(lp, columns, m):
+    # e_pro_in == cap_pro * supim * dt for supim commodities
+    tm, _ = _time_blocks(m)
+    keys = [key for key in m.pro_input_tuples if key[3] in m.com_supim]
+    dt = pyomo.value(m.dt)
+    factors = np.array([[m.supim_dict[(sit, com)][(stf, t)] * dt
+                         for (stf, sit, pro, com) in keys] for t in tm],
+                       dtype=float).reshape(len(tm), len(keys))
+    _capacity_block(lp, columns, m, 'def_intermittent_supply', keys,
+                    columns.grid('e_pro_in', tm, keys), factors, 'eq')
+
+
+def assemble_throughput_by_capacity(lp, columns, m):
+    # tau_pro <= dt * cap_pro
+    tm, _ = _time_blocks(m)
+    keys = list(m.pro_tuples)
+    factors = np.full((len(tm), len(keys)), pyomo.value(m.dt))
+    _capacity_block(lp, columns, m, 'res_process_throughput_by_capacity',
+                    keys, columns.grid('tau_pro', tm, keys), factors, 'le')
+
+
+def assemble_storage_state(lp, columns, m):
+    # e_sto_con[t] - (1 - discharge)^dt * e_sto_con[t-1]
+    #   - eff_in * e_sto_in[t] + e_sto_out[t] / eff_out == 0
+    tm, previous = _time_blocks(m)
+    keys = list(m.sto_tuples)
+    rows = _row_grid(len(tm), len(keys)).ravel()
+    dt = pyomo.value(m.dt)
+    discharge = np.array([m.storage_dict['discharge'][key] for key in keys])
+    eff_in = np.array([m.storage_dict['eff-in'][key] for key in keys])
+    eff_out = np.array([m.storage_dict['eff-out'][key] for key in keys])
+    shape = (len(tm), len(keys))
+    lp.add_block(
+        'def_storage_state', _indices(tm, keys),
+        np.tile(rows, 4),
+        np.concatenate([columns.grid('e_sto_con', tm, keys).ravel(),
+                        columns.grid('e_sto_con', previous, keys).ravel(),
+                        columns.grid('e_sto_in', tm, keys).ravel(),
+                        columns.grid('e_sto_out', tm, keys).ravel()]),
+        np.concatenate([np.ones(rows.size),
+                        np.broadcast_to(-(1 - discharge) ** dt,
+                                        shape).ravel(),
+                        np.broadcast_to(-eff_in, shape).ravel(),
+                        np.broadcast_to(1 / eff_out, shape).ravel()]),
+        0, 0)
+
+
+def assemble_vertex(lp, columns, m):
+    # commodity balance (c.f. res_vertex_rule), one row per timestep and
+    # commodity tuple: inputs, exports and storage charging count negative,
+    # outputs, imports, storage discharging, stock and solar positive;
+    # the demand is the right-hand side
+    tm, _ = _time_blocks(m)
+    keys = [key for key in m.com_tuples
+            if key[2] not in m.com_env and key[2] not in m.com_supim]
+    rows = _row_grid(len(tm), len(keys))
+    flows = [('pro_in', 'e_pro_in', -1), ('pro_out', 'e_pro_out', 1),
+             ('sto', 'e_sto_in', -1), ('sto', 'e_sto_out', 1),
+             ('tra_in', 'e_tra_in', -1), ('tra_out', 'e_tra_out', 1)]
+    block_rows, block_cols, block_values = [], [], []
+    demand = np.zeros(rows.shape)
+    for k, (stf, sit, com, com_type) in enumerate(keys):
+        for group, var, sign in flows:
+            members = m.com_balance_index[group].get((stf, sit, com), [])
+            if not members:
+                continue
+            cols = columns.grid(var, tm, members)
+            block_rows.append(np.repeat(rows[:, k], len(members)))
+            block_cols.append(cols.ravel())
+            block_values.append(np.full(cols.size, float(sign)))
+        if com == 'Elec':
+            block_rows.append(rows[:, k])
+            block_cols.append(np.full(len(tm), columns.column[
+                id(m.balance_solar[stf])]))
+            block_values.append(np.ones(len(tm)))
+        if com in m.com_stock:
+            block_rows.append(rows[:, k])
+            block_cols.append(columns.grid(
+                'e_co_stock', tm, [(stf, sit, com, com_type)])[:, 0])
+            block_values.append(np.ones(len(tm)))
+        if com in m.com_demand:
+            series = m.demand_dict.get((sit, com), {})
+            demand[:, k] = [series.get((stf, t), 0) for t in tm]
+    lp.add_block('res_vertex', _indices(tm, keys),
+                 np.concatenate(block_rows) if block_rows else [],
+                 np.concatenate(block_cols) if block_cols else [],
+                 np.concatenate(block_values) if block_values else [],
+                 demand.ravel(), demand.ravel())
+
+
+MATRIX_BLOCK_ASSEMBLERS = {
+    'res_vertex': assemble_vertex,
+    'def_process_input': assemble_process_input,
+    'def_process_output': assemble_process_output,
+    'def_intermittent_supply': assemble_intermittent_supply,
+    'res_process_throughput_by_capacity': assemble_throughput_by_capacity,
+    'def_storage_state': assemble_storage_state}
+
+
+def sparse_lp(m):
+    """Assemble the linear (mixed-integer) program of a model.
+
+    The matrix blocks of the model (c.f. create_model's matrix_blocks) are
+    assembled with NumPy, all other constraints and the objective from
+    their Pyomo expressions.
+
+    Args:
+        m: a model instance created by create_model
+
+    Returns:
+        a SparseLP object
+    """
+    columns = ColumnIndex(m)
+    lp = SparseLP(columns)
+
+    for name in MATRIX_BLOCKS:
+        if name in m._matrix_blocks:
+            MATRIX_BLOCK_ASSEMBLERS[name](lp, columns, m)
+
+    # all other constraints, one row each
+    names, rows, cols, values, lower, upper = [], [], [], [], [], []
+    for con in m.component_data_objects(pyomo.Constraint, active=True):
+        con_cols, con_coefs, constant = columns.linear(con.body)
+        rows.append(np.full(len(con_cols), len(names)))
+        cols.append(con_cols)
+        values.append(con_coefs)
+        lower.append(-np.inf if con.lower is None
+                     else pyomo.value(con.lower) - constant)
+        upper.append(np.inf if con.upper is None
+                     else pyomo.value(con.upper) - constant)
+        names.append(con.name)
+    if names:
+        lp.add_block(None, names, np.concatenate(rows), np.concatenate(cols),
+                     np.concatenate(values), lower, upper)
+    lp.finish()
+
+    objective = next(m.component_data_objects(pyomo.Objective,
+                                              active=True))
+    cols, coefs, constant = columns.linear(objective.expr)
+    lp.objective = np.zeros(len(columns))
+    np.add.at(lp.objective, cols, coefs)
+    lp.objective_constant = constant
+    lp.sense = 1 if objective.sense == pyomo.minimize else -1
+
+    lp.col_lower = np.array([-np.inf if var.lb is None else var.lb
+                             for var in columns.variables], dtype=float)
+    lp.col_upper = np.array([np.inf if var.ub is None else var.ub
+                             for var in columns.variables], dtype=float)
+    lp.integer = np.array([var.is_integer() for var in columns.variables],
+                          dtype=bool)
+    for col, var in enumerate(columns.variables):
+        if var.fixed:
+            lp.col_lower[col] = lp.col_upper[col] = var.value
+    return lp
+
+
+def write_mps(lp, filename):
+    """Write a SparseLP to a free-format MPS file.
+
+    Rows and columns are named like in Pyomo's symbolic LP files.
+
+    Args:
+        - lp: a SparseLP object (c.f. sparse_lp)
+        - filename: MPS file to be written
+
+    Returns:
+        None
+    """
+    row_labels = lp.row_labels()
+    col_labels = lp.column_labels()
+    lower, upper = lp.row_lower, lp.row_upper
+    senses = np.where(lower == upper, 'E',
+                      np.where(np.isinf(lower), 'L',
+                               np.where(np.isinf(upper), 'G', 'R')))
+    starts = lp.column_starts()
+
+    with open(filename, 'w') as f:
+        f.write('NAME urbs\n')
+        if lp.sense < 0:
+            f.write('OBJSENSE\n    MAX\n')
+        f.write('ROWS\n N obj\n')
+        for label, sense in zip(row_labels, senses):
+            f.write(' {} {}\n'.format('L' if sense == 'R' else sense,
+                                      label))
+
+        f.write('COLUMNS\n')
+        integer = False
+        for col, label in enumerate(col_labels):
+            if lp.integer[col] != integer:
+                integer = lp.integer[col]
+                f.write("    MARKER 'MARKER' '{}'\n".format(
+                    'INTORG' if integer else 'INTEND'))
+            if lp.objective[col] != 0:
+                f.write('    {} obj {!r}\n'.format(
+                    label, float(lp.objective[col])))
+            elif starts[col] == starts[col + 1]:
+                # declare columns without entries, too
+                f.write('    {} obj 0\n'.format(label))
+            for entry in range(starts[col], starts[col + 1]):
+                f.write('    {} {} {!r}\n'.format(
+                    label, row_labels[lp.rows[entry]],
+                    float(lp.values[entry])))
+        if integer:
+            f.write("    MARKER 'MARKER' 'INTEND'\n")
+
+        f.write('RHS\n')
+        if lp.objective_constant:
+            f.write('    rhs obj {!r}\n'.format(-lp.objective_constant))
+        rhs = np.where(senses == 'G', lower, upper)
+        for label, value in zip(row_labels, rhs):
+            if value != 0:
+                f.write('    rhs {} {!r}\n'.format(label, float(value)))
+
+        ranged = np.flatnonzero(senses == 'R')
+        if len(ranged):
+            f.write('RANGES\n')
+            for row in ranged:
+                f.write('    rng {} {!r}\n'.format(
+                    row_labels[row], float(upper[row] - lower[row])))
+
+        f.write('BOUNDS\n')
+        for col, label in enumerate(col_labels):
+            lb, ub = lp.col_lower[col], lp.col_upper[col]
+            if lb == ub:
+                f.write(' FX bnd {} {!r}\n'.format(label, float(lb)))
+                continue
+            if np.isinf(lb) and np.isinf(ub):
+                f.write(' FR bnd {}\n'.format(label))
+                continue
+            if np.isinf(lb):
+                f.write(' MI bnd {}\n'.format(label))
+            elif lb != 0 or lp.integer[col]:
+                f.write(' LO bnd {} {!r}\n'.format(label, float(lb)))
+            if not np.isinf(ub):
+                f.write(' UP bnd {} {!r}\n'.format(label, float(ub)))
+            elif lp.integer[col]:
+                f.write(' PL bnd {}\n'.format(label))
+        f.write('ENDATA\n')
+
+
+def solve_highs(m, lp=None, options=None):
+    """Solve a model with HiGHS, passing the matrix in memory.
+
+    The solution is loaded into the model variables, so that get_entity,
+    report and plot work as after a Pyomo solve. Constraint duals are not
+    available. Needs the highspy package.
+
+    Args:
+        - m: a model instance created by create_model
+        - lp: (optional) its SparseLP, default: assembled by sparse_lp
+        - options: (optional) dict of HiGHS options
+
+    Returns:
+        the model status as lower case string, e.g. 'optimal'
+    """
+    try:
+        import highspy
+    except ImportError:
+        raise ImportError("solve_highs requires the highspy package.")
+    if lp is None:
+        lp = sparse_lp(m)
+
+    model = highspy.HighsLp()
+    model.num_col_ = len(lp.variables)
+    model.num_row_ = len(lp.row_lower)
+    model.sense_ = (highspy.ObjSense.kMinimize if lp.sense > 0
+                    else highspy.ObjSense.kMaximize)
+    model.offset_ = lp.objective_constant
+    model.col_cost_ = lp.objective
+    model.col_lower_ = lp.col_lower
+    model.col_upper_ = lp.col_upper
+    model.row_lower_ = lp.row_lower
+    model.row_upper_ = lp.row_upper
+    model.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    model.a_matrix_.start_ = lp.column_starts()
+    model.a_matrix_.index_ = lp.rows
+    model.a_matrix_.value_ = lp.values
+    if lp.integer.any():
+        model.integrality_ = [highspy.HighsVarType.kInteger if integer
+                              else highspy.HighsVarType.kContinuous
+                              for integer in lp.integer]
+
+    highs = highspy.Highs()
+    for name, value in (options or {}).items():
+        highs.setOptionValue(name, value)
+    highs.passModel(model)
+    highs.run()
+
+    status = highs.modelStatusToString(highs.getModelStatus()).lower()
+    solution = highs.getSolution()
+    if solution.value_valid:
+        for var, value in zip(lp.variables, solution.col_value):
+            var.set_value(value, skip_validation=True)
+    return status
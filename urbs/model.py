@@ -1,36 +1,48 @@
 import math
+import time
 import pyomo.core as pyomo
 from datetime import datetime
 from .features import *
 from .input import *
+from .lpmatrix import supported_matrix_blocks
 
 
-def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
-                 eu_primary_cost_dict, eu_secondary_cost_dict,dcr_dict,stocklvl_dict, dt=8760,
-                 timesteps=None, objective='cost',dual = None):
+def create_model(data, solar, dt=8760, timesteps=None, objective='cost',
+                 dual=None, trace=None, matrix_blocks=False):
     """Create a pyomo ConcreteModel urbs object from given input data.
 
     Args:
         - data: a dict of up to 12
+        - solar: urbs-solar parameters, a SolarParams object
+          (c.f. read_solar_params)
         - dt: timestep duration in hours (default: 1)
         - timesteps: optional list of timesteps, default: demand timeseries
         - objective: Either "cost" or "CO2" for choice of objective function,
           default: "cost"
         - dual: set True to add dual variables to model output
           (marginally slower), default: True
+        - trace: (optional) a BuildTrace or BuildProfile to log the build to
+        - matrix_blocks: set True to leave the commodity balance, process
+          and storage state equations to the sparse matrix backend
+          (c.f. sparse_lp, write_mps, solve_highs) instead of building
+          them as Pyomo constraints, default: False
 
     Returns:
         a pyomo ConcreteModel object
     """
+    start = time.perf_counter()
 
     # Optional
     if not timesteps:
         timesteps = data['demand'].index.tolist()
 
-    m = pyomo_model_prep(data, timesteps)  # preparing pyomo model
+    m = pyomo_model_prep(data, timesteps, trace)  # preparing pyomo model
     m.name = 'urbs'
     m.created = datetime.now().strftime('%Y%m%dT%H%M')
     m._data = data
+    m._solar = solar
+    m._matrix_blocks = (supported_matrix_blocks(m) if matrix_blocks
+                        else frozenset())
 
 
 
@@ -159,155 +171,11 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
 
     # -------EU-Secondary-------#
     #index set for n (=steps of linearization)
-    m.nsteps_sec = pyomo.Set(initialize = range(0,7))
-    #param def for price reduction
-
-    #m.P_sec = pyomo.Param(m.nsteps_sec, initialize={
-    #    0: 0,
-    #    1: 13593.82044,
-    #    2: 26741.2835,
-    #    3: 39457.04547,
-    #    4: 51755.28139,
-    #    5: 63649.70086,
-    #    6: 75153.56332
-    #})
-    #2 LR 2%
-    #m.P_sec = pyomo.Param(m.nsteps_sec, initialize={
-    #    0: 0,
-    #    1: 26872.52452,
-    #    2: 52000.76746,
-    #    3: 75497.94923,
-    #    4: 97469.94116,
-    #    5: 118015.7425,
-    #    6: 137227.9266
-    #})
-
-    #3 LR 5%
-    #m.P_sec = pyomo.Param(m.nsteps_sec, initialize={
-      #  0: 0,
-        #1: 64859.87772,
-        #2: 119558.3938,
-        #3: 165687.4918,
-        #4: 204589.7114,
-        #5: 237397.2614,
-        #6: 265064.9716
-    #})
-
-    #4 LR 10%
-    #m.P_sec = pyomo.Param(m.nsteps_sec, initialize={
-    #    0: 0,
-    #    1: 122259.1475,
-    #    2: 208413.7077,
-    #    3: 269125.7967,
-    #    4: 311908.8802,
-    #    5: 342057.6079,
-    #    6: 363303.0561
-    #})
-
-    #5 LR 25%
-    #m.P_sec = pyomo.Param(m.nsteps_sec, initialize={
-    #    0: 0,
-    #    1: 254792.7496,
-    #    2: 352775.4865,
-    #    3: 390455.5883,
-    #    4: 404945.7946,
-    #    5: 410518.1277,
-    #    6: 412661.0161
-    #})
-
-    variation_6 = {
-        0: 0,
-        1: 33395.02122,
-        2: 64096.25634,
-        3: 92320.99775,
-        4: 118269.0101,
-        5: 142123.9441,
-        6: 164054.6365
-    }
-
-    variation_7 = {
-        0: 0,
-        1: 39840.31305,
-        2: 75846.68759,
-        3: 108388.0736,
-        4: 137797.9162,
-        5: 164377.572,
-        6: 188399.3973
-    }
-
-    variation_8 = {
-        0: 0,
-        1: 46208.92298,
-        2: 87260.20208,
-        3: 123729.5116,
-        4: 156128.2716,
-        5: 184910.8195,
-        6: 210480.7816
-    }
-
-    variation_9 = {
-        0: 0,
-        1: 52501.37307,
-        2: 98344.78919,
-        3: 138374.5766,
-        4: 173327.9901,
-        5: 203848.7895,
-        6: 230499.0966
-    }
-
-    variation_10 = {
-        0: 0,
-        1: 58718.18454,
-        2: 109108.2889,
-        3: 152351.496,
-        4: 189461.4601,
-        5: 221308.0674,
-        6: 248637.827
-    }
-
-    variation_11 = {
-        0: 0,
-        1: 49364.63541,
-        2: 92843.11808,
-        3: 131137.3026,
-        4: 164865.3556,
-        5: 194571.7345,
-        6: 220735.9768
-    }
-    variation_12 = {
-        0: 0,
-        1: 47473.48909,
-        2: 89503.18068,
-        3: 126713.3165,
-        4: 159656.5562,
-        5: 188822.1859,
-        6: 214643.3852
-    }
-
-    variation_13 = {
-        0: 0,
-        1: 48735.01299,
-        2: 91733.06585,
-        3: 129669.4987,
-        4: 163140.1525,
-        5: 192670.7272,
-        6: 218725.0388
-    }
-    variation_14 = {
-        0: 0,
-        1: 46841.69972,
-        2: 88383.54549,
-        3: 125225.1836,
-        4: 157898.4141,
-        5: 186874.8668,
-        6: 212572.8099
-    }
-
-    m.P_sec = pyomo.Param(m.nsteps_sec, initialize=variation_14)
+    m.nsteps_sec = pyomo.Set(initialize=solar.learning_curves.index.tolist())
+    #param def for price reduction (c.f. SolarParams.learning_curve)
+    m.P_sec = pyomo.Param(m.nsteps_sec, initialize=solar.learning_curve_dict(), mutable=True)
     #param def for Capacity needed to reach next step
-    m.capacityperstep_sec = pyomo.Param(m.nsteps_sec, initialize={0: 0, 1: 100, 2: 1000, 3: 10000, 4: 100000, 5:1000000, 6:10000000})
-    #param for gamma
-    m.gamma_sec = pyomo.Param(initialize=1e10)
+    m.capacityperstep_sec = pyomo.Param(m.nsteps_sec, initialize=solar.capacity_per_step_dict())
 
     ########################################
     # New Sets & Params used for urbs-solar#
@@ -317,42 +185,48 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
         initialize=m.cost_solar_list,
         doc='Set of cost types (hard-coded)')
     # Input Params urbs-solar
+    # Params with mutable=True can be updated on a built model
+    # (c.f. update_solar_params), all others define its structure
     # basic params
-    m.y0 = pyomo.Param(initialize=int(param_dict['Start Year y0']))  # Initial year
-    m.y_end = pyomo.Param(initialize=int(param_dict['End Year yn']))  # End year
-    m.n = pyomo.Param(initialize=int(param_dict['n turnover stockpile']))
-    m.l = pyomo.Param(initialize=int(param_dict['l']))
+    m.y0 = pyomo.Param(initialize=int(solar.param('Start Year y0')))  # Initial year
+    m.y_end = pyomo.Param(initialize=int(solar.param('End Year yn')))  # End year
+    m.n = pyomo.Param(initialize=int(solar.param('n turnover stockpile')))
+    m.l = pyomo.Param(initialize=int(solar.param('l')))
 
     # Capacities ( capacity(t=0), stock(t=0), instalable (max/a) )
-    m.Installed_Capacity_Q_s = pyomo.Param(initialize=int(param_dict['InitialCapacity']))  # Initial installed capacity MW
-    m.Existing_Stock_Q_stock = pyomo.Param(initialize=int(param_dict['Existing Stock in y0']))  # Initial stock in y0
-    m.Q_Solar_new = pyomo.Param(m.stf, initialize=instalable_capacity_dict)
+    m.Installed_Capacity_Q_s = pyomo.Param(initialize=int(solar.param('InitialCapacity')))  # Initial installed capacity MW
+    m.Existing_Stock_Q_stock = pyomo.Param(initialize=int(solar.param('Existing Stock in y0')))  # Initial stock in y0
+    m.Q_Solar_new = pyomo.Param(m.stf, initialize=solar.yearly_dict('instalable_capacity'), mutable=True)
     #print("Initialized values for Q_Solar_new:")
     #for stf in m.stf:
     #    print(f"Year: {stf}, Q_Solar_new: {m.Q_Solar_new[stf]}")
+    # gamma: big-M of the dynamic feedback loop linearization (equations 5
+    # and 7); EU production of a year is part of capacity_solar_new and thus
+    # limited by Q_Solar_new (c.f. capacity_solar_new_limit_rule)
+    m.gamma_sec = pyomo.Expression(m.stf, rule=lambda m, stf: m.Q_Solar_new[stf])
 
     # cost params in €/MW
-    m.IMPORTCOST = pyomo.Param(m.stf, initialize=importcost_dict)
-    m.STORAGECOST = pyomo.Param(initialize=float(param_dict['Storagecost / MW']))
-    m.EU_primary_costs = pyomo.Param(m.stf, initialize=eu_primary_cost_dict)
-    m.EU_secondary_costs = pyomo.Param(m.stf, initialize=eu_secondary_cost_dict)
+    m.IMPORTCOST = pyomo.Param(m.stf, initialize=solar.yearly_dict('importcost'), mutable=True)
+    m.STORAGECOST = pyomo.Param(initialize=solar.param('Storagecost / MW'), mutable=True)
+    m.EU_primary_costs = pyomo.Param(m.stf, initialize=solar.yearly_dict('eu_primary_cost'), mutable=True)
+    m.EU_secondary_costs = pyomo.Param(m.stf, initialize=solar.yearly_dict('eu_secondary_cost'), mutable=True)
     m.logisticcost = pyomo.Param(initialize=float(5)) #to avoid instant storage takeout
 
-    m.FT = pyomo.Param(initialize=float(param_dict['FT']))  # Factor
-    m.anti_dumping_index = pyomo.Param(initialize=float(param_dict['anti duping Index']))  # Anti-dumping index
-    m.deltaQ_EUprimary = pyomo.Param(initialize=float(param_dict['dQ EU Primary']))  # ΔQ EU Primary
-    m.deltaQ_EUsecondary = pyomo.Param(initialize=float(param_dict['dQ EU Secondary']))  # ΔQ EU Secondary
-    m.IR_EU_primary = pyomo.Param(initialize=float(param_dict['IR EU Primary']))  # IR EU Primary
-    m.IR_EU_secondary = pyomo.Param(initialize=float(param_dict['IR EU Secondary']))  # IR EU Secondary
-    m.DCR_solar = pyomo.Param(m.stf, initialize=dcr_dict)  # DCR Solar
-    m.DR_primary = pyomo.Param(initialize=float(param_dict['DR Primary']))  # DR Primary
-    m.DR_secondary = pyomo.Param(initialize=float(param_dict['DR Secondary']))  # DR Secondary
-    m.min_stocklvl = pyomo.Param(m.stf, initialize=stocklvl_dict)
+    m.FT = pyomo.Param(initialize=solar.param('FT'), mutable=True)  # Factor
+    m.anti_dumping_index = pyomo.Param(initialize=solar.param('anti duping Index'), mutable=True)  # Anti-dumping index
+    m.deltaQ_EUprimary = pyomo.Param(initialize=solar.param('dQ EU Primary'), mutable=True)  # ΔQ EU Primary
+    m.deltaQ_EUsecondary = pyomo.Param(initialize=solar.param('dQ EU Secondary'), mutable=True)  # ΔQ EU Secondary
+    m.IR_EU_primary = pyomo.Param(initialize=solar.param('IR EU Primary'), mutable=True)  # IR EU Primary
+    m.IR_EU_secondary = pyomo.Param(initialize=solar.param('IR EU Secondary'), mutable=True)  # IR EU Secondary
+    m.DCR_solar = pyomo.Param(m.stf, initialize=solar.yearly_dict('dcr'), mutable=True)  # DCR Solar
+    m.DR_primary = pyomo.Param(initialize=solar.param('DR Primary'), mutable=True)  # DR Primary
+    m.DR_secondary = pyomo.Param(initialize=solar.param('DR Secondary'), mutable=True)  # DR Secondary
+    m.min_stocklvl = pyomo.Param(m.stf, initialize=solar.yearly_dict('stocklvl'), mutable=True)
 
 
     # Capacity to Balance with loadfactor and h/a
-    m.lf_solar = pyomo.Param(initialize=float(param_dict['lf Solar']))  # lf Solar
-    m.hours_year = pyomo.Param(initialize=int(param_dict['hours per year']))  # Hours per year
+    m.lf_solar = pyomo.Param(initialize=solar.param('lf Solar'), mutable=True)  # lf Solar
+    m.hours_year = pyomo.Param(initialize=int(solar.param('hours per year')))  # Hours per year
 
 #######################################End of urbs-solar Params#########################################################
 
@@ -392,6 +266,9 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
                         in inst_pro_tuples(m)],
             doc='Installed processes that are still operational through stf')
 
+        # (sit, pro, stf) -> build years of capacities operational in stf
+        m.pro_build_years = build_years(m.operational_pro_tuples, m.stf)
+
     # commodity type subsets
     m.com_supim = pyomo.Set(
         within=m.com,
@@ -415,18 +292,12 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
     # process input/output
     m.pro_input_tuples = pyomo.Set(
         within=m.stf * m.sit * m.pro * m.com,
-        initialize=[(stf, site, process, commodity)
-                    for (stf, site, process) in m.pro_tuples
-                    for (s, pro, commodity) in tuple(m.r_in_dict.keys())
-                    if process == pro and s == stf],
+        initialize=process_commodity_tuples(m.pro_tuples, m.r_in_dict),
         doc='Commodities consumed by process by site,'
             'e.g. (2020,Mid,PV,Solar)')
     m.pro_output_tuples = pyomo.Set(
         within=m.stf * m.sit * m.pro * m.com,
-        initialize=[(stf, site, process, commodity)
-                    for (stf, site, process) in m.pro_tuples
-                    for (s, pro, commodity) in tuple(m.r_out_dict.keys())
-                    if process == pro and s == stf],
+        initialize=process_commodity_tuples(m.pro_tuples, m.r_out_dict),
         doc='Commodities produced by process by site, e.g. (2020,Mid,PV,Elec)')
 
     # process tuples for maximum gradient feature
@@ -438,31 +309,24 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
         doc='Processes with maximum gradient smaller than timestep length')
 
     # process tuples for partial feature
+    partial_input_tuples = process_commodity_tuples(
+        m.pro_tuples, m.r_in_min_fraction_dict)
     m.pro_partial_tuples = pyomo.Set(
         within=m.stf * m.sit * m.pro,
-        initialize=[(stf, site, process)
-                    for (stf, site, process) in m.pro_tuples
-                    for (s, pro, _) in tuple(m.r_in_min_fraction_dict.keys())
-                    if process == pro and s == stf],
+        initialize=list(dict.fromkeys(key[:3]
+                                      for key in partial_input_tuples)),
         doc='Processes with partial input')
 
     m.pro_partial_input_tuples = pyomo.Set(
         within=m.stf * m.sit * m.pro * m.com,
-        initialize=[(stf, site, process, commodity)
-                    for (stf, site, process) in m.pro_partial_tuples
-                    for (s, pro, commodity) in tuple(m.r_in_min_fraction_dict
-                                                     .keys())
-                    if process == pro and s == stf],
+        initialize=partial_input_tuples,
         doc='Commodities with partial input ratio,'
             'e.g. (2020,Mid,Coal PP,Coal)')
 
     m.pro_partial_output_tuples = pyomo.Set(
         within=m.stf * m.sit * m.pro * m.com,
-        initialize=[(stf, site, process, commodity)
-                    for (stf, site, process) in m.pro_partial_tuples
-                    for (s, pro, commodity) in tuple(m.r_out_min_fraction_dict
-                                                     .keys())
-                    if process == pro and s == stf],
+        initialize=process_commodity_tuples(m.pro_partial_tuples,
+                                            m.r_out_min_fraction_dict),
         doc='Commodities with partial input ratio, e.g. (Mid,Coal PP,CO2)')
 
     # Variables
@@ -521,6 +385,7 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
     # -------EU-Secondary-------#
     m.pricereduction_sec = pyomo.Var(m.stf, domain=pyomo.NonNegativeReals)
     m.BD_sec = pyomo.Var(m.stf, m.nsteps_sec, domain = pyomo.Binary)
+    m.z_sec = pyomo.Var(m.stf, m.nsteps_sec, domain=pyomo.NonNegativeReals)  # z = BD_sec * capacity_solar_eusecondary
 
     ################################
     # Variables used for urbs_solar#
@@ -574,6 +439,9 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
             within=m.stf * m.sit * m.pro * m.com,
             doc='empty set needed for (partial) process output')
 
+    # (stf, sit, com) -> flow variable keys, used by commodity_balance
+    m.com_balance_index = commodity_balance_index(m)
+
     # Equation declarations
     # equation bodies are defined in separate functions, referred to here by
     # their name in the "rule" keyword.
@@ -645,10 +513,12 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
 
 
     # commodity constraints default
-    m.res_vertex = pyomo.Constraint(
-        m.tm, m.com_tuples,
-        rule=res_vertex_rule,
-        doc='storage + transmission + process + source + buy - sell == demand')
+    if 'res_vertex' not in m._matrix_blocks:
+        m.res_vertex = pyomo.Constraint(
+            m.tm, m.com_tuples,
+            rule=res_vertex_rule,
+            doc='storage + transmission + process + source + buy - sell == '
+                'demand')
     m.res_stock_step = pyomo.Constraint(
         m.tm, m.com_tuples,
         rule=res_stock_step_rule,
@@ -667,23 +537,27 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
         doc='total environmental commodity output <= commodity.max')
 
     # process
-    m.def_process_input = pyomo.Constraint(
-        m.tm, m.pro_input_tuples - m.pro_partial_input_tuples,
-        rule=def_process_input_rule,
-        doc='process input = process throughput * input ratio')
-    m.def_process_output = pyomo.Constraint(
-        m.tm, (m.pro_output_tuples - m.pro_partial_output_tuples -
-               m.pro_timevar_output_tuples),
-        rule=def_process_output_rule,
-        doc='process output = process throughput * output ratio')
-    m.def_intermittent_supply = pyomo.Constraint(
-        m.tm, m.pro_input_tuples,
-        rule=def_intermittent_supply_rule,
-        doc='process output = process capacity * supim timeseries')
-    m.res_process_throughput_by_capacity = pyomo.Constraint(
-        m.tm, m.pro_tuples,
-        rule=res_process_throughput_by_capacity_rule,
-        doc='process throughput <= total process capacity')
+    if 'def_process_input' not in m._matrix_blocks:
+        m.def_process_input = pyomo.Constraint(
+            m.tm, m.pro_input_tuples - m.pro_partial_input_tuples,
+            rule=def_process_input_rule,
+            doc='process input = process throughput * input ratio')
+    if 'def_process_output' not in m._matrix_blocks:
+        m.def_process_output = pyomo.Constraint(
+            m.tm, (m.pro_output_tuples - m.pro_partial_output_tuples -
+                   m.pro_timevar_output_tuples),
+            rule=def_process_output_rule,
+            doc='process output = process throughput * output ratio')
+    if 'def_intermittent_supply' not in m._matrix_blocks:
+        m.def_intermittent_supply = pyomo.Constraint(
+            m.tm, m.pro_input_tuples,
+            rule=def_intermittent_supply_rule,
+            doc='process output = process capacity * supim timeseries')
+    if 'res_process_throughput_by_capacity' not in m._matrix_blocks:
+        m.res_process_throughput_by_capacity = pyomo.Constraint(
+            m.tm, m.pro_tuples,
+            rule=res_process_throughput_by_capacity_rule,
+            doc='process throughput <= total process capacity')
     m.res_process_maxgrad_lower = pyomo.Constraint(
         m.tm, m.pro_maxgrad_tuples,
         rule=res_process_maxgrad_lower_rule,
@@ -792,6 +666,9 @@ def create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
     if dual:
         m.dual = pyomo.Suffix(direction=pyomo.Suffix.IMPORT)
 
+    if trace:
+        trace.model(m, time.perf_counter() - start)
+
     return m
 
 
@@ -915,21 +792,19 @@ def res_env_total_rule(m, stf, sit, com, com_type):
 # process capacity (for m.cap_pro Expression)
 def def_process_capacity_rule(m, stf, sit, pro):
     if m.mode['int']:
+        stf_min = m.stf_min
+        built = m.pro_build_years.get((sit, pro, stf), ())
         if (sit, pro, stf) in m.inst_pro_tuples:
-            if (sit, pro, min(m.stf)) in m.pro_const_cap_dict:
+            if (sit, pro, stf_min) in m.pro_const_cap_dict:
                 cap_pro = m.process_dict['inst-cap'][(stf, sit, pro)]
             else:
                 cap_pro = \
                     (sum(m.cap_pro_new[stf_built, sit, pro]
-                         for stf_built in m.stf
-                         if (sit, pro, stf_built, stf)
-                         in m.operational_pro_tuples) +
-                     m.process_dict['inst-cap'][(min(m.stf), sit, pro)])
+                         for stf_built in built) +
+                     m.process_dict['inst-cap'][(stf_min, sit, pro)])
         else:
-            cap_pro = sum(
-                m.cap_pro_new[stf_built, sit, pro]
-                for stf_built in m.stf
-                if (sit, pro, stf_built, stf) in m.operational_pro_tuples)
+            cap_pro = sum(m.cap_pro_new[stf_built, sit, pro]
+                          for stf_built in built)
     else:
         if (sit, pro, stf) in m.pro_const_cap_dict:
             cap_pro = m.process_dict['inst-cap'][(stf, sit, pro)]
@@ -1068,9 +943,9 @@ def res_global_co2_limit_rule(m, stf):
 
 # CO2 output in entire period <= Global CO2 budget
 def res_global_co2_budget_rule(m):
-    if math.isinf(m.global_prop_dict['value'][min(m.stf_list), 'CO2 budget']):
+    if math.isinf(m.global_prop_dict['value'][m.stf_min, 'CO2 budget']):
         return pyomo.Constraint.Skip
-    elif (m.global_prop_dict['value'][min(m.stf_list), 'CO2 budget']) >= 0:
+    elif (m.global_prop_dict['value'][m.stf_min, 'CO2 budget']) >= 0:
         co2_output_sum = 0
         for stf in m.stf:
             for tm in m.tm:
@@ -1083,7 +958,7 @@ def res_global_co2_budget_rule(m):
                                        stf_dist(stf, m))
 
         return (co2_output_sum <=
-                m.global_prop_dict['value'][min(m.stf), 'CO2 budget'])
+                m.global_prop_dict['value'][m.stf_min, 'CO2 budget'])
     else:
         return pyomo.Constraint.Skip
 
@@ -1101,11 +976,11 @@ def res_global_cost_limit_rule(m, stf):
 
 # total cost in entire period <= Global cost budget
 def res_global_cost_budget_rule(m):
-    if math.isinf(m.global_prop_dict["value"][min(m.stf), "Cost budget"]):
+    if math.isinf(m.global_prop_dict["value"][m.stf_min, "Cost budget"]):
         return pyomo.Constraint.Skip
-    elif m.global_prop_dict["value"][min(m.stf), "Cost budget"] >= 0:
+    elif m.global_prop_dict["value"][m.stf_min, "Cost budget"] >= 0:
         return (pyomo.summation(m.costs) <= m.global_prop_dict["value"]
-        [min(m.stf), "Cost budget"])
+        [m.stf_min, "Cost budget"])
     else:
         return pyomo.Constraint.Skip
 
@@ -1326,12 +1201,10 @@ def def_costs_solar(m, cost_type_solar):
 
     elif cost_type_solar == 'Eu Cost Primary':
         total_eu_cost_primary = sum(((m.EU_primary_costs[stf]) * (m.capacity_solar_euprimary[stf])) for stf in m.stf)
-        print("Calculating EU Primary Cost Total:")
-        print(f"Total EU Primary Cost = {total_eu_cost_primary}")
         return m.costs_solar[cost_type_solar] == total_eu_cost_primary
 
     elif cost_type_solar == 'Eu Cost Secondary':
-        total_eu_cost_secondary = sum((m.EU_secondary_costs[stf]-m.pricereduction_sec[stf]) * (m.capacity_solar_eusecondary[stf]) for stf in m.stf)
+        total_eu_cost_secondary = sum(eu_secondary_cost(m, stf) for stf in m.stf)
         #print("Calculating EU Secondary Cost Total:")
         #print(f"Total EU Secondary Cost = {total_eu_cost_secondary}")
         return m.costs_solar[cost_type_solar] == total_eu_cost_secondary
@@ -1360,7 +1233,7 @@ def calculate_yearly_storagecost(m,stf):
 def calculate_yearly_EU_primary(m,stf):
     return m.costs_EU_primary[stf] == (m.EU_primary_costs[stf]) * m.capacity_solar_euprimary[stf]
 def calculate_yearly_EU_secondary(m,stf):
-    return m.costs_EU_secondary[stf] == (m.EU_secondary_costs[stf]-m.pricereduction_sec[stf]) * m.capacity_solar_eusecondary[stf]
+    return m.costs_EU_secondary[stf] == eu_secondary_cost(m, stf)
 
 
 
@@ -1419,10 +1292,8 @@ def stock_turnover_rule(m, stf):
     valid_years = [2025, 2030, 2035, 2040, 2045]
     if stf in valid_years:
         lhs = sum(m.capacity_solar_stockout[j] for j in range(stf , stf + m.n) if j in m.capacity_solar_stockout)
-        print("LHS",lhs)
         rhs = m.FT * (1 / m.n) * sum(
             m.capacity_solar_stock[j] for j in range(stf, stf + m.n) if j in m.capacity_solar_stock)
-        print("RHS",rhs)
         return lhs >= rhs
     else:
         return pyomo.Constraint.Skip
@@ -1589,18 +1460,11 @@ def non_negativity_z_eq_pri(m, stf, nsteps_pri):
 #-------EU-Secondary-------#
 #equation 1
 def costsavings_rule_sec(m, stf):
-    # Debug statement to check the components of the sum
-    #print(f"costsavings_rule for stf={stf}:")
     pricereduction_value_sec = sum(m.P_sec[n] * m.BD_sec[stf, n] for n in m.nsteps_sec)
-    print(f"Calculated pricereduction: {pricereduction_value_sec}")
-
     return m.pricereduction_sec[stf] == pricereduction_value_sec
 # equation 2
 def BD_limitation_rule_sec(m, stf):
-    # Debug statement to print the sum of BD[stf, n]
     bd_sum_value_sec = sum(m.BD_sec[stf, n] for n in m.nsteps_sec)
-    print(f"BD_limitation_rule for stf={stf}: Sum of BD is {bd_sum_value_sec}")
-
     return bd_sum_value_sec <= 1
 # equation 3
 def relation_pnew_to_pprior_sec(m, stf):
@@ -1626,21 +1490,29 @@ def q_perstep_rule_sec(m, stf):
     # Calculate RHS based on selected stages (only for the current year)
     rhs_value_sec = sum(m.BD_sec[stf, n] * m.capacityperstep_sec[n] for n in m.nsteps_sec)
 
-    # Debug: Print LHS and selected RHS value for each year
-    print(f"Step {stf}: LHS cumulative sum = {lhs_cumulative_sum_sec}, RHS value = {rhs_value_sec}")
-
     # Return the constraint for this specific year
     return lhs_cumulative_sum_sec >= rhs_value_sec
 
+# equations 5-8 are the exact big-M (McCormick) linearization of
+# z = BD * q1 for binary BD and 0 <= q1 <= gamma[stf]
 # equation 5: z <= gamma * BD
 def upper_bound_z_eq_sec(m, stf, nsteps_sec):
-    return (m.BD_sec[stf, nsteps_sec] * m.capacity_solar_eusecondary[stf])  <= m.gamma_sec * m.BD_sec[stf, nsteps_sec]
+    return m.z_sec[stf, nsteps_sec] <= m.gamma_sec[stf] * m.BD_sec[stf, nsteps_sec]
 # equation 6: z <= q1
 def upper_bound_z_q1_eq_sec(m, stf, nsteps_sec):
-    return (m.BD_sec[stf, nsteps_sec] * m.capacity_solar_eusecondary[stf]) <= m.capacity_solar_eusecondary[stf]
+    return m.z_sec[stf, nsteps_sec] <= m.capacity_solar_eusecondary[stf]
 # equation 7: z >= q1 - (1 - BD) * gamma
 def lower_bound_z_eq_sec(m, stf, nsteps_sec):
-    return (m.BD_sec[stf, nsteps_sec] * m.capacity_solar_eusecondary[stf]) >= m.capacity_solar_eusecondary[stf] - (1 - m.BD_sec[stf, nsteps_sec]) * m.gamma_sec
+    return m.z_sec[stf, nsteps_sec] >= m.capacity_solar_eusecondary[stf] - (1 - m.BD_sec[stf, nsteps_sec]) * m.gamma_sec[stf]
 # equation 8: z >= 0 (Non-negativity)
 def non_negativity_z_eq_sec(m, stf, nsteps_sec):
-    return (m.BD_sec[stf, nsteps_sec] * m.capacity_solar_eusecondary[stf]) >= 0
\ No newline at end of file
+    return m.z_sec[stf, nsteps_sec] >= 0
+
+# EU secondary manufacturing cost of a year with learning curve:
+# (EU_secondary_costs - pricereduction_sec) * q1
+#     = EU_secondary_costs * q1 - sum_n P_sec[n] * BD_sec[n] * q1
+#     = EU_secondary_costs * q1 - sum_n P_sec[n] * z_sec[n]
+# which is linear, as z_sec = BD_sec * q1 by equations 5-8
+def eu_secondary_cost(m, stf):
+    return (m.EU_secondary_costs[stf] * m.capacity_solar_eusecondary[stf] -
+            sum(m.P_sec[n] * m.z_sec[stf, n] for n in m.nsteps_sec))
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from .input import get_input
 from .pyomoio import get_entity, get_entities
@@ -79,6 +80,12 @@ def get_constants(instance):
     e_pro_out_df = get_entity(instance, 'e_pro_out')
     #print(e_pro_out_df)
 
+    # start year and initial stock of the urbs-solar extension; its results
+    # are not resolved by site and are reported at the site of the model
+    y0 = get_entity(instance, 'y0').iloc[0]
+    initial_stock = get_entity(instance, 'Existing_Stock_Q_stock').iloc[0]
+    solar_site = _solar_site(instance)
+
 #####Process df's to be used in report sheets
 
 ####us_co2
@@ -90,12 +97,12 @@ def get_constants(instance):
     #print(e_pro_out_elec)
     df_Elec = pd.DataFrame(list(e_pro_out_elec.items()), columns=['Index', 'Value'])
     df_Elec['Stf'] = df_Elec['Index'].apply(lambda x: int(x[1]))
-    df_bsolar = pd.DataFrame(bsolar, columns=['balance_solar'])
-    df_bsolar['Index'] = range(2024, 2051)
+    solar_years = [int(stf) for stf in bsolar.index]
     solar_process = pd.DataFrame({
-        'Index': [(1,float(year),'EU27', 'Solar', 'Elec') for year in df_bsolar['Index']],
-        'Value': df_bsolar['balance_solar'],
-        'Stf': df_bsolar['Index']
+        'Index': [(1, float(year), solar_site, 'Solar', 'Elec')
+                  for year in solar_years],
+        'Value': bsolar.values,
+        'Stf': solar_years
     })
     combined_balance = pd.concat([df_Elec, solar_process], ignore_index=True)
     combined_balance = combined_balance.sort_values(by='Stf').reset_index(drop=True)
@@ -127,42 +134,20 @@ def get_constants(instance):
     # Grouping by year and process type
     capacity_sum = long_csolar.groupby(['stf', 'pro'])['New'].sum().reset_index()
 
-    # Initialize Total
-    capacity_sum['Total'] = 0
-
-    # Loop through each row to compute Total
-    for i, row in capacity_sum.iterrows():
-        current_year = row['stf']
-        process_type = row['pro']
-
-        # Calculate total capacity for the process type
-        total_capacity = capacity_sum[
-            (capacity_sum['pro'] == process_type) &
-            (capacity_sum['stf'] <= current_year)
-            ]['New'].sum()
-
-        # Update Total
-        capacity_sum.at[i, 'Total'] = total_capacity
-
-    # Calculate Solar Stock
-    # Assuming you have these columns in csolar DataFrame
-    # Initialize the Solar Stock calculation with the given value for year 0
-    initial_capacity = 40000  # Initial stock for year 0
-
-    # Create a DataFrame for Solar Stock
-    solar_stock_data = []
-
-    for year in csolar['stf'].unique():
-        if year == 2024:
-            solar_stock = initial_capacity+csolar[csolar['stf'] == year]['capacity_solar_stock_imported'].sum() - csolar[csolar['stf'] == year]['capacity_solar_stockout'].sum()
-        else:
-            solar_stock = csolar[csolar['stf'] == year]['capacity_solar_stock_imported'].sum() - \
-                          csolar[csolar['stf'] == year]['capacity_solar_stockout'].sum()
-
-        solar_stock_data.append({'stf': year, 'pro': 'Solar Stock', 'New': solar_stock})
-
-    # Convert to DataFrame
-    solar_stock_df = pd.DataFrame(solar_stock_data)
+    # Total: cumulative capacity of each process type up to the year
+    # (capacity_sum is sorted by year)
+    capacity_sum['Total'] = capacity_sum.groupby('pro')['New'].cumsum()
+
+    # Calculate Solar Stock: yearly change, starting from the initial stock
+    # in the start year y0
+    stock = csolar.groupby('stf')[['capacity_solar_stock_imported',
+                                   'capacity_solar_stockout']].sum()
+    initial = np.where(stock.index == y0, initial_stock, 0)
+    solar_stock_df = pd.DataFrame({
+        'stf': stock.index,
+        'pro': 'Solar Stock',
+        'New': (initial + stock['capacity_solar_stock_imported'] -
+                stock['capacity_solar_stockout']).values})
 
     # Calculate the Total for Solar Stock
     solar_stock_df['Total'] = solar_stock_df['New'].cumsum()  # Cumulative sum to get Total for Solar Stock
@@ -174,11 +159,12 @@ def get_constants(instance):
     processes_to_remove = ['capacity_solar_stock_imported', 'capacity_solar_stock']
     capacity_sum = capacity_sum[~capacity_sum['pro'].isin(processes_to_remove)]
 
-    # Create a final index and DataFrame
-    final_index = pd.MultiIndex.from_tuples(
-        [(row['stf'], 'EU27', row['pro']) for _, row in capacity_sum.iterrows()],
-        names=['Stf', 'Site', 'Process']
-    )
+    # Create a final index (with float years) and DataFrame
+    final_index = pd.MultiIndex.from_arrays(
+        [capacity_sum['stf'].astype(float),
+         np.repeat(solar_site, len(capacity_sum)),
+         capacity_sum['pro']],
+        names=['Stf', 'Site', 'Process'])
 
     # Creating the final DataFrame
     final_solar_df = pd.DataFrame({
@@ -186,9 +172,6 @@ def get_constants(instance):
         'New': capacity_sum['New'].values
     }, index=final_index)
 
-    # Setting float levels for index
-    final_solar_df.index = final_solar_df.index.set_levels([float(i) for i in final_solar_df.index.levels[0]], level=0)
-
     # Final output excludes 'capacity_solar_stock_imported' and 'capacity_solar_stock'
 
     # Final output includes the new 'Solar Stock' process
@@ -226,7 +209,98 @@ def get_constants(instance):
     return costs, cpro, ctra, csto, csolar,combined_cpro_csolar,cost_df_combined,capacity_solar_total,df_co2,combined_balance,decisionvalues_pri,decisionvalues_sec
 
 
-def get_timeseries(instance, stf, com, sites, timesteps=None):
+class TimeseriesCube(object):
+    """Flows of a urbs model instance for get_timeseries, extracted once.
+
+    Each entity (e.g. e_pro_out) is retrieved with get_entity on first use
+    and split into its cross sections by the requested index levels, e.g.
+    one per (stf, com). Subsequent calls of get_timeseries with the same
+    cube only look these up, so that report and result_figures retrieve
+    every entity once, independent of the number of report or plot tuples.
+
+    A cube reflects the solution at the time an entity is first used; create
+    a new one after the model is solved again.
+
+    Args:
+        instance: a urbs model instance
+    """
+    # entities retrieved together as DataFrame (c.f. get_entities)
+    STORAGE_ENTITIES = ['e_sto_con', 'e_sto_in', 'e_sto_out']
+
+    def __init__(self, instance):
+        self.instance = instance
+        self._timesteps = None
+        self._demand = None
+        self._entities = {}
+        self._sections = {}
+
+    @property
+    def timesteps(self):
+        """Sorted list of all modelled timesteps."""
+        if self._timesteps is None:
+            self._timesteps = sorted(get_entity(self.instance, 'tm').index)
+        return self._timesteps
+
+    @property
+    def demand(self):
+        """Demand timeseries as DataFrame, columns (sit, com)."""
+        if self._demand is None:
+            self._demand = pd.DataFrame.from_dict(
+                get_input(self.instance, 'demand_dict'))
+        return self._demand
+
+    def entity(self, name):
+        """Series of an entity (DataFrame of the storage entities for
+        name 'storage'); transmission flows of DCPF models are turned into
+        non-negative flows between swapped sites."""
+        if name not in self._entities:
+            if name == 'storage':
+                entity = get_entities(self.instance, self.STORAGE_ENTITIES)
+            else:
+                entity = get_entity(self.instance, name)
+            if name in ['e_tra_in', 'e_tra_out'] and self.instance.mode['dpf']:
+                # -0.01 to avoid numerical errors such as -0
+                negative = entity[(entity < -0.01)]
+                negative = -1 * negative.swaplevel('sit', 'sit_')
+                entity = pd.concat([entity[entity >= 0], negative])
+            self._entities[name] = entity
+        return self._entities[name]
+
+    def xs(self, name, key, level):
+        """Cross section of an entity, like entity.xs(key, level=level).
+
+        Args:
+            - name: entity name (c.f. entity)
+            - key: tuple of index values, one per level
+            - level: list of index level names
+
+        Returns:
+            the cross section without the given levels; raises KeyError if
+            it does not exist
+        """
+        entity = self.entity(name)
+        if not isinstance(entity.index, pd.MultiIndex):
+            return entity.xs(key, level=level)
+
+        sections = self._sections.get((name, tuple(level)))
+        if sections is None:
+            sections = {}
+            for values, section in entity.groupby(level=level, sort=False):
+                if not isinstance(values, tuple):
+                    values = (values,)
+                sections[values] = section.droplevel(level)
+            self._sections[(name, tuple(level))] = sections
+        return sections[key]
+
+
+def _solar_site(instance):
+    """Site name for the results of the urbs-solar extension: the site of
+    the model, 'All' for models with several sites."""
+    sites = get_entity(instance, 'sit').index
+    return sites[0] if len(sites) == 1 else 'All'
+
+
+def get_timeseries(instance, stf, com, sites, timesteps=None, cube=None):
     """Return DataFrames of all timeseries referring to given commodity
 
     Usage:
@@ -239,6 +313,8 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
         - sites: a site name or list of site names
         - timesteps: optional list of timesteps, default: all modelled
           timesteps
+        - cube: optional TimeseriesCube of instance, to be shared between
+          calls; default: a new one
 
     Returns:
         a tuple of (created, consumed, storage, imported, exported, dsm) with
@@ -251,9 +327,12 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
         - exported: timeseries of commodity export
         - dsm: timeseries of demand-side management
     """
+    if cube is None:
+        cube = TimeseriesCube(instance)
+
     if timesteps is None:
         # default to all simulated timesteps
-        timesteps = sorted(get_entity(instance, 'tm').index)
+        timesteps = cube.timesteps
     else:
         timesteps = sorted(timesteps)  # implicit: convert range to list
 
@@ -268,10 +347,7 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
         # select commodity (xs), then the sites from remaining simple columns
         # and sum all together to form a Series
         demand = (
-            pd.DataFrame.from_dict(
-                get_input(
-                    instance,
-                    'demand_dict')).loc[stf] .loc[timesteps].xs(
+            cube.demand.loc[stf] .loc[timesteps].xs(
                 com,
                 axis=1,
                 level=1)[sites].sum(
@@ -281,19 +357,18 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
     demand.name = 'Demand'
 
     # STOCK
-    eco = get_entity(instance, 'e_co_stock')
     try:
-        eco = eco.xs((stf, com, 'Stock'), level=['stf', 'com', 'com_type'])
+        eco = cube.xs('e_co_stock', (stf, com, 'Stock'),
+                      ['stf', 'com', 'com_type'])
         stock = eco.unstack()[sites].sum(axis=1)
     except KeyError:
         stock = pd.Series(0, index=timesteps)
     stock.name = 'Stock'
 
     # PROCESS
-    created = get_entity(instance, 'e_pro_out')
-
     try:
-        created = created.xs((stf, com), level=['stf', 'com']).loc[timesteps]
+        created = cube.xs('e_pro_out', (stf, com), ['stf', 'com'])
+        created = created.loc[timesteps]
         created = created.unstack(level='sit')[sites].fillna(0).sum(axis=1)
         created = created.unstack(level='pro')
         created = drop_all_zero_columns(created)
@@ -306,9 +381,9 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
 
 
 
-    consumed = get_entity(instance, 'e_pro_in')
     try:
-        consumed = consumed.xs((stf, com), level=['stf', 'com']).loc[timesteps]
+        consumed = cube.xs('e_pro_in', (stf, com), ['stf', 'com'])
+        consumed = consumed.loc[timesteps]
         consumed = consumed.unstack(level='sit')[sites].fillna(0).sum(axis=1)
         consumed = consumed.unstack(level='pro')
         consumed = drop_all_zero_columns(consumed)
@@ -323,16 +398,9 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
     try:
         df_transmission = get_input(instance, 'transmission')
         if com in set(df_transmission.index.get_level_values('Commodity')):
-            imported = get_entity(instance, 'e_tra_out')
-            # avoid negative value import for DCPF transmissions
-            if instance.mode['dpf']:
-                # -0.01 to avoid numerical errors such as -0
-                minus_imported = imported[(imported < -0.01)]
-                minus_imported = -1 * minus_imported.swaplevel('sit', 'sit_')
-                imported = imported[imported >= 0]
-                imported = pd.concat([imported, minus_imported])
-            imported = imported.loc[timesteps].xs(
-                (stf, com), level=['stf', 'com'])
+            # negative DCPF transmissions are imports (c.f. TimeseriesCube)
+            imported = cube.xs('e_tra_out', (stf, com), ['stf', 'com'])
+            imported = imported.loc[timesteps]
             imported = imported.unstack(level='tra').sum(axis=1)
             imported = imported.unstack(
                 level='sit_')[sites].fillna(0).sum(
@@ -346,16 +414,8 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
                 imported = imported[other_sites]  # ...from other_sites
             imported = drop_all_zero_columns(imported.fillna(0))
 
-            exported = get_entity(instance, 'e_tra_in')
-            # avoid negative value export for DCPF transmissions
-            if instance.mode['dpf']:
-                # -0.01 to avoid numerical errors such as -0
-                minus_exported = exported[(exported < -0.01)]
-                minus_exported = -1 * minus_exported.swaplevel('sit', 'sit_')
-                exported = exported[exported >= 0]
-                exported = pd.concat([exported, minus_exported])
-            exported = exported.loc[timesteps].xs(
-                (stf, com), level=['stf', 'com'])
+            exported = cube.xs('e_tra_in', (stf, com), ['stf', 'com'])
+            exported = exported.loc[timesteps]
             exported = exported.unstack(level='tra').sum(axis=1)
             exported = exported.unstack(
                 level='sit')[sites].fillna(0).sum(
@@ -385,9 +445,9 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
     # STORAGE
     # group storage energies by commodity
     # select all entries with desired commodity co
-    stored = get_entities(instance, ['e_sto_con', 'e_sto_in', 'e_sto_out'])
     try:
-        stored = stored.loc[timesteps].xs((stf, com), level=['stf', 'com'])
+        stored = cube.xs('storage', (stf, com), ['stf', 'com'])
+        stored = stored.loc[timesteps]
         stored = stored.groupby(level=['t', 'sit']).sum()
         stored = stored.loc[(slice(None), sites), :].groupby('t').sum()
         stored.columns = ['Level', 'Stored', 'Retrieved']
@@ -396,10 +456,7 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
                               columns=['Level', 'Stored', 'Retrieved'])
 
     # DEMAND SIDE MANAGEMENT (load shifting)
-    dsmup = get_entity(instance, 'dsm_up')
-    dsmdo = get_entity(instance, 'dsm_down')
-
-    if dsmup.empty:
+    if cube.entity('dsm_up').empty:
         # if no DSM happened, the demand is not modified (delta = 0)
         delta = pd.Series(0, index=timesteps)
 
@@ -410,8 +467,8 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
         # for sit in m.dsm_site_tuples:
         try:
             # select commodity
-            dsmup = dsmup.xs((stf, com), level=['stf', 'com'])
-            dsmdo = dsmdo.xs((stf, com), level=['stf', 'com'])
+            dsmup = cube.xs('dsm_up', (stf, com), ['stf', 'com'])
+            dsmdo = cube.xs('dsm_down', (stf, com), ['stf', 'com'])
 
             # select sites
             dsmup = dsmup.unstack()[sites].sum(axis=1)
@@ -441,8 +498,8 @@ def get_timeseries(instance, stf, com, sites, timesteps=None):
     # VOLTAGE ANGLE of sites
 
     try:
-        voltage_angle = get_entity(instance, 'voltage_angle')
-        voltage_angle = voltage_angle.xs(stf, level=['stf']).loc[timesteps]
+        voltage_angle = cube.xs('voltage_angle', (stf,), ['stf'])
+        voltage_angle = voltage_angle.loc[timesteps]
         voltage_angle = voltage_angle.unstack(level='sit')[sites]
     except (KeyError, AttributeError, TypeError):
         voltage_angle = pd.DataFrame(index=timesteps)
@@ -5,7 +5,7 @@ import pandas as pd
 from random import random
 from .colorcodes import COLORS
 from .input import get_input
-from .output import get_constants, get_timeseries
+from .output import TimeseriesCube, get_constants, get_timeseries
 from .pyomoio import get_entity
 from .util import is_string
 
@@ -27,79 +27,48 @@ def sort_plot_elements(elements):
     if len(elements.columns) < 2:
         return elements
 
-    # calculate standard deviation
-    std = pd.DataFrame(np.zeros_like(elements.tail(1)),
-                       index=elements.index[-1:] + 1,
-                       columns=elements.columns)
-    # calculate mean
-    mean = pd.DataFrame(np.zeros_like(elements.tail(1)),
-                        index=elements.index[-1:] + 1,
-                        columns=elements.columns)
-    # calculate quotient
-    quotient = pd.DataFrame(
-        np.zeros_like(elements.tail(1)),
-        index=elements.index[-1:] + 1,
-        columns=elements.columns)
-
-    for col in std.columns:
-        std[col] = np.std(elements[col])
-        mean[col] = np.mean(elements[col])
-        quotient[col] = std[col] / mean[col]
-    # fill nan values (due to division by 0)
-    quotient = quotient.fillna(0)
-    # sort created/consumed ascencing with quotient i.e. base load first
-    elements = elements.append(quotient)
-    new_columns = elements.columns[elements.ix[elements.last_valid_index()]
-                                           .argsort()]
-    elements_sorted = elements[new_columns][:-1]
+    # sort created/consumed ascending with the quotient of standard
+    # deviation and mean, i.e. base load first; all-zero columns have the
+    # quotient 0 (division by 0)
+    quotient = (elements.std(ddof=0) / elements.mean()).fillna(0)
+    elements_sorted = elements[quotient.sort_values(kind='stable').index]
 
     return elements_sorted
 
 
-def plot(prob, stf, com, sit, dt, timesteps, timesteps_plot,
-         power_name='Power', energy_name='Energy',
-         power_unit='MW', energy_unit='MWh', time_unit='h',
-         figure_size=(16, 12)):
-    """Plot a stacked timeseries of commodity balance and storage.
+def balance_data(prob, stf, com, sit, timesteps=None, cube=None):
+    """Timeseries of a commodity balance plot (c.f. plot).
 
-    Creates a stackplot of the energy balance of a given commodity, together
-    with stored energy in a second subplot.
+    Retrieves and prepares everything plot_balance draws, so that the model
+    instance is not needed for drawing, e.g. in a worker process.
 
     Args:
         - prob: urbs model instance
         - stf: support timeframe
         - com: commodity name to plot
-        - sit: site name to plot
-        - dt: length of each time step (unit: hours)
-        - timesteps: modelled timesteps
-        - timesteps_plot: timesteps to be plotted
-        - power_name: optional string for 'power' label; default: 'Power'
-        - power_unit: optional string for unit; default: 'MW'
-        - energy_name: optional string for 'energy' label; default: 'Energy'
-        - energy_unit: optional string for storage plot; default: 'MWh'
-        - time_unit: optional string for time unit label; default: 'h'
-        - figure_size: optional (width, height) tuple in inch; default: (16, 12)
+        - sit: site name or list of site names to plot
+        - timesteps: (optional) modelled timesteps, default: all
+        - cube: (optional) TimeseriesCube of prob (c.f. get_timeseries)
 
     Returns:
-        fig: figure handle
+        dict with the keys 'timesteps', 'created', 'consumed' (DataFrames,
+        one column per plot element), 'stored', 'demand', 'original',
+        'delta' (Series) and 'plot_dsm' (True if a DSM subplot is shown)
     """
-    import matplotlib.pyplot as plt
-    import matplotlib as mpl
+    if cube is None:
+        cube = TimeseriesCube(prob)
 
     if timesteps is None:
         # default to all simulated timesteps
-        timesteps = sorted(get_entity(prob, 'tm').index)
-
-    # convert timesteps to hour series for the plots
-    hoursteps = timesteps * dt.iloc[0]
-    hoursteps_plot = timesteps_plot * dt.iloc[0]
+        timesteps = cube.timesteps
 
     if is_string(sit):
         # wrap single site in 1-element list for consistent behaviour
         sit = [sit]
 
     (created, consumed, stored, imported, exported,
-     dsm, voltage_angle) = get_timeseries(prob, stf, com, sit, timesteps)
+     dsm, voltage_angle) = get_timeseries(prob, stf, com, sit, timesteps,
+                                          cube=cube)
 
     # move retrieved/stored storage timeseries to created/consumed and
     # rename storage columns back to 'storage' for color mapping
@@ -147,23 +116,64 @@ def plot(prob, stf, com, sit, dt, timesteps, timesteps_plot,
     created = sort_plot_elements(created)
     consumed = sort_plot_elements(consumed)
 
+    return {'timesteps': timesteps,
+            'created': created,
+            'consumed': consumed,
+            'stored': stored,
+            'demand': demand,
+            'original': original,
+            'delta': deltademand,
+            'plot_dsm': bool(plot_dsm)}
+
+
+def plot_balance(data, dt, timesteps_plot,
+                 power_name='Power', energy_name='Energy',
+                 power_unit='MW', energy_unit='MWh', time_unit='h',
+                 figure_size=(16, 12)):
+    """Draw a commodity balance plot from the timeseries of balance_data.
+
+    Args:
+        - data: dict as returned by balance_data
+        - dt: length of each time step (unit: hours)
+        - timesteps_plot: timesteps to be plotted (c.f. set_plot_period)
+        - all others: c.f. plot
+
+    Returns:
+        fig: figure handle
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib as mpl
+
+    created = data['created']
+    consumed = data['consumed']
+    stored = data['stored']
+    demand = data['demand']
+    original = data['original']
+    deltademand = data['delta']
+    plot_dsm = data['plot_dsm']
+
+    # convert timesteps to hour series for the plots
+    hoursteps = np.asarray(data['timesteps']) * dt
+
     # FIGURE
     fig = plt.figure(figsize=figure_size)
     all_axes = []
     if plot_dsm:
-        gs = mpl.gridspec.GridSpec(3, 1, height_ratios=[3, 1, 1], hspace=0.05)
+        gs = mpl.gridspec.GridSpec(3, 1, height_ratios=[3, 1, 1], hspace=0.05,
+                                   figure=fig)
     else:
-        gs = mpl.gridspec.GridSpec(2, 1, height_ratios=[2, 1], hspace=0.05)
+        gs = mpl.gridspec.GridSpec(2, 1, height_ratios=[2, 1], hspace=0.05,
+                                   figure=fig)
 
     # STACKPLOT
-    ax0 = plt.subplot(gs[0])
+    ax0 = fig.add_subplot(gs[0])
     all_axes.append(ax0)
 
     # PLOT CONSUMED
 
     # stack plot for consumed commodities (divided by dt for power)
     sp00 = ax0.stackplot(hoursteps[1:],
-                         -consumed.values.T / dt.iloc[0],
+                         -consumed.values.T / dt,
                          labels=tuple(consumed.columns),
                          linewidth=0.15)
     # color
@@ -177,7 +187,7 @@ def plot(prob, stf, com, sit, dt, timesteps, timesteps_plot,
 
     # stack plot for created commodities (divided by dt for power)
     sp0 = ax0.stackplot(hoursteps[1:],
-                        created.values.T / dt.iloc[0],
+                        created.values.T / dt,
                         labels=tuple(created.columns),
                         linewidth=0.15)
 
@@ -188,7 +198,6 @@ def plot(prob, stf, com, sit, dt, timesteps, timesteps_plot,
         sp0[k].set_edgecolor(to_color('Decoration'))
 
     # label
-    ax0.set_title('Commodity balance of {} in {}'.format(com, ', '.join(sit)))
     ax0.set_ylabel('{} ({})'.format(power_name, power_unit))
 
     # legend
@@ -223,16 +232,16 @@ def plot(prob, stf, com, sit, dt, timesteps, timesteps_plot,
 
     # PLOT DEMAND
     # line plot for demand (unshifted) commodities (divided by dt for power)
-    ax0.plot(hoursteps, original.values / dt.iloc[0], linewidth=0.8,
+    ax0.plot(hoursteps, original.values / dt, linewidth=0.8,
              color=to_color('Unshifted'))
 
     # line plot for demand (in case of DSM mode: shifted) commodities
     # (divided by dt for power)
-    ax0.plot(hoursteps[1:], demand.values / dt.iloc[0], linewidth=1.0,
+    ax0.plot(hoursteps[1:], demand.values / dt, linewidth=1.0,
              color=to_color('Shifted'))
 
     # PLOT STORAGE
-    ax1 = plt.subplot(gs[1], sharex=ax0)
+    ax1 = fig.add_subplot(gs[1], sharex=ax0)
     all_axes.append(ax1)
 
     # stack plot for stored commodities
@@ -260,12 +269,12 @@ def plot(prob, stf, com, sit, dt, timesteps, timesteps_plot,
 
     # PLOT DEMAND SIDE MANAGEMENT
     if plot_dsm:
-        ax2 = plt.subplot(gs[2], sharex=ax0)
+        ax2 = fig.add_subplot(gs[2], sharex=ax0)
         all_axes.append(ax2)
 
         # bar plot for DSM up-/downshift power (bar width depending on dt)
         ax2.bar(hoursteps,
-                deltademand.values / dt[0], width=0.8 * dt[0],
+                deltademand.values / dt, width=0.8 * dt,
                 color=to_color('Delta'),
                 edgecolor='none')
 
@@ -273,29 +282,9 @@ def plot(prob, stf, com, sit, dt, timesteps, timesteps_plot,
         ax2.set_xlabel('Time in year ({})'.format(time_unit))
         ax2.set_ylabel('{} ({})'.format(power_name, power_unit))
 
-    # make xtick distance duration-dependent
-    if len(timesteps_plot) > 26 * 168 / dt.iloc[0]:     # time horizon > half a year
-        steps_between_ticks = int(168 * 4 / dt.iloc[0])  # tick every four weeks
-        if steps_between_ticks == 0:
-            steps_between_ticks = 1                # tick every timestep
-    elif len(timesteps_plot) > 3 * 168 / dt.iloc[0]:    # time horizon > three weeks
-        steps_between_ticks = int(168 / dt.iloc[0])     # tick every week
-    elif len(timesteps_plot) > 2 * 24 / dt.iloc[0]:     # time horizon > two days
-        steps_between_ticks = int(24 / dt.iloc[0])      # tick every day
-    elif len(timesteps_plot) > 24 / dt.iloc[0]:         # time horizon > a day
-        steps_between_ticks = int(6 / dt.iloc[0])       # tick every six hours
-    else:                                          # time horizon <= a day
-        steps_between_ticks = int(3 / dt.iloc[0])       # tick every three hours
-
-    hoursteps_plot_ = hoursteps_plot[(steps_between_ticks - 1):]
-    hoursteps_plot_ = hoursteps_plot_[::steps_between_ticks]   # take hole h's
-    xticks = np.insert(hoursteps_plot_, 0, hoursteps_plot[0])  # add 1st step
-
-    # set limits and ticks for all axes
+    # set grid and tick labels for all axes
     for ax in all_axes:
         ax.set_frame_on(False)
-        ax.set_xlim(hoursteps_plot[0], hoursteps_plot[-1])
-        ax.set_xticks(xticks)
         ax.xaxis.grid(True, 'major', color=to_color('Grid'),
                       linestyle='-')
         ax.yaxis.grid(True, 'major', color=to_color('Grid'),
@@ -315,6 +304,91 @@ def plot(prob, stf, com, sit, dt, timesteps, timesteps_plot,
                 lambda y, pos: '' if pos == 0 else y)
             ax.yaxis.set_major_formatter(skip_lowest)
 
+    set_plot_period(fig, timesteps_plot, dt)
+    return fig
+
+
+def set_plot_period(fig, timesteps_plot, dt):
+    """Set the time axis limits and ticks of a plot_balance figure.
+
+    A figure can be saved for several periods by calling this in between,
+    instead of drawing it again for each period.
+
+    Args:
+        - fig: figure handle as returned by plot_balance
+        - timesteps_plot: timesteps to be plotted
+        - dt: length of each time step (unit: hours)
+
+    Returns:
+        None
+    """
+    hoursteps_plot = np.asarray(timesteps_plot) * dt
+
+    # make xtick distance duration-dependent
+    if len(timesteps_plot) > 26 * 168 / dt:     # time horizon > half a year
+        steps_between_ticks = int(168 * 4 / dt)  # tick every four weeks
+        if steps_between_ticks == 0:
+            steps_between_ticks = 1                # tick every timestep
+    elif len(timesteps_plot) > 3 * 168 / dt:    # time horizon > three weeks
+        steps_between_ticks = int(168 / dt)     # tick every week
+    elif len(timesteps_plot) > 2 * 24 / dt:     # time horizon > two days
+        steps_between_ticks = int(24 / dt)      # tick every day
+    elif len(timesteps_plot) > 24 / dt:         # time horizon > a day
+        steps_between_ticks = int(6 / dt)       # tick every six hours
+    else:                                       # time horizon <= a day
+        steps_between_ticks = int(3 / dt)       # tick every three hours
+
+    hoursteps_plot_ = hoursteps_plot[(steps_between_ticks - 1):]
+    hoursteps_plot_ = hoursteps_plot_[::steps_between_ticks]   # take hole h's
+    xticks = np.insert(hoursteps_plot_, 0, hoursteps_plot[0])  # add 1st step
+
+    # set limits and ticks for all axes
+    for ax in fig.get_axes():
+        ax.set_xlim(hoursteps_plot[0], hoursteps_plot[-1])
+        ax.set_xticks(xticks)
+
+
+def plot(prob, stf, com, sit, dt, timesteps, timesteps_plot,
+         power_name='Power', energy_name='Energy',
+         power_unit='MW', energy_unit='MWh', time_unit='h',
+         figure_size=(16, 12), cube=None):
+    """Plot a stacked timeseries of commodity balance and storage.
+
+    Creates a stackplot of the energy balance of a given commodity, together
+    with stored energy in a second subplot.
+
+    Args:
+        - prob: urbs model instance
+        - stf: support timeframe
+        - com: commodity name to plot
+        - sit: site name to plot
+        - dt: length of each time step (unit: hours)
+        - timesteps: modelled timesteps
+        - timesteps_plot: timesteps to be plotted
+        - power_name: optional string for 'power' label; default: 'Power'
+        - power_unit: optional string for unit; default: 'MW'
+        - energy_name: optional string for 'energy' label; default: 'Energy'
+        - energy_unit: optional string for storage plot; default: 'MWh'
+        - time_unit: optional string for time unit label; default: 'h'
+        - figure_size: optional (width, height) tuple in inch; default: (16, 12)
+        - cube: optional TimeseriesCube of prob (c.f. get_timeseries)
+
+    Returns:
+        fig: figure handle
+    """
+    if is_string(sit):
+        # wrap single site in 1-element list for consistent behaviour
+        sit = [sit]
+
+    data = balance_data(prob, stf, com, sit, timesteps, cube=cube)
+    fig = plot_balance(data, dt.iloc[0], timesteps_plot,
+                       power_name=power_name, energy_name=energy_name,
+                       power_unit=power_unit, energy_unit=energy_unit,
+                       time_unit=time_unit, figure_size=figure_size)
+
+    # label
+    fig.get_axes()[0].set_title(
+        'Commodity balance of {} in {}'.format(com, ', '.join(sit)))
     return fig
 
 
@@ -371,11 +445,93 @@ def plot_costs(prob, timesteps, figure_size=(16, 8)): ##eigene Funktion --> KeyE
     return fig
 
 
+def save_balance_figures(data, dt, title, periods, extensions, basename,
+                         **kwds):
+    """Draw a commodity balance plot once and save it for several periods.
+
+    The figure is drawn once and only its time axis is changed for each
+    period (c.f. set_plot_period) before it is saved.
+
+    Args:
+        - data: dict as returned by balance_data
+        - dt: length of each time step (unit: hours)
+        - title: figure title
+        - periods: list of (period name, timesteps_list) tuples
+        - extensions: list of file extensions for plot images
+        - basename: file name prefix, completed by '-period.extension'
+        - ``**kwds: (optional) keyword arguments of plot_balance``
+
+    Returns:
+        list of the written file names
+    """
+    import matplotlib.pyplot as plt
+
+    filenames = []
+    fig = plot_balance(data, dt, periods[0][1], **kwds)
+    fig.get_axes()[0].set_title(title)
+    for period, periodrange in periods:
+        set_plot_period(fig, periodrange, dt)
+        for ext in extensions:
+            fig_filename = '{}-{}.{}'.format(basename, period, ext)
+            fig.savefig(fig_filename, bbox_inches='tight')
+            filenames.append(fig_filename)
+    plt.close(fig)
+    return filenames
+
+
+def init_plot_worker(colors):
+    """Prepare a worker process of plot_pool.
+
+    Selects the non-interactive Agg backend, as plots are only written to
+    files, and takes over the colors of the parent process.
+    """
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+    COLORS.update(colors)
+
+
+def plot_pool(processes=None):
+    """Process pool that renders plots with the Agg backend.
+
+    Pass it as executor to result_figures (or as plot_executor to
+    run_scenario) to render the plots in the background, while the calling
+    process goes on, e.g. with the next scenario. Colors added to COLORS
+    before the pool is created are used by its workers. As with any
+    multiprocessing code, scripts using this on Windows need an
+    "if __name__ == '__main__':" guard.
+
+    Args:
+        processes: (optional) number of worker processes, default: number
+            of cores
+
+    Returns:
+        a concurrent.futures.ProcessPoolExecutor
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=processes,
+                               initializer=init_plot_worker,
+                               initargs=(dict(COLORS),))
+
+
+def _warn_failed_plot(future):
+    """Done callback of the background plots of result_figures."""
+    if not future.cancelled() and future.exception() is not None:
+        err = future.exception()
+        print("Warning from result_figures: a plot failed with {}: {}"
+              .format(type(err).__name__, err))
+
+
 def result_figures(prob, figure_basename, timesteps, plot_title_prefix=None,
                    plot_tuples=None, plot_sites_name={},
-                   periods=None, extensions=None, **kwds):
+                   periods=None, extensions=None, processes=None,
+                   executor=None, **kwds):
     """Create plots for multiple periods and sites and save them to files.
 
+    The timeseries of all plots are retrieved from prob first (c.f.
+    balance_data). Each plot is then drawn once and saved for all periods
+    and extensions (c.f. save_balance_figures): one after another, by
+    worker processes (c.f. plot_pool) or by an executor.
+
     Args:
         - prob: urbs model instance
         - figure_basename: relative filename prefix that is shared;
@@ -389,11 +545,24 @@ def result_figures(prob, figure_basename, timesteps, plot_title_prefix=None,
           default: one period 'all' with all timesteps is assumed;
         - extensions: (optional) list of file extensions for plot images,
           default: png, pdf;
-        - ``**kwds: (optional) keyword arguments are forwarded to urbs.plot()``
+        - processes: (optional) number of worker processes (c.f.
+          plot_pool); None or 1 renders the plots in the calling process;
+        - executor: (optional) an executor, e.g. a plot_pool, to render the
+          plots in the background; result_figures then returns without
+          waiting for them and failed plots are reported as warnings;
+        - ``**kwds: (optional) keyword arguments are forwarded to
+          urbs.plot_balance()``
+
+    Returns:
+        list of the written file names, or of one future per plot (with
+        its list of file names as result) if an executor is given
     """
 
     # retrieve parameter 'dt' from the model
-    dt = get_entity(prob, 'dt')
+    dt = get_entity(prob, 'dt').iloc[0]
+
+    # flows of all plots are retrieved once
+    cube = TimeseriesCube(prob)
 
     # default to all demand (sit, com) tuples if none are specified
     if plot_tuples is None:
@@ -401,13 +570,19 @@ def result_figures(prob, figure_basename, timesteps, plot_title_prefix=None,
 
     # default to all timesteps if no periods are given
     if periods is None:
-        periods = {'all': sorted(get_entity(prob, 'tm').index)}
+        periods = {'all': cube.timesteps}
+    periods = list(periods.items())
 
     # default to PNG and PDF plots if no filetypes are specified
     if extensions is None:
         extensions = ['png', 'pdf']
 
-    # create timeseries plot for each demand (site, commodity) timeseries
+    # if no custom title prefix is specified, use the figure_basename
+    if not plot_title_prefix:
+        plot_title_prefix = os.path.basename(figure_basename)
+
+    # timeseries of each demand (site, commodity) timeseries plot
+    jobs = []
     for stf, sit, com in plot_tuples:
         # wrap single site name in 1-element list for consistent behaviour
         if is_string(sit):
@@ -421,34 +596,29 @@ def result_figures(prob, figure_basename, timesteps, plot_title_prefix=None,
         except BaseException:
             plot_sites_name[sit] = str(sit)
 
-        for period, periodrange in periods.items():
-            # do the plotting
-            fig = plot(prob, stf, com, help_sit, dt, timesteps, periodrange,
-                       **kwds)
-            #fig_costs = plot_costs(prob, periodrange) #eigener Code --> funkt noch ned
-            # change the figure title
-            ax0 = fig.get_axes()[0]
-            # if no custom title prefix is specified, use the figure_basename
-            if not plot_title_prefix:
-                plot_title_prefix = os.path.basename(figure_basename)
-
-            new_figure_title = '{}: {} in {}, {}'.format(
-                plot_title_prefix, com, plot_sites_name[sit], stf)
-            ax0.set_title(new_figure_title)
-
-            # save plot to files
-            for ext in extensions:
-                fig_filename = '{}-{}-{}-{}-{}.{}'.format(
-                    figure_basename, stf, com, ''.join(
-                        plot_sites_name[sit]), period, ext)
-                fig.savefig(fig_filename, bbox_inches='tight')
-            plt.close(fig)
-
-            #for ext in extensions:                                          ##eigener code --> funkt. noch ned
-            #    fig_costs_filename = '{}-{}-{}-{}-{}.{}'.format(
-            #        figure_basename, stf, com, 'Costs', period, ext)
-            #    fig_costs.savefig(fig_costs_filename, bbox_inches='tight')
-            #plt.close(fig_costs)
+        data = balance_data(prob, stf, com, help_sit, timesteps, cube=cube)
+        title = '{}: {} in {}, {}'.format(
+            plot_title_prefix, com, plot_sites_name[sit], stf)
+        basename = '{}-{}-{}-{}'.format(
+            figure_basename, stf, com, ''.join(plot_sites_name[sit]))
+        jobs.append((data, dt, title, periods, extensions, basename))
+
+    # do the plotting
+    if executor is not None:
+        futures = [executor.submit(save_balance_figures, *job, **kwds)
+                   for job in jobs]
+        for future in futures:
+            future.add_done_callback(_warn_failed_plot)
+        return futures
+    if processes and processes > 1 and len(jobs) > 1:
+        with plot_pool(min(processes, len(jobs))) as pool:
+            futures = [pool.submit(save_balance_figures, *job, **kwds)
+                       for job in jobs]
+            return [filename for future in futures
+                    for filename in future.result()]
+    return [filename for job in jobs
+            for filename in save_balance_figures(*job, **kwds)]
+
 
 def to_color(obj=None):
     """Assign a deterministic pseudo-random color to argument.
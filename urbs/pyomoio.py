@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pyomo.core as pyomo
 
@@ -41,12 +42,13 @@ def get_entity(instance, name):
             name = name + '_'
 
     elif isinstance(entity, pyomo.Param):
+        # mutable Params yield ParamData objects instead of numbers
         if entity.dim() > 1:
             results = pd.DataFrame(
-                [v[0] + (v[1],) for v in entity.items()])
+                [v[0] + (pyomo.value(v[1]),) for v in entity.items()])
         elif entity.dim() == 1:
             results = pd.DataFrame(
-                [(v[0], v[1]) for v in entity.items()])
+                [(v[0], pyomo.value(v[1])) for v in entity.items()])
         else:
             results = pd.DataFrame(
                 [(v[0], v[1].value) for v in entity.items()])
@@ -65,29 +67,19 @@ def get_entity(instance, name):
             labels = ['None']
 
     elif isinstance(entity, pyomo.Constraint):
-        if entity.dim() > 1:
-            # check whether all entries of the constraint have
-            # an existing dual variable
-            # in that case add to results
-            results = pd.DataFrame(
-                [key + (instance.dual[entity.at(key)],)
-                 for (id, key) in entity.id_index_map().items()
-                 if id in instance.dual._dict.keys()])
-        elif entity.dim() == 1:
-            results = pd.DataFrame(
-                [(v[0], instance.dual[v[1]]) for v in entity.items()])
-        else:
-            results = pd.DataFrame(
-                [(v[0], instance.dual[v[1]]) for v in entity.items()])
-            labels = ['None']
+        # only entries with an existing dual value are added to results
+        return _dual_series(
+            entity, [(index, instance.dual[data])
+                     for index, data in entity.items()
+                     if data in instance.dual])
 
     else:
         # create DataFrame
         if entity.dim() > 1:
-            # concatenate index tuples with value if entity has
-            # multidimensional indices v[0]
-            results = pd.DataFrame(
-                [v[0] + (v[1].value,) for v in entity.items()])
+            # multidimensional indices: build the Series directly from a
+            # float array of values and the index levels, without one row
+            # tuple per entry
+            return _var_series(entity, _unique_labels(labels, name), name)
         elif entity.dim() == 1:
             # otherwise, create tuple from scalar index v[0]
             results = pd.DataFrame(
@@ -98,11 +90,7 @@ def get_entity(instance, name):
                 [(v[0], v[1].value) for v in entity.items()])
             labels = ['None']
 
-    # check for duplicate onset names and append one to several "_" to make
-    # them unique, e.g. ['sit', 'sit', 'com'] becomes ['sit', 'sit_', 'com']
-    for k, label in enumerate(labels):
-        if label in labels[:k] or label == name:
-            labels[k] = labels[k] + "_"
+    labels = _unique_labels(labels, name)
 
     if not results.empty:
         # name columns according to labels + entity name
@@ -117,6 +105,101 @@ def get_entity(instance, name):
     return results
 
 
+def _unique_labels(labels, name):
+    """Make onset names unique (c.f. get_entity)."""
+    # check for duplicate onset names and append one to several "_" to make
+    # them unique, e.g. ['sit', 'sit', 'com'] becomes ['sit', 'sit_', 'com']
+    labels = list(labels)
+    for k, label in enumerate(labels):
+        if label in labels[:k] or label == name:
+            labels[k] = labels[k] + "_"
+    return labels
+
+
+def _var_series(entity, labels, name):
+    """Values of a variable with multidimensional indices as Series.
+
+    Args:
+        - entity: an indexed Pyomo Var
+        - labels: unique onset names, one per index dimension
+        - name: name of the Series
+
+    Returns:
+        a Pandas Series of float values (NaN for unset values) with a
+        MultiIndex, or an empty Series if the variable has no entries
+    """
+    if len(entity) == 0:
+        return pd.Series(name=name)
+    # extract_values reads the values without iterating over the index set
+    values = entity.extract_values()
+    index = pd.MultiIndex.from_tuples(list(values.keys()), names=labels)
+    return pd.Series(np.array(list(values.values()), dtype=float),
+                     index=index, name=name)
+
+
+def get_duals(instance, names=None):
+    """ Retrieve the dual values of several constraints at once.
+
+    The dual suffix of the instance is iterated once and its values are
+    sorted by constraint, instead of looking up each constraint entry (c.f.
+    get_entity). This makes exporting the duals of all constraints, e.g.
+    the electricity prices of res_vertex, about as cheap as a variable.
+
+    Args:
+        instance: a Pyomo ConcreteModel instance with a dual suffix
+        names: (optional) list of constraint names, default: all constraints
+
+    Returns:
+        dict {name: Pandas Series of dual values}, like get_entity; empty
+        Series for constraints without duals
+    """
+    if names is None:
+        names = list_entities(instance, 'con').index.tolist()
+    buckets = {name: [] for name in names}
+
+    for data, value in instance.dual.items():
+        bucket = buckets.get(data.parent_component().local_name)
+        if bucket is not None:
+            bucket.append((data.index(), value))
+
+    return {name: _dual_series(getattr(instance, name), bucket)
+            for name, bucket in buckets.items()}
+
+
+def _dual_series(entity, duals):
+    """Dual values of a constraint as Series (c.f. get_entity).
+
+    Args:
+        - entity: a Pyomo Constraint
+        - duals: list of (index, dual value) pairs of its entries
+
+    Returns:
+        a Pandas Series of dual values, or an empty Series
+    """
+    name = entity.local_name
+    if not duals:
+        return pd.Series(name=name)
+
+    if entity.dim() > 1:
+        results = pd.DataFrame([index + (value,) for index, value in duals])
+        labels = _get_onset_names(entity)
+    else:
+        results = pd.DataFrame(duals)
+        labels = _get_onset_names(entity) if entity.dim() == 1 else ['None']
+    width = results.shape[1] - 1
+
+    if len(labels) != width:
+        # onset names of indices with set operations (e.g. differences of
+        # tuple sets) can be incomplete; leave the index levels unnamed
+        results = results.set_index(list(range(width)))[width]
+        results.index.names = [None] * width
+        return results.rename(name)
+
+    labels = _unique_labels(labels, name)
+    results.columns = labels + [name]
+    return results.set_index(labels)[name]
+
+
 def get_entities(instance, names):
     """ Return one DataFrame with entities in columns and a common index.
 
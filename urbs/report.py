@@ -1,19 +1,26 @@
 import pandas as pd
 from .input import get_input
-from .output import get_constants, get_timeseries
+from .output import TimeseriesCube, get_constants, get_timeseries
+from .reportsink import create_report_sink
 from .util import is_string
 
 
-def report(instance, filename, report_tuples=None, report_sites_name={}):
+def report(instance, filename, report_tuples=None, report_sites_name={},
+           report_format='xlsx'):
     """Write result summary to a spreadsheet file
 
     Args:
         - instance: a urbs model instance;
         - filename: Excel spreadsheet filename, will be overwritten if exists;
+          folder name for report_format 'bundle';
         - report_tuples: (optional) list of (sit, com) tuples for which to
           create detailed timeseries sheets;
         - report_sites_name: (optional) dict of names for created timeseries
-          sheets
+          sheets;
+        - report_format: (optional) a key of urbs.REPORT_SINKS: 'xlsx',
+          'xlsx-stream' (constant memory, needs xlsxwriter) or 'bundle'
+          (Parquet or CSV files with a manifest, c.f. urbs.BundleSink),
+          default: 'xlsx'
     """
 
     # default to all demand (sit, com) tuples if none are specified
@@ -22,31 +29,32 @@ def report(instance, filename, report_tuples=None, report_sites_name={}):
 
     costs, cpro, ctra, csto, csolar,combined_cpro_csolar,cost_df_combined,capacity_solar_total,df_co2,combined_balance,decisionvalues_pri,decisionvalues_sec = get_constants(instance)
 
-    # create spreadsheet writer object
-    with pd.ExcelWriter(filename) as writer:
+    # create report sink (spreadsheet writer) object
+    with create_report_sink(filename, report_format) as writer:
 
         #################################################################################
         #dynamic feedback loop reports
-        decisionvalues_pri.to_excel(writer, sheet_name='us_BDpri_values')
-        decisionvalues_sec.to_excel(writer, sheet_name='us_BDsec_values')
+        writer.write('us_BDpri_values', decisionvalues_pri.to_frame())
+        writer.write('us_BDsec_values', decisionvalues_sec.to_frame())
 
         #urbs-solar reports
-        csolar.to_excel(writer, sheet_name='us_solarcaps')
-        cost_df_combined.to_excel(writer, sheet_name='us_cost')
-        combined_cpro_csolar.to_excel(writer, sheet_name='us_capacity')
-        combined_balance.to_excel(writer, sheet_name='us_balance', index=False)
-        df_co2.to_excel(writer, sheet_name='us_co2', index=False)
-        capacity_solar_total.to_excel(writer, sheet_name='us_solarcapacity')
+        writer.write('us_solarcaps', csolar)
+        writer.write('us_cost', cost_df_combined)
+        writer.write('us_capacity', combined_cpro_csolar)
+        writer.write('us_balance', combined_balance, index=False)
+        writer.write('us_co2', df_co2, index=False)
+        writer.write('us_solarcapacity', capacity_solar_total.to_frame())
 
         #################################################################################
 
         # write constants to spreadsheet
-        costs.to_frame().to_excel(writer, sheet_name='Costs')
-        cpro.to_excel(writer, sheet_name='Process caps')
-        ctra.to_excel(writer, sheet_name='Transmission caps')
-        csto.to_excel(writer, sheet_name='Storage caps')
+        writer.write('Costs', costs.to_frame())
+        writer.write('Process caps', cpro)
+        writer.write('Transmission caps', ctra)
+        writer.write('Storage caps', csto)
 
         # initialize timeseries tableaus
+        cube = TimeseriesCube(instance)
         energies = []
         timeseries = {}
         help_ts = {}
@@ -69,7 +77,8 @@ def report(instance, filename, report_tuples=None, report_sites_name={}):
 
             for lv in help_sit:
                 (created, consumed, stored, imported, exported,
-                 dsm, voltage_angle) = get_timeseries(instance, stf, com, lv)
+                 dsm, voltage_angle) = get_timeseries(instance, stf, com, lv,
+                                                      cube=cube)
 
                 overprod = pd.DataFrame(
                     columns=['Overproduction'],
@@ -118,7 +127,7 @@ def report(instance, filename, report_tuples=None, report_sites_name={}):
         if timeseries:
             # concatenate Commodity sums
             energy = pd.concat(energies, axis=1).fillna(0)
-            energy.to_excel(writer, sheet_name='Commodity sums')
+            writer.write('Commodity sums', energy)
 
             # write timeseries to individual sheets
             for stf, sit, com in report_tuples:
@@ -127,6 +136,6 @@ def report(instance, filename, report_tuples=None, report_sites_name={}):
                 # sheet names cannot be longer than 31 characters...
                 sheet_name = "{}.{}.{} timeseries".format(
                     stf, report_sites_name[sit], com)[:31]
-                timeseries[(stf, report_sites_name[sit], com)].to_excel(
-                    writer, sheet_name=sheet_name)
+                writer.write(sheet_name,
+                             timeseries[(stf, report_sites_name[sit], com)])
 
@@ -0,0 +1,316 @@
+import functools
+import json
+import math
+import numbers
+import os
+import re
+import numpy as np
+import pandas as pd
+
+# name of the file in a report bundle folder that lists its tables
+BUNDLE_MANIFEST = 'manifest.json'
+BUNDLE_FORMATS = ['parquet', 'csv']
+
+# separator of the levels of MultiIndex column labels in bundle tables
+BUNDLE_LEVEL_SEPARATOR = '|'
+
+
+def _has_module(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def _cell(value):
+    """Value of a spreadsheet cell, converted like pandas' Excel writers;
+    None for missing values."""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _write_rows(worksheet, frame, index=True):
+    """Write a DataFrame to an xlsxwriter worksheet row by row.
+
+    The layout is that of DataFrame.to_excel, except that repeated labels
+    of MultiIndex levels are written to every cell instead of merged cells.
+    """
+    columns = frame.columns
+    offset = frame.index.nlevels if index else 0
+    row = 0
+
+    # column labels, one row per level, with the level names in front
+    for level in range(columns.nlevels):
+        header = [None] * offset
+        if offset and columns.nlevels > 1:
+            header[-1] = _cell(columns.names[level])
+        elif offset:
+            header = [_cell(name) for name in frame.index.names]
+        header.extend(_cell(label)
+                      for label in columns.get_level_values(level))
+        worksheet.write_row(row, 0, header)
+        row += 1
+
+    # index names in a row of their own below MultiIndex column labels
+    if (offset and columns.nlevels > 1 and
+            any(name is not None for name in frame.index.names)):
+        worksheet.write_row(row, 0, [_cell(name)
+                                     for name in frame.index.names])
+        row += 1
+
+    for key, values in zip(frame.index,
+                           frame.itertuples(index=False, name=None)):
+        cells = []
+        if index:
+            cells.extend(_cell(label) for label in
+                         (key if isinstance(key, tuple) else (key,)))
+        cells.extend(_cell(value) for value in values)
+        worksheet.write_row(row, 0, cells)
+        row += 1
+
+
+class ExcelSink(object):
+    """Report sink that writes each table to a sheet of a spreadsheet.
+
+    Uses the xlsxwriter engine if it is installed, the default engine of
+    pandas otherwise. With constant_memory, xlsxwriter streams each sheet
+    to disk row by row, so that only one row is held in memory.
+
+    Args:
+        - filename: Excel spreadsheet, will be overwritten if it exists
+        - constant_memory: (optional) set True to stream the sheets, needs
+          the xlsxwriter package; MultiIndex labels are not merged then,
+          default: False
+    """
+    def __init__(self, filename, constant_memory=False):
+        self.filename = filename
+        self._writer = None
+        self._workbook = None
+        if constant_memory:
+            try:
+                import xlsxwriter
+            except ImportError:
+                raise ImportError("ExcelSink with constant_memory requires "
+                                  "the xlsxwriter package.")
+            self._workbook = xlsxwriter.Workbook(
+                filename, {'constant_memory': True,
+                           'nan_inf_to_errors': True})
+        else:
+            engine = 'xlsxwriter' if _has_module('xlsxwriter') else None
+            self._writer = pd.ExcelWriter(filename, engine=engine)
+
+    def write(self, name, frame, index=True):
+        """Write a DataFrame to the sheet name."""
+        if self._workbook is not None:
+            _write_rows(self._workbook.add_worksheet(name), frame, index)
+        else:
+            frame.to_excel(self._writer, sheet_name=name, index=index)
+
+    def close(self):
+        """Finish the spreadsheet file."""
+        if self._workbook is not None:
+            self._workbook.close()
+        else:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _storable(column):
+    """Column of a bundle table; object columns that do not only contain
+    strings (e.g. tuples) are converted to strings."""
+    if column.dtype != object:
+        return column
+    values = column.dropna()
+    if values.map(lambda value: isinstance(value, str)).all():
+        return column
+    return column.map(lambda value: value if value is None or
+                      (isinstance(value, float) and math.isnan(value))
+                      else str(value))
+
+
+def _json_value(value):
+    """Label as JSON-compatible Python value."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class BundleSink(object):
+    """Report sink that writes each table to a file of a folder.
+
+    Tables are Parquet files if pyarrow (or fastparquet) is installed, CSV
+    files otherwise. A manifest (BUNDLE_MANIFEST) lists the tables by name,
+    with their file, index and column labels, so that read_bundle_table
+    can restore them and read only the columns that are needed.
+
+    Args:
+        - folder: folder of the bundle, created if it does not exist
+        - file_format: (optional) 'parquet' or 'csv', default: 'parquet' if
+          available
+    """
+    def __init__(self, folder, file_format=None):
+        if file_format is None:
+            file_format = ('parquet' if _has_module('pyarrow') or
+                           _has_module('fastparquet') else 'csv')
+        if file_format not in BUNDLE_FORMATS:
+            raise ValueError("Unknown bundle format '{}'. Choose one of {}."
+                             .format(file_format, BUNDLE_FORMATS))
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.file_format = file_format
+        self.tables = {}
+
+    def write(self, name, frame, index=True):
+        """Write a DataFrame to the table name."""
+        labels = [list(label) if isinstance(label, tuple) else [label]
+                  for label in frame.columns]
+        columns = [BUNDLE_LEVEL_SEPARATOR.join(str(value) for value in label)
+                   for label in labels]
+
+        table = frame.copy(deep=False)
+        table.columns = columns
+        index_columns = []
+        if index:
+            # index level names, made unique like onset names
+            for k, level in enumerate(frame.index.names):
+                column = 'level_{}'.format(k) if level is None else str(level)
+                while column in columns or column in index_columns:
+                    column = column + '_'
+                index_columns.append(column)
+            table.index.names = index_columns
+            table = table.reset_index()
+        else:
+            table = table.reset_index(drop=True)
+        table = table.apply(_storable)
+
+        # file name from the table name, unique within the bundle
+        stem = re.sub(r'[^\w.-]+', '_', name).strip('_') or 'table'
+        filename = '{}.{}'.format(stem, self.file_format)
+        files = [entry['file'] for entry in self.tables.values()]
+        k = 1
+        while filename in files:
+            filename = '{}_{}.{}'.format(stem, k, self.file_format)
+            k += 1
+
+        path = os.path.join(self.folder, filename)
+        if self.file_format == 'parquet':
+            table.to_parquet(path, index=False)
+        else:
+            table.to_csv(path, index=False)
+
+        self.tables[name] = {
+            'file': filename,
+            'index': index_columns,
+            'index_names': ([_json_value(level)
+                             for level in frame.index.names]
+                            if index else []),
+            'columns': columns,
+            'column_labels': [[_json_value(value) for value in label]
+                              for label in labels],
+            'column_names': [_json_value(level)
+                             for level in frame.columns.names],
+            'rows': len(frame)}
+
+    def close(self):
+        """Write the manifest of the bundle."""
+        manifest = {'format': self.file_format, 'tables': self.tables}
+        with open(os.path.join(self.folder, BUNDLE_MANIFEST), 'w') as f:
+            json.dump(manifest, f, indent=1, default=str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_bundle_manifest(folder):
+    """Manifest of a report bundle (c.f. BundleSink) as dict."""
+    with open(os.path.join(folder, BUNDLE_MANIFEST)) as f:
+        return json.load(f)
+
+
+def read_bundle_table(folder, name, columns=None, manifest=None):
+    """Read a table of a report bundle.
+
+    Args:
+        - folder: folder of the bundle (c.f. BundleSink)
+        - name: table name, e.g. a sheet name of the spreadsheet report
+        - columns: (optional) list of column labels to read, tuples for
+          MultiIndex columns, default: all columns
+        - manifest: (optional) manifest of the bundle, to read it only once
+          for several tables (c.f. read_bundle_manifest)
+
+    Returns:
+        the DataFrame as it was written to the bundle, with only the
+        requested columns
+    """
+    if manifest is None:
+        manifest = read_bundle_manifest(folder)
+    try:
+        entry = manifest['tables'][name]
+    except KeyError:
+        raise KeyError("Report bundle '{}' has no table '{}'."
+                       .format(folder, name))
+
+    labels = [tuple(label) for label in entry['column_labels']]
+    if columns is None:
+        selected = list(range(len(labels)))
+    else:
+        positions = {label: k for k, label in enumerate(labels)}
+        selected = [positions[label if isinstance(label, tuple) else
+                              (label,)] for label in columns]
+    usecols = entry['index'] + [entry['columns'][k] for k in selected]
+
+    path = os.path.join(folder, entry['file'])
+    if entry['file'].endswith('.parquet'):
+        table = pd.read_parquet(path, columns=usecols)
+    else:
+        table = pd.read_csv(path, usecols=usecols)[usecols]
+
+    if entry['index']:
+        table = table.set_index(entry['index'])
+        table.index.names = entry['index_names']
+    if len(entry['column_names']) > 1:
+        table.columns = pd.MultiIndex.from_tuples(
+            [labels[k] for k in selected], names=entry['column_names'])
+    else:
+        table.columns = pd.Index([labels[k][0] for k in selected],
+                                 name=entry['column_names'][0])
+    return table
+
+
+# report sinks by report format (c.f. report), called with the report file
+# (or folder) name; add an entry to plug in another sink
+REPORT_SINKS = {
+    'xlsx': ExcelSink,
+    'xlsx-stream': functools.partial(ExcelSink, constant_memory=True),
+    'bundle': BundleSink}
+
+# file name extension of the reports of each format (c.f. write_results)
+REPORT_EXTENSIONS = {'xlsx': '.xlsx', 'xlsx-stream': '.xlsx', 'bundle': ''}
+
+
+def create_report_sink(filename, report_format='xlsx'):
+    """Report sink of a format from REPORT_SINKS for a file (or folder)."""
+    try:
+        sink = REPORT_SINKS[report_format]
+    except KeyError:
+        raise ValueError("Unknown report format '{}'. Choose one of {}."
+                         .format(report_format, sorted(REPORT_SINKS)))
+    return sink(filename)
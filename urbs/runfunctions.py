@@ -1,13 +1,42 @@
+import inspect
 import os
+import time
+from contextlib import contextmanager, nullcontext
 import pyomo.environ
 from pyomo.opt.base import SolverFactory
 from datetime import datetime, date
 from .model import create_model
+from .lpmatrix import solve_highs
 from .report import *
+from .reportsink import REPORT_EXTENSIONS
 from .plot import *
 from .input import *
 from .validation import *
 from .saveload import *
+from .solarparams import read_solar_params, structural_changes, \
+    update_solar_params
+
+
+class TerminationError(Exception):
+    """ raised if the solver of a scenario does not terminate optimally
+
+    Attributes:
+        - scenario: scenario name
+        - termination: the solver's termination condition as string, e.g.
+          'infeasible' or 'maxTimeLimit'
+    """
+    def __init__(self, scenario, termination):
+        super().__init__("Scenario '{}' terminated with '{}'."
+                         .format(scenario, termination))
+        self.scenario = scenario
+        self.termination = termination
+
+
+def check_termination(scenario, termination):
+    """ raise a TerminationError unless termination is 'optimal' """
+    termination = str(termination)
+    if termination != 'optimal':
+        raise TerminationError(scenario, termination)
 
 
 def prepare_result_directory(result_name):
@@ -31,32 +60,54 @@ def prepare_result_directory(result_name):
     return result_dir
 
 
-def setup_solver(optim, logfile='solver.log'):
+# HiGHS options for urbs-solar models: the cost definition rows reach about
+# 1e12, where the rounding error (~1e-4) exceeds the default MIP feasibility
+# tolerance of 1e-6, so HiGHS rejects its optimal solution with an error
+HIGHS_OPTIONS = {'mip_feasibility_tolerance': 1e-3}
+
+
+def setup_solver(optim, logfile='solver.log', threads=None):
     """ """
-    if optim.name == 'gurobi':
+    # the appsi interfaces (e.g. 'appsi_highs') have no name attribute
+    name = getattr(optim, 'name', None)
+    if name == 'gurobi':
         # reference with list of option names
         # http://www.gurobi.com/documentation/5.6/reference-manual/parameters
         optim.set_options("logfile={}".format(logfile))
+        if threads:
+            optim.set_options("threads={}".format(threads))
         # optim.set_options("timelimit=7200")  # seconds
         # optim.set_options("mipgap=5e-4")  # default = 1e-4
-    elif optim.name == 'glpk':
+    elif name == 'glpk':
         # reference with list of options
         # execute 'glpsol --help'
         optim.set_options("log={}".format(logfile))
         # optim.set_options("tmlim=7200")  # seconds
         # optim.set_options("mipgap=.0005")
-    elif optim.name == 'cplex':
+    elif name == 'cplex':
         optim.set_options("log={}".format(logfile))
+        if threads:
+            optim.set_options("threads={}".format(threads))
+    elif name == 'highs' or hasattr(optim, 'highs_options'):
+        # reference with list of options
+        # https://ergo-code.github.io/HiGHS/stable/options/definitions/
+        optim.options.update(HIGHS_OPTIONS)
+        optim.options['log_file'] = logfile
+        if threads:
+            optim.options['threads'] = threads
     else:
         print("Warning from setup_solver: no options set for solver "
-              "'{}'!".format(optim.name))
+              "'{}'!".format(name))
     return optim
 
 
 def run_scenario(input_files, Solver, timesteps, scenario, result_dir, dt,
                  objective, plot_tuples=None,  plot_sites_name=None,
                  plot_periods=None, report_tuples=None,
-                 report_sites_name=None):
+                 report_sites_name=None, input_cache=False,
+                 input_processes=None, params_file='Params.xlsx',
+                 solver_threads=None, build_trace=None, matrix_backend=False,
+                 report_format='xlsx', plot_executor=None):
     """ run an urbs model for given input, time steps and scenario
 
     Args:
@@ -64,6 +115,7 @@ def run_scenario(input_files, Solver, timesteps, scenario, result_dir, dt,
         - Solver: the user specified solver
         - timesteps: a list of timesteps, e.g. range(0,8761)
         - scenario: a scenario function that modifies the input data dict
+          and the urbs-solar parameters
         - result_dir: directory name for result spreadsheet and plots
         - dt: length of each time step (unit: hours)
         - objective: objective function chosen (either "cost" or "CO2")
@@ -75,9 +127,33 @@ def run_scenario(input_files, Solver, timesteps, scenario, result_dir, dt,
           (c.f. urbs.report)
         - report_sites_name: (optional) dict of names for sites in
           report_tuples
+        - input_cache: (optional) True or a folder name to cache the parsed
+          input spreadsheets (c.f. urbs.read_input), default: False
+        - input_processes: (optional) number of worker processes for
+          parsing the input spreadsheets (c.f. urbs.read_input)
+        - params_file: (optional) urbs-solar parameter spreadsheet
+          (c.f. urbs.read_solar_params), default: 'Params.xlsx'
+        - solver_threads: (optional) maximum number of solver threads
+          (gurobi, cplex), default: solver's choice
+        - build_trace: (optional) a BuildTrace to log the model build to,
+          tagged with the scenario name (c.f. urbs.BuildTrace)
+        - matrix_backend: (optional) set True to assemble the commodity
+          balance, process and storage state equations as sparse matrices
+          and solve in memory with HiGHS (c.f. urbs.solve_highs) instead of
+          Solver; no duals are available, default: False
+        - report_format: (optional) format of the result report
+          (c.f. urbs.report), default: 'xlsx'
+        - plot_executor: (optional) executor that renders the result plots
+          in the background, e.g. a urbs.plot_pool shared by several
+          scenarios; run_scenario returns without waiting for them,
+          default: plots are rendered before returning
 
     Returns:
         the urbs model instance
+
+    Raises:
+        TerminationError: if the solver does not terminate optimally; it
+        carries the solver's termination condition
     """
 
     # sets a modeled year for non-intertemporal problems
@@ -86,54 +162,14 @@ def run_scenario(input_files, Solver, timesteps, scenario, result_dir, dt,
 
     # scenario name, read and modify data for scenario
     sce = scenario.__name__
-    data = read_input(input_files, year)
+    data = read_input(input_files, year, cache=input_cache,
+                      processes=input_processes)
 
 
     ### --------start of urbs-solar input data addition-------- ###
 
-
-    location = 'Params.xlsx'
-    def clean_and_convert(df):
-        """Clean and convert the Value column to float."""
-        df['Value'] = df['Value'].apply(lambda x: str(x).replace(" ", "").replace(",", ".")).astype(float)
-        return df
-
-    dataframe_params = pd.read_excel(location, sheet_name='Params')
-    dataframe_params['Param'] = dataframe_params['Param'].str.strip()
-    param_dict = dict(zip(dataframe_params['Param'], dataframe_params['Value']))
-
-
-    data_sheets = {
-        'importcost': 'importcost_dict',
-        'instalable_capacity': 'instalable_capacity_dict',
-        'eu_primary_cost': 'eu_primary_cost_dict',
-        'eu_secondary_cost': 'eu_secondary_cost_dict',
-        'dcr': 'dcr_dict',
-        'stocklvl': 'stocklvl_dict'
-
-    }
-
-
-    data_dicts = {}
-    for sheet, var_name in data_sheets.items():
-        df = clean_and_convert(pd.read_excel(location, sheet_name=sheet))
-        data_dicts[var_name] = dict(zip(df['Stf'], df['Value'])) if 'Stf' in df else dict(zip(df['Param'], df['Value']))
-    importcost_dict = data_dicts['importcost_dict']
-    instalable_capacity_dict = data_dicts['instalable_capacity_dict']
-    eu_primary_cost_dict = data_dicts['eu_primary_cost_dict']
-    eu_secondary_cost_dict = data_dicts['eu_secondary_cost_dict']
-    dcr_dict = data_dicts['dcr_dict']
-    stocklvl_dict = data_dicts['stocklvl_dict']
-
-
-    data,param_dict,importcost_dict, instalable_capacity_dict, eu_primary_cost_dict, eu_secondary_cost_dict,dcr_dict,stocklvl_dict = scenario(data,param_dict.copy(),
-        importcost_dict.copy(),
-        instalable_capacity_dict.copy(),
-        eu_primary_cost_dict.copy(),
-        eu_secondary_cost_dict.copy(),
-        dcr_dict.copy(),
-        stocklvl_dict.copy())
-
+    solar = read_solar_params(params_file)
+    data, solar = scenario(data, solar)
 
     ### --------end of urbs-solar input data addition-------- ###
 
@@ -141,8 +177,10 @@ def run_scenario(input_files, Solver, timesteps, scenario, result_dir, dt,
     validate_dc_objective(data, objective)
 
     # create model
-    prob = create_model(data, param_dict, importcost_dict, instalable_capacity_dict,
-                    eu_primary_cost_dict, eu_secondary_cost_dict,dcr_dict,stocklvl_dict, dt, timesteps, objective)
+    if build_trace:
+        build_trace = build_trace.tagged(sce)
+    prob = create_model(data, solar, dt, timesteps, objective,
+                        trace=build_trace, matrix_blocks=matrix_backend)
 
     # prob_filename = os.path.join(result_dir, 'model.lp')
     # prob.write(prob_filename, io_options={'symbolic_solver_labels':True})
@@ -151,20 +189,56 @@ def run_scenario(input_files, Solver, timesteps, scenario, result_dir, dt,
     log_filename = os.path.join(result_dir, '{}.log').format(sce)
 
     # solve model and read results
-    optim = SolverFactory(Solver)  # cplex, glpk, gurobi, ...
-    optim = setup_solver(optim, logfile=log_filename)
-    result = optim.solve(prob, tee=True)
-    assert str(result.solver.termination_condition) == 'optimal'
+    if matrix_backend:
+        options = dict(HIGHS_OPTIONS, log_file=log_filename)
+        if solver_threads:
+            options['threads'] = solver_threads
+        check_termination(sce, solve_highs(prob, options=options))
+    else:
+        optim = SolverFactory(Solver)  # cplex, glpk, gurobi, ...
+        optim = setup_solver(optim, logfile=log_filename,
+                             threads=solver_threads)
+        result = optim.solve(prob, tee=True)
+        check_termination(sce, result.solver.termination_condition)
+
+    write_results(prob, result_dir, sce, timesteps,
+                  plot_tuples=plot_tuples, plot_sites_name=plot_sites_name,
+                  plot_periods=plot_periods, report_tuples=report_tuples,
+                  report_sites_name=report_sites_name,
+                  report_format=report_format, plot_executor=plot_executor)
+
+    return prob
+
+
+def write_results(prob, result_dir, sce, timesteps, plot_tuples=None,
+                  plot_sites_name=None, plot_periods=None, report_tuples=None,
+                  report_sites_name=None, report_format='xlsx',
+                  plot_executor=None):
+    """ save, report and plot a solved scenario
+
+    Args:
+        - prob: a solved urbs model instance
+        - result_dir: directory name for result spreadsheet and plots
+        - sce: scenario name, used as file name
+        - timesteps: a list of timesteps, e.g. range(0,8761)
+        - plot_tuples, plot_sites_name, plot_periods, report_tuples,
+          report_sites_name, report_format, plot_executor: c.f.
+          run_scenario
 
+    Returns:
+        None
+    """
     # save problem solution (and input data) to HDF5 file
     save(prob, os.path.join(result_dir, '{}.h5'.format(sce)))
 
-    # write report to spreadsheet
+    # write report to spreadsheet (or bundle folder)
     report(
         prob,
-        os.path.join(result_dir, '{}.xlsx').format(sce),
+        os.path.join(result_dir, sce + REPORT_EXTENSIONS.get(report_format,
+                                                             '')),
         report_tuples=report_tuples,
-        report_sites_name=report_sites_name)
+        report_sites_name=report_sites_name,
+        report_format=report_format)
 
     # result plots
     result_figures(
@@ -175,6 +249,353 @@ def run_scenario(input_files, Solver, timesteps, scenario, result_dir, dt,
         plot_tuples=plot_tuples,
         plot_sites_name=plot_sites_name,
         periods=plot_periods,
+        executor=plot_executor,
         figure_size=(24, 9))
 
-    return prob
+
+def copy_input(data):
+    """ copy of an input data dict whose frames may be modified freely """
+    return {name: frame.copy() for name, frame in data.items()}
+
+
+def input_equal(data, other):
+    """ True if two input data dicts contain the same frames """
+    return (data.keys() == other.keys() and
+            all(data[name].equals(other[name]) for name in data))
+
+
+def persistent_solve(optim, prob, warmstart, **kwds):
+    """ solve with a persistent appsi interface, warm-started if possible
+
+    The warmstart argument of the appsi interfaces is only available from
+    pyomo 6.9.1 on; older releases (e.g. 6.7.1 of urbs-env.yml) solve
+    without a warm start, but still keep the solver model between solves.
+
+    Args:
+        - optim: a persistent solver from SolverFactory('appsi_...')
+        - prob: the model instance
+        - warmstart: True to start from the values of the model variables
+        - kwds: further arguments of optim.solve, e.g. tee
+
+    Returns:
+        the solver results
+    """
+    if 'warmstart' in inspect.signature(optim.solve).parameters:
+        kwds['warmstart'] = warmstart
+    return optim.solve(prob, **kwds)
+
+
+def run_scenario_sweep(input_files, Solver, timesteps, scenarios, result_dir,
+                       dt, objective, plot_tuples=None, plot_sites_name=None,
+                       plot_periods=None, report_tuples=None,
+                       report_sites_name=None, input_cache=False,
+                       input_processes=None, params_file='Params.xlsx',
+                       build_trace=None, report_format='xlsx',
+                       plot_processes=None):
+    """ run a list of scenarios on as few model instances as possible
+
+    The input is read once. Each scenario is applied to a copy of it and
+    compared to the data the current model was built from: if only the
+    mutable urbs-solar parameters differ (c.f. SOLAR_MUTABLE_PARAMS), they
+    are updated in place and the model is re-solved by a persistent solver
+    interface (appsi), which keeps the solver model and warm-starts from
+    the previous solution where pyomo supports it (c.f. persistent_solve).
+    Otherwise a new model is built.
+
+    Args:
+        - scenarios: a list of scenario functions
+        - Solver: solver name with a persistent appsi interface,
+          e.g. 'gurobi' or 'highs'
+        - plot_processes: (optional) number of worker processes that render
+          the result plots in the background while the next scenarios are
+          solved (c.f. urbs.plot_pool), default: plots are rendered after
+          each scenario
+        - all others: c.f. run_scenario
+
+    Returns:
+        the last urbs model instance
+    """
+    # result plots are rendered in the background, while the next scenarios
+    # are solved; leaving the block waits for the pending plots and stops
+    # the workers, also if a scenario fails
+    plot_context = (plot_pool(plot_processes) if plot_processes
+                    else nullcontext())
+    with plot_context as plot_executor:
+        optim = SolverFactory('appsi_{}'.format(Solver))
+        if hasattr(optim, 'highs_options'):
+            optim.highs_options.update(HIGHS_OPTIONS)
+        if not optim.available(exception_flag=False):
+            print("Warning from run_scenario_sweep: no persistent interface for "
+                  "solver '{}', rebuilding every scenario.".format(Solver))
+            for scenario in scenarios:
+                prob = run_scenario(input_files, Solver, timesteps, scenario,
+                                    result_dir, dt, objective,
+                                    plot_tuples=plot_tuples,
+                                    plot_sites_name=plot_sites_name,
+                                    plot_periods=plot_periods,
+                                    report_tuples=report_tuples,
+                                    report_sites_name=report_sites_name,
+                                    input_cache=input_cache,
+                                    input_processes=input_processes,
+                                    params_file=params_file,
+                                    build_trace=build_trace,
+                                    report_format=report_format,
+                                    plot_executor=plot_executor)
+            return prob
+
+        # sets a modeled year for non-intertemporal problems
+        # (necessary for consitency)
+        year = date.today().year
+        base_data = read_input(input_files, year, cache=input_cache,
+                               processes=input_processes)
+        base_solar = read_solar_params(params_file)
+
+        prob = None
+        for scenario in scenarios:
+            sce = scenario.__name__
+            data, solar = scenario(copy_input(base_data), base_solar)
+
+            if (prob is not None and input_equal(data, prob_data) and
+                    not structural_changes(prob._solar, solar)):
+                update_solar_params(prob, solar)
+                warmstart = True
+            else:
+                validate_input(data)
+                validate_dc_objective(data, objective)
+                # create_model modifies the frames, keep the scenario input
+                prob_data = copy_input(data)
+                prob = create_model(data, solar, dt, timesteps, objective,
+                                    trace=build_trace and build_trace.tagged(sce))
+                warmstart = False
+
+            optim.config.logfile = os.path.join(result_dir,
+                                                '{}.log').format(sce)
+            result = persistent_solve(optim, prob, warmstart, tee=True)
+            check_termination(sce, result.solver.termination_condition)
+
+            write_results(prob, result_dir, sce, timesteps,
+                          plot_tuples=plot_tuples,
+                          plot_sites_name=plot_sites_name,
+                          plot_periods=plot_periods, report_tuples=report_tuples,
+                          report_sites_name=report_sites_name,
+                          report_format=report_format,
+                          plot_executor=plot_executor)
+
+        return prob
+
+
+def run_learning_curve_sweep(input_files, Solver, timesteps, result_dir, dt,
+                             objective, scenario=None, curves=None,
+                             store_name='learning_curves.h5',
+                             input_cache=False, input_processes=None,
+                             params_file='Params.xlsx'):
+    """ solve one model for several learning curves of EU secondary production
+
+    The model is built once. For each curve, only the price reductions
+    (P_sec) are updated and the model is re-solved by a persistent solver
+    interface (appsi), which keeps the solver model and warm-starts from the
+    previous solution where pyomo supports it (c.f. persistent_solve). All
+    solutions are saved to one HDF5 store, each in a group named after its
+    curve (c.f. urbs.load), together with a 'summary' table.
+
+    Args:
+        - scenario: (optional) scenario function applied before building
+          the model, default: none
+        - curves: (optional) list of curve names, default: all curves of the
+          learning curve sheet (c.f. SolarParams.curve_names)
+        - store_name: (optional) file name of the store in result_dir
+        - all others: c.f. run_scenario
+
+    Returns:
+        the summary as DataFrame, indexed by curve, with the columns
+        'wall time' (seconds), 'objective' and 'termination'
+    """
+    optim = SolverFactory('appsi_{}'.format(Solver))
+    if hasattr(optim, 'highs_options'):
+        optim.highs_options.update(HIGHS_OPTIONS)
+    if not optim.available(exception_flag=False):
+        raise ValueError("run_learning_curve_sweep needs a persistent appsi "
+                         "interface, not available for solver '{}'."
+                         .format(Solver))
+
+    # sets a modeled year for non-intertemporal problems
+    # (necessary for consitency)
+    year = date.today().year
+    data = read_input(input_files, year, cache=input_cache,
+                      processes=input_processes)
+    solar = read_solar_params(params_file)
+    if scenario is not None:
+        data, solar = scenario(data, solar)
+    if curves is None:
+        curves = solar.curve_names()
+
+    validate_input(data)
+    validate_dc_objective(data, objective)
+    prob = create_model(data, solar, dt, timesteps, objective)
+
+    store = os.path.join(result_dir, store_name)
+    mode = 'w'
+    summary = []
+    for number, curve in enumerate(curves):
+        start = time.perf_counter()
+        update_solar_params(prob, solar.replace(learning_curve=curve))
+        optim.config.logfile = os.path.join(result_dir,
+                                            '{}.log'.format(curve))
+        result = persistent_solve(optim, prob, number > 0, tee=True,
+                                  load_solutions=False)
+        termination = str(result.solver.termination_condition)
+        if termination == 'optimal':
+            optim.load_vars()
+            save(prob, store, group=curve, mode=mode)
+            mode = 'a'
+            objective_value = prob.objective_function()
+        else:
+            print("Warning from run_learning_curve_sweep: curve '{}' "
+                  "terminated with '{}'.".format(curve, termination))
+            objective_value = float('nan')
+        summary.append({'curve': curve,
+                        'wall time': time.perf_counter() - start,
+                        'objective': objective_value,
+                        'termination': termination})
+
+    summary = pd.DataFrame(summary).set_index('curve')
+    with pd.HDFStore(store, mode='a') as hdf:
+        hdf['summary'] = summary
+    return summary
+
+
+# environment variables that limit the threads of numerical libraries
+THREAD_LIMIT_VARIABLES = ['OMP_NUM_THREADS', 'MKL_NUM_THREADS',
+                          'OPENBLAS_NUM_THREADS']
+
+
+@contextmanager
+def thread_limits(threads):
+    """ set THREAD_LIMIT_VARIABLES while worker processes are started
+
+    The variables are only read when a library is loaded, i.e. by spawned
+    workers and the solver processes they start, not by workers forked from
+    a process that has loaded them already (c.f. init_scenario_worker).
+    The previous values are restored afterwards.
+    """
+    previous = {variable: os.environ.get(variable)
+                for variable in THREAD_LIMIT_VARIABLES}
+    os.environ.update({variable: str(threads)
+                       for variable in THREAD_LIMIT_VARIABLES})
+    try:
+        yield
+    finally:
+        for variable, value in previous.items():
+            if value is None:
+                del os.environ[variable]
+            else:
+                os.environ[variable] = value
+
+
+def init_scenario_worker(threads):
+    """ prepare a worker process of run_scenarios_parallel
+
+    Caps the thread pools of numerical libraries that are already loaded
+    (e.g. in a forked worker), if the optional threadpoolctl package is
+    installed, so that concurrent workers do not oversubscribe the cores.
+    Selects a non-interactive matplotlib backend, as plots are only written
+    to files.
+    """
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        pass
+    else:
+        threadpool_limits(threads)
+    plt.switch_backend('Agg')
+
+
+def run_scenario_summary(scenario, args, kwargs):
+    """ run_scenario(*args, **kwargs) for one scenario, reduced to a summary
+
+    Args:
+        - scenario: a scenario function
+        - args: positional arguments of run_scenario, without scenario
+        - kwargs: keyword arguments of run_scenario
+
+    Returns:
+        a dict with keys 'scenario', 'wall time' (seconds), 'objective'
+        and 'termination' (the solver's termination condition, e.g.
+        'optimal' or 'infeasible', or the error that stopped the run)
+    """
+    input_files, Solver, timesteps, result_dir, dt, objective = args
+    start = time.perf_counter()
+    try:
+        prob = run_scenario(input_files, Solver, timesteps, scenario,
+                            result_dir, dt, objective, **kwargs)
+        objective_value = prob.objective_function()
+        termination = 'optimal'
+    except TerminationError as err:
+        objective_value = float('nan')
+        termination = err.termination
+    except Exception as err:
+        objective_value = float('nan')
+        termination = '{}: {}'.format(type(err).__name__, err)
+    return {'scenario': scenario.__name__,
+            'wall time': time.perf_counter() - start,
+            'objective': objective_value,
+            'termination': termination}
+
+
+def run_scenarios_parallel(input_files, Solver, timesteps, scenarios,
+                           result_dir, dt, objective, processes=None,
+                           solver_threads=1, **kwargs):
+    """ run a list of scenarios concurrently in worker processes
+
+    Each worker runs run_scenario for one scenario at a time. All results
+    go to result_dir; files are named after the scenario, so scenario names
+    must be unique. As with any multiprocessing code, scripts using this on
+    Windows need an "if __name__ == '__main__':" guard.
+
+    Args:
+        - scenarios: a list of scenario functions
+        - processes: (optional) maximum number of concurrent scenarios,
+          default: number of cores divided by solver_threads
+        - solver_threads: (optional) solver threads per scenario,
+          default: 1
+        - kwargs: further keyword arguments of run_scenario
+        - all others: c.f. run_scenario
+
+    Returns:
+        a DataFrame indexed by scenario name with columns 'wall time'
+        (seconds), 'objective' and 'termination'
+    """
+    names = [scenario.__name__ for scenario in scenarios]
+    duplicates = sorted(set(name for name in names if names.count(name) > 1))
+    if duplicates:
+        raise ValueError("Scenario names must be unique, as they name the "
+                         "result files: {}".format(duplicates))
+
+    if processes is None:
+        processes = max(1, (os.cpu_count() or 1) // solver_threads)
+    processes = min(processes, len(scenarios))
+
+    # fill the input cache once, instead of every worker parsing the
+    # spreadsheets at the same time
+    if kwargs.get('input_cache'):
+        read_input(input_files, date.today().year,
+                   cache=kwargs['input_cache'],
+                   processes=kwargs.get('input_processes'))
+    kwargs = dict(kwargs, input_processes=None,
+                  solver_threads=solver_threads)
+    args = (input_files, Solver, timesteps, result_dir, dt, objective)
+
+    if processes <= 1:
+        rows = [run_scenario_summary(scenario, args, kwargs)
+                for scenario in scenarios]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with thread_limits(solver_threads), \
+                ProcessPoolExecutor(max_workers=processes,
+                                    initializer=init_scenario_worker,
+                                    initargs=(solver_threads,)) as pool:
+            rows = list(pool.map(run_scenario_summary, scenarios,
+                                 [args] * len(scenarios),
+                                 [kwargs] * len(scenarios)))
+
+    return pd.DataFrame(rows).set_index('scenario')
@@ -1,8 +1,19 @@
+from collections import OrderedDict
+from collections.abc import Mapping
 import pandas as pd
-from .pyomoio import get_entity, list_entities
+from .identify import identify_mode
+from .pyomoio import get_duals, get_entity, list_entities
 
+# compression of the HDF5 stores written by save (c.f. pandas.HDFStore)
+COMPLIB = 'blosc:zstd'
+COMPLEVEL = 5
 
-def create_result_cache(prob):
+# number of entities a loaded ResultContainer keeps in memory per group
+RESULT_CACHE_SIZE = 32
+
+
+def result_entities(prob):
+    """Names of the entities of a model instance that save writes."""
     entity_types = ['set', 'par', 'var', 'exp']
     if hasattr(prob, 'dual'):
         entity_types.append('con')
@@ -10,19 +21,92 @@ def create_result_cache(prob):
     entities = []
     for entity_type in entity_types:
         entities.extend(list_entities(prob, entity_type).index.tolist())
+    return entities
+
 
-    result_cache = {}
-    for entity in entities:
-        result_cache[entity] = get_entity(prob, entity)
-    return result_cache
+def _result_items(prob):
+    """(name, Series) pairs of the entities in result_entities.
 
+    Constraint duals are read from the dual suffix in one pass (c.f.
+    get_duals); all other entities one at a time.
+    """
+    duals = get_duals(prob) if hasattr(prob, 'dual') else {}
+    for name in result_entities(prob):
+        if name in duals:
+            yield name, duals.pop(name)
+        else:
+            yield name, get_entity(prob, name)
+
+
+def create_result_cache(prob):
+    return dict(_result_items(prob))
 
-def save(prob, filename):
-    """Save urbs model input and result cache to a HDF5 store file.
+
+def _float_index(index):
+    """Index with empty object levels replaced by empty float levels."""
+    if isinstance(index, pd.MultiIndex):
+        return index.set_levels([level.astype(float) if level.empty
+                                 else level for level in index.levels])
+    if index.empty and index.dtype == object:
+        return index.astype(float)
+    return index
+
+
+def _scalar_index(index):
+    """Index of a scalar entity ([None]) as string index (['None'])."""
+    if (not isinstance(index, pd.MultiIndex) and index.dtype == object and
+            index.isna().all()):
+        return pd.Index(['None'] * len(index), name=index.name)
+    return index
+
+
+def _put(store, key, value):
+    """Write a DataFrame or Series to a store node.
+
+    The table format is used where possible. Values it cannot store (empty
+    ones, object columns of mixed types, tuple columns) are written in the
+    fixed format instead. Both are compressed by the filters of the store.
+    Scalar entities (e.g. dt, y0) get the index 'None' instead of None, as
+    the table format cannot store the latter.
+    """
+    if not value.empty:
+        index = _scalar_index(value.index)
+        if index is not value.index:
+            value = value.copy(deep=False)
+            value.index = index
+        try:
+            store.put(key, value, format='table', index=False)
+            return
+        except (TypeError, ValueError, NotImplementedError):
+            if key in store:
+                store.remove(key)
+    else:
+        # an empty object array takes about 1 MB in the fixed format
+        value = value.astype(float)
+        value.index = _float_index(value.index)
+        if isinstance(value, pd.DataFrame):
+            value.columns = _float_index(value.columns)
+    store.put(key, value, format='fixed')
+
+
+def save(prob, filename, group='', mode='w', complevel=COMPLEVEL,
+         complib=COMPLIB):
+    """Save urbs model input and results to a HDF5 store file.
+
+    Results are extracted and written one entity at a time, so that at most
+    one of them is held in memory besides the model; only the constraint
+    duals are extracted together (c.f. get_duals). A result cache of the
+    model (e.g. a loaded ResultContainer) is written as it is.
 
     Args:
         - prob: a urbs model instance containing a solution
         - filename: HDF5 store file to be written
+        - group: (optional) name of a group in the store, e.g. to save
+          several solutions to one file, default: store root
+        - mode: (optional) 'w' to overwrite the file, 'a' to add to it
+        - complevel: (optional) compression level 0-9, 0 disables
+          compression, default: COMPLEVEL
+        - complib: (optional) compression library, default: COMPLIB
 
     Returns:
         Nothing
@@ -34,39 +118,114 @@ def save(prob, filename):
     warnings.filterwarnings('ignore',
                             category=tables.NaturalNameWarning)
 
-    if not hasattr(prob, '_result'):
-        prob._result = create_result_cache(prob)
+    if hasattr(prob, '_result'):
+        results = ((name, prob._result[name]) for name in prob._result.keys())
+    else:
+        results = _result_items(prob)
 
-    with pd.HDFStore(filename, mode='w') as store:
+    prefix = group + '/' if group else ''
+    with pd.HDFStore(filename, mode=mode, complevel=complevel,
+                     complib=complib) as store:
         for name in prob._data.keys():
-            store['data/'+name] = prob._data[name]
-        for name in prob._result.keys():
-            store['result/'+name] = prob._result[name]
+            _put(store, prefix+'data/'+name, prob._data[name])
+        for name, result in results:
+            _put(store, prefix+'result/'+name, result)
+
+
+class StoreGroup(Mapping):
+    """Read-only mapping of the nodes in a group of an open HDF5 store.
+
+    Only the node names are read on creation. Each value is read from the
+    store when it is first accessed and kept in a least recently used
+    cache of cache_size entries.
+    """
+    def __init__(self, store, path, cache_size=RESULT_CACHE_SIZE):
+        self._store = store
+        self.path = path
+        self.cache_size = cache_size
+        self._names = {node._v_name: node._v_pathname
+                       for node in store.get_node(path)}
+        self._cache = OrderedDict()
+
+    def __getitem__(self, name):
+        if name in self._cache:
+            self._cache.move_to_end(name)
+            return self._cache[name]
+        value = self._store[self._names[name]]
+        self._cache[name] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
 
 
 class ResultContainer(object):
-    """ Result/input data container for reporting functions. """
-    def __init__(self, data, result):
+    """ Result/input data container for reporting functions.
+
+    Containers returned by load keep their HDF5 store open and read input
+    frames and results on first access (c.f. StoreGroup); close() or a
+    with statement releases the file.
+    """
+    def __init__(self, data, result, store=None):
         self._data = data
         self._result = result
+        self._store = store
+        self._mode = None
+
+    @property
+    def mode(self):
+        """urbs mode of the input data (c.f. identify_mode)."""
+        if self._mode is None:
+            self._mode = identify_mode(self._data)
+        return self._mode
 
+    @property
+    def demand_dict(self):
+        """Demand timeseries as dict, like the model attribute."""
+        return self._data['demand'].to_dict()
 
-def load(filename):
+    def close(self):
+        """Close the HDF5 store of a loaded container."""
+        if self._store is not None:
+            self._store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load(filename, group='', cache_size=RESULT_CACHE_SIZE):
     """Load a urbs model result container from a HDF5 store file.
 
+    The file stays open; input frames and results are read when they are
+    first accessed (e.g. by get_entity, report, get_timeseries), and at
+    most cache_size of each are kept in memory.
+
     Args:
-        filename: an existing HDF5 store file
+        - filename: an existing HDF5 store file
+        - group: (optional) group the solution was saved to (c.f. save)
+        - cache_size: (optional) number of entities kept in memory,
+          default: RESULT_CACHE_SIZE
 
     Returns:
         prob: the modified instance containing the result cache
     """
-    with pd.HDFStore(filename, mode='r') as store:
-        data_cache = {}
-        for group in store.get_node('data'):
-            data_cache[group._v_name] = store[group._v_pathname]
-
-        result_cache = {}
-        for group in store.get_node('result'):
-            result_cache[group._v_name] = store[group._v_pathname]
-
-    return ResultContainer(data_cache, result_cache)
+    prefix = group + '/' if group else ''
+    store = pd.HDFStore(filename, mode='r')
+    try:
+        return ResultContainer(StoreGroup(store, prefix+'data', cache_size),
+                               StoreGroup(store, prefix+'result', cache_size),
+                               store)
+    except Exception:
+        store.close()
+        raise
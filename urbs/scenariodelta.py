@@ -0,0 +1,265 @@
+import hashlib
+import json
+from dataclasses import dataclass
+import numpy as np
+from .input import INPUT_FRAMES
+from .solarparams import SOLAR_YEARLY_SHEETS, SolarParams, \
+    update_solar_params
+
+# scenario deltas can change the urbs input frames, the scalar urbs-solar
+# parameters ('Params', indexed by 'Param') and the yearly urbs-solar
+# parameters (indexed by 'Stf')
+SOLAR_DELTA_SHEETS = ['Params'] + SOLAR_YEARLY_SHEETS
+
+# operations of a change, each combines the old value with the given one
+DELTA_OPERATIONS = ['set', 'scale', 'add']
+
+
+def index_mask(index, where):
+    """Boolean mask of the index entries selected by a 'where' condition.
+
+    Args:
+        - index: an Index or MultiIndex with named levels
+        - where: dict {level name: condition}; a condition is a single
+          value, a list of values or a dict with 'min' and/or 'max'
+          (inclusive). Levels that are not mentioned are not restricted.
+
+    Returns:
+        a boolean numpy array of the length of index
+    """
+    mask = np.ones(len(index), dtype=bool)
+    for level, condition in where.items():
+        if level not in index.names:
+            raise ValueError("Unknown index level '{}'. Choose one of {}."
+                             .format(level, list(index.names)))
+        values = index.get_level_values(level)
+        if isinstance(condition, dict):
+            if 'min' in condition:
+                mask &= values >= condition['min']
+            if 'max' in condition:
+                mask &= values <= condition['max']
+        elif isinstance(condition, list):
+            mask &= values.isin(condition)
+        else:
+            mask &= values == condition
+    return mask
+
+
+def apply_operation(values, change):
+    """New values after applying the operation of a change."""
+    if 'set' in change:
+        return change['set']
+    elif 'scale' in change:
+        return values * change['scale']
+    else:
+        return values + change['add']
+
+
+def canonical_change(change):
+    """Validate a change and return it in a JSON-normalized form."""
+    change = json.loads(json.dumps(change, sort_keys=True))
+    sheet = change.get('sheet')
+    if sheet not in INPUT_FRAMES + SOLAR_DELTA_SHEETS:
+        raise ValueError("Unknown sheet '{}' in scenario delta. Choose one "
+                         "of {}.".format(sheet,
+                                         INPUT_FRAMES + SOLAR_DELTA_SHEETS))
+    if sheet in INPUT_FRAMES and 'column' not in change:
+        raise ValueError("Change of sheet '{}' needs a 'column'."
+                         .format(sheet))
+    operations = [op for op in DELTA_OPERATIONS if op in change]
+    if len(operations) != 1:
+        raise ValueError("A change needs exactly one of {}, got {}."
+                         .format(DELTA_OPERATIONS, operations))
+    change.setdefault('where', {})
+    return change
+
+
+@dataclass(frozen=True, eq=False)
+class ScenarioDelta(object):
+    """Declarative scenario: a list of changes to the model input.
+
+    Each change is a dict with the keys
+        - sheet: name of an input frame (c.f. INPUT_FRAMES) or of an
+          urbs-solar sheet (c.f. SOLAR_DELTA_SHEETS)
+        - where: (optional) dict {index level: condition} that selects the
+          rows (c.f. index_mask), default: all rows
+        - column: changed column, only for input frames; tuple columns
+          (e.g. demand) are given as lists
+        - exactly one of set (new value), scale (factor) or add (summand)
+
+    Example:
+        >>> ScenarioDelta('scenario_high_co2', [
+        ...     {'sheet': 'commodity', 'column': 'price', 'set': 250,
+        ...      'where': {'Commodity': 'CO2', 'Type': 'Env'}},
+        ...     {'sheet': 'importcost', 'scale': 2,
+        ...      'where': {'Stf': {'min': 2035}}}])
+
+    Deltas are applied like scenario functions, delta(data, solar), each
+    change as one vectorized update of the selected rows. They compare
+    and hash by their changes (c.f. digest, diff). Deltas that only touch
+    mutable urbs-solar parameters can also be applied to a built model
+    (c.f. apply_to_model).
+
+    Attributes:
+        - name: scenario name, used for result files
+        - changes: tuple of changes in canonical form
+    """
+    name: str
+    changes: tuple
+
+    def __post_init__(self):
+        object.__setattr__(self, 'changes',
+                           tuple(canonical_change(change)
+                                 for change in self.changes))
+
+    @property
+    def __name__(self):
+        return self.name
+
+    def _key(self):
+        return json.dumps(self.changes, sort_keys=True)
+
+    def __eq__(self, other):
+        if not isinstance(other, ScenarioDelta):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def digest(self):
+        """Stable hash of the changes, e.g. for cache file names."""
+        return hashlib.sha1(self._key().encode('utf-8')).hexdigest()
+
+    def diff(self, other):
+        """Changes only in this delta and changes only in other.
+
+        Returns:
+            a tuple (removed, added) of lists of changes
+        """
+        keys = [json.dumps(change, sort_keys=True) for change in self.changes]
+        other_keys = [json.dumps(change, sort_keys=True)
+                      for change in other.changes]
+        removed = [change for change, key in zip(self.changes, keys)
+                   if key not in other_keys]
+        added = [change for change, key in zip(other.changes, other_keys)
+                 if key not in keys]
+        return removed, added
+
+    def input_sheets(self):
+        """Input frames changed by this delta."""
+        return sorted(set(change['sheet'] for change in self.changes
+                          if change['sheet'] in INPUT_FRAMES))
+
+    def __call__(self, data, solar):
+        """Apply the delta like a scenario function.
+
+        Args:
+            - data: urbs input dict, its frames are changed in place
+            - solar: a SolarParams object
+
+        Returns:
+            data and the changed SolarParams object
+        """
+        for change in self.changes:
+            if change['sheet'] in INPUT_FRAMES:
+                self._apply_input(data, change)
+        return data, self.apply_solar(solar)
+
+    def _apply_input(self, data, change):
+        frame = data[change['sheet']]
+        column = change['column']
+        if isinstance(column, list):
+            column = tuple(column)
+        if column not in frame.columns:
+            raise ValueError("Unknown column {!r} in sheet '{}'."
+                             .format(column, change['sheet']))
+        mask = index_mask(frame.index, change['where'])
+        if not mask.any():
+            print("Warning: {} changes no rows of '{}' ({})."
+                  .format(self.name, change['sheet'], change['where']))
+            return
+        frame.loc[mask, column] = apply_operation(
+            frame.loc[mask, column], change)
+
+    def apply_solar(self, solar):
+        """Apply the urbs-solar changes only.
+
+        Args:
+            - solar: a SolarParams object
+
+        Returns:
+            the changed SolarParams object (solar itself if unchanged)
+        """
+        params = solar.params.copy()
+        yearly = solar.yearly.copy()
+        changed = False
+        for change in self.changes:
+            sheet = change['sheet']
+            if sheet == 'Params':
+                values = params
+            elif sheet in SOLAR_YEARLY_SHEETS:
+                values = yearly[sheet]
+            else:
+                continue
+            mask = index_mask(values.index, change['where'])
+            if not mask.any():
+                print("Warning: {} changes no rows of '{}' ({})."
+                      .format(self.name, sheet, change['where']))
+                continue
+            new = apply_operation(values[mask], change)
+            if sheet == 'Params':
+                params[mask] = new
+            else:
+                yearly.loc[mask, sheet] = new
+            changed = True
+
+        if not changed:
+            return solar
+        return SolarParams(params, yearly, solar.learning_curves,
+                           solar.learning_curve)
+
+    def apply_to_model(self, m):
+        """Apply the delta to a built model without rebuilding it.
+
+        Only possible if it changes mutable urbs-solar parameters only
+        (c.f. update_solar_params).
+
+        Args:
+            - m: a model instance created by create_model
+
+        Returns:
+            None
+        """
+        if self.input_sheets():
+            raise ValueError("{} changes the input frames {}, which are "
+                             "built into the model; create a new model "
+                             "instead.".format(self.name,
+                                               self.input_sheets()))
+        update_solar_params(m, self.apply_solar(m._solar))
+
+
+def read_scenario_deltas(filename):
+    """Read scenario deltas from a JSON or YAML file.
+
+    The file contains a mapping {scenario name: list of changes}
+    (c.f. ScenarioDelta). YAML files need the pyyaml package.
+
+    Args:
+        filename: a .json, .yml or .yaml file
+
+    Returns:
+        a list of ScenarioDelta objects, in the order of the file
+    """
+    with open(filename, encoding='utf-8') as f:
+        if filename.endswith(('.yml', '.yaml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Reading '{}' requires the pyyaml "
+                                  "package.".format(filename))
+            scenarios = yaml.safe_load(f)
+        else:
+            scenarios = json.load(f)
+    return [ScenarioDelta(name, changes)
+            for name, changes in scenarios.items()]
@@ -0,0 +1,257 @@
+import os
+from dataclasses import dataclass
+import pandas as pd
+
+# sheets of the solar parameter workbook with one value per support
+# timeframe ('Stf' column); all other scalars live in the 'Params' sheet
+SOLAR_YEARLY_SHEETS = ['importcost', 'instalable_capacity', 'eu_primary_cost',
+                       'eu_secondary_cost', 'dcr', 'stocklvl']
+
+# sheet with the learning curves of EU secondary production: one row per
+# step ('Step'), the cumulative capacity (MW) needed to reach it
+# ('Capacity') and one column per curve with its price reduction (EUR/MW)
+LEARNING_CURVE_SHEET = 'learning_curves'
+LEARNING_CURVE_CAPACITY = 'Capacity'
+DEFAULT_LEARNING_CURVE = 'variation_14'
+
+# model Params (mutable=True in create_model) and the solar parameter each
+# of them is initialized from; update_solar_params changes them in place
+SOLAR_MUTABLE_PARAMS = {
+    'Q_Solar_new': 'instalable_capacity',
+    'IMPORTCOST': 'importcost',
+    'STORAGECOST': 'Storagecost / MW',
+    'EU_primary_costs': 'eu_primary_cost',
+    'EU_secondary_costs': 'eu_secondary_cost',
+    'FT': 'FT',
+    'anti_dumping_index': 'anti duping Index',
+    'deltaQ_EUprimary': 'dQ EU Primary',
+    'deltaQ_EUsecondary': 'dQ EU Secondary',
+    'IR_EU_primary': 'IR EU Primary',
+    'IR_EU_secondary': 'IR EU Secondary',
+    'DCR_solar': 'dcr',
+    'DR_primary': 'DR Primary',
+    'DR_secondary': 'DR Secondary',
+    'min_stocklvl': 'stocklvl',
+    'lf_solar': 'lf Solar'}
+
+# scalar parameters that define the model structure (year ranges, initial
+# values); changing one of them requires a new model
+SOLAR_STRUCTURAL_PARAMS = ['Start Year y0', 'End Year yn',
+                           'n turnover stockpile', 'l', 'InitialCapacity',
+                           'Existing Stock in y0', 'hours per year']
+
+# read_solar_params results by (filename, modification time, size)
+_solar_params_cache = {}
+
+
+def clean_numeric(values):
+    """Convert a column of numbers to float.
+
+    Text cells may contain blanks as thousands separators and a decimal
+    comma, e.g. '250 240,5' becomes 250240.5.
+
+    Args:
+        values: a Series
+
+    Returns:
+        the Series with dtype float
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    return (values.astype(str)
+                  .str.replace(' ', '', regex=False)
+                  .str.replace(',', '.', regex=False)
+                  .astype(float))
+
+
+@dataclass(frozen=True, eq=False)
+class SolarParams(object):
+    """Parameter set of the urbs-solar extension (c.f. read_solar_params).
+
+    Instances are shared between scenarios and must not be changed in
+    place; scenario functions derive a modified copy with replace().
+
+    Attributes:
+        - params: Series of scalar parameters, indexed by the names in the
+          'Param' column of the 'Params' sheet
+        - yearly: DataFrame of yearly parameters, indexed by support
+          timeframe, one column per sheet in SOLAR_YEARLY_SHEETS
+        - learning_curves: DataFrame of learning curves, indexed by step
+          (c.f. LEARNING_CURVE_SHEET)
+        - learning_curve: name of the curve used by the model
+    """
+    params: pd.Series
+    yearly: pd.DataFrame
+    learning_curves: pd.DataFrame
+    learning_curve: str = DEFAULT_LEARNING_CURVE
+
+    def __post_init__(self):
+        if self.learning_curve not in self.curve_names():
+            raise ValueError("Unknown learning curve '{}'. Choose one of {}."
+                             .format(self.learning_curve,
+                                     self.curve_names()))
+
+    def param(self, name):
+        """Scalar parameter by its name in the 'Params' sheet."""
+        return float(self.params[name])
+
+    def param_dict(self):
+        """Copy of all scalar parameters as dict {name: value}."""
+        return self.params.to_dict()
+
+    def yearly_dict(self, name):
+        """Copy of a yearly parameter as dict {stf: value}."""
+        return self.yearly[name].dropna().to_dict()
+
+    def curve_names(self):
+        """Names of all learning curves."""
+        return [name for name in self.learning_curves.columns
+                if name != LEARNING_CURVE_CAPACITY]
+
+    def learning_curve_dict(self, name=None):
+        """Price reduction per step of a learning curve as dict {n: value}.
+
+        Args:
+            name: (optional) curve name, default: the selected curve
+        """
+        return self.learning_curves[name or self.learning_curve].to_dict()
+
+    def capacity_per_step_dict(self):
+        """Capacity needed to reach each step as dict {n: value}."""
+        return self.learning_curves[LEARNING_CURVE_CAPACITY].to_dict()
+
+    def replace(self, params=None, learning_curve=None, **yearly):
+        """Return a copy with some parameters replaced.
+
+        Args:
+            - params: (optional) dict {name: value} of scalar parameters
+            - learning_curve: (optional) name of the learning curve to use
+            - yearly: keyword arguments named after SOLAR_YEARLY_SHEETS,
+              each a dict or Series {stf: value}; support timeframes that
+              are not given keep their value
+
+        Returns:
+            a new SolarParams object
+        """
+        new_params = self.params.copy()
+        if params:
+            for name, value in params.items():
+                new_params[name] = float(value)
+
+        new_yearly = self.yearly.copy()
+        for name, values in yearly.items():
+            if name not in SOLAR_YEARLY_SHEETS:
+                raise ValueError("Unknown yearly solar parameter '{}'. "
+                                 "Choose one of {}."
+                                 .format(name, SOLAR_YEARLY_SHEETS))
+            values = pd.Series(values, dtype=float)
+            new_yearly = new_yearly.reindex(
+                new_yearly.index.union(values.index))
+            new_yearly.loc[values.index, name] = values
+
+        return SolarParams(new_params, new_yearly, self.learning_curves,
+                           learning_curve or self.learning_curve)
+
+
+def read_solar_params(filename='Params.xlsx'):
+    """Read the urbs-solar parameter workbook.
+
+    All sheets are parsed in a single pass over the file. Results are
+    cached per file name, modification time and size, so repeated calls
+    (e.g. once per scenario) return the same object without touching the
+    spreadsheet again.
+
+    Args:
+        filename: Excel spreadsheet with a 'Params' sheet ('Param', 'Value'),
+            the yearly sheets in SOLAR_YEARLY_SHEETS ('Stf', 'Value') and
+            the LEARNING_CURVE_SHEET ('Step', 'Capacity', one column per
+            curve)
+
+    Returns:
+        a SolarParams object
+    """
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+    if key in _solar_params_cache:
+        return _solar_params_cache[key]
+
+    sheets = pd.read_excel(filename, sheet_name=None)
+
+    params = sheets['Params']
+    params = pd.Series(clean_numeric(params['Value']).values,
+                       index=params['Param'].str.strip(),
+                       name='Value')
+    # later rows win, as for the former dict(zip(Param, Value))
+    params = params[~params.index.duplicated(keep='last')]
+
+    yearly = pd.DataFrame({
+        name: pd.Series(clean_numeric(sheets[name]['Value']).values,
+                        index=sheets[name]['Stf'])
+        for name in SOLAR_YEARLY_SHEETS})
+    yearly.index.name = 'Stf'
+
+    if LEARNING_CURVE_SHEET not in sheets:
+        raise ValueError("Solar parameter file '{}' has no '{}' sheet. Add "
+                         "one with the columns 'Step', '{}' and one column "
+                         "per learning curve."
+                         .format(filename, LEARNING_CURVE_SHEET,
+                                 LEARNING_CURVE_CAPACITY))
+    curves = sheets[LEARNING_CURVE_SHEET].set_index('Step')
+    curves = curves.apply(clean_numeric)
+    curves.columns = curves.columns.astype(str).str.strip()
+
+    solar = SolarParams(params, yearly, curves)
+    _solar_params_cache[key] = solar
+    return solar
+
+
+def structural_changes(solar, other):
+    """Names of the structural parameters in which two parameter sets differ.
+
+    Args:
+        - solar, other: SolarParams objects
+
+    Returns:
+        a list of names from SOLAR_STRUCTURAL_PARAMS and LEARNING_CURVE_SHEET
+        if the learning curve steps differ; empty if a model built from
+        solar can be updated to other (c.f. update_solar_params)
+    """
+    changes = [name for name in SOLAR_STRUCTURAL_PARAMS
+               if solar.param(name) != other.param(name)]
+    if solar.capacity_per_step_dict() != other.capacity_per_step_dict():
+        changes.append(LEARNING_CURVE_SHEET)
+    return changes
+
+
+def update_solar_params(m, solar):
+    """Load a parameter set into the mutable Params of a built model.
+
+    Only the Params listed in SOLAR_MUTABLE_PARAMS and the price reductions
+    of the learning curve (P_sec) are changed; persistent solver interfaces
+    pick up the new values on their next solve.
+
+    Args:
+        - m: a model instance created by create_model
+        - solar: the new SolarParams object
+
+    Returns:
+        None
+    """
+    changed = structural_changes(m._solar, solar)
+    if changed:
+        raise ValueError("Solar parameters {} define the model structure "
+                         "and cannot be updated on a built model."
+                         .format(changed))
+
+    for component, name in SOLAR_MUTABLE_PARAMS.items():
+        param = getattr(m, component)
+        if name in SOLAR_YEARLY_SHEETS:
+            values = solar.yearly_dict(name)
+            for stf in m.stf:
+                param[stf] = values[stf]
+        else:
+            param.set_value(solar.param(name))
+    price_reduction = solar.learning_curve_dict()
+    for n in m.nsteps_sec:
+        m.P_sec[n] = price_reduction[n]
+    m._solar = solar